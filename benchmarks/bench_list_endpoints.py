@@ -0,0 +1,85 @@
+"""Throughput of the list endpoints with and without FAST_JSON_RESPONSES.
+
+Runs the app in-process (httpx ASGI transport, no sockets) against a fresh
+SQLite database seeded with one user, N objectives and N key results on the
+first objective, then hammers each endpoint sequentially in both modes:
+
+    python benchmarks/bench_list_endpoints.py
+    python benchmarks/bench_list_endpoints.py --rows 200 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+async def run(rows: int, requests: int):
+    import httpx
+
+    from src.app import fastjson
+    from src.app.database import create_db_and_tables
+    from src.app.hashing import hash_pool
+    from src.app.main import app
+
+    create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        signup = await client.post("/signup", json={"username": "bench", "password": "bench"})
+        headers = {"Authorization": f"Bearer {signup.json()['access_token']}"}
+        items = [
+            {
+                "title": f"Objective {i}",
+                "period_name": f"Q{i % 4 + 1} {2000 + i // 4}",
+                "key_results": [
+                    {"title": f"Key result {j}", "metric": "pts", "target": 100, "progress": j}
+                    for j in range(rows if i == 0 else 0)
+                ],
+            }
+            for i in range(rows)
+        ]
+        imported = await client.post("/objectives/import", json=items, headers=headers)
+        first_id = json.loads(imported.text.splitlines()[0])["id"]
+
+        endpoints = [
+            ("/objectives", {"limit": rows}),
+            (f"/objectives/{first_id}/key-results", {}),
+            ("/stats", {}),
+        ]
+        print(f"{'endpoint':<36} {'default req/s':>14} {'fast req/s':>11} {'speedup':>8}")
+        for url, params in endpoints:
+            rates = []
+            for fast in (False, True):
+                fastjson.FAST_JSON_RESPONSES = fast
+                await client.get(url, params=params, headers=headers)  # warm up
+                start = time.perf_counter()
+                for _ in range(requests):
+                    response = await client.get(url, params=params, headers=headers)
+                    response.raise_for_status()
+                rates.append(requests / (time.perf_counter() - start))
+            label = url.replace(str(first_id), "{id}")
+            print(f"{label:<36} {rates[0]:>14.0f} {rates[1]:>11.0f} {rates[1] / rates[0]:>7.2f}x")
+    hash_pool.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="objectives and key results")
+    parser.add_argument("--requests", type=int, default=300, help="requests per endpoint/mode")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ.setdefault("VALIDATION_LOG_LEVEL", "ERROR")
+        asyncio.run(run(args.rows, args.requests))
+
+
+if __name__ == "__main__":
+    main()
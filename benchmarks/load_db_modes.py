@@ -0,0 +1,179 @@
+"""Load test: the same workload against the app in DB_MODE=sync and DB_MODE=async.
+
+Each mode gets its own uvicorn process and a fresh database, one seeded user
+with a few objectives/key results, then N concurrent virtual users loop over
+GET /objectives, GET /stats and PUT /key-results/{id} for a fixed duration.
+
+    python benchmarks/load_db_modes.py --users 1000 --duration 30
+    DATABASE_URL=postgresql://... python benchmarks/load_db_modes.py --modes async
+
+With a Postgres DATABASE_URL both modes share that database (asyncpg vs psycopg2).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples, q):
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+async def seed(client: httpx.AsyncClient, objectives: int, krs: int) -> tuple[dict, list[int]]:
+    username = f"load_{int(time.time() * 1000)}"
+    token = (await client.post("/signup", json={"username": username, "password": "pass"})).json()[
+        "access_token"
+    ]
+    headers = {"Authorization": f"Bearer {token}"}
+    kr_ids = []
+    for i in range(objectives):
+        obj = (
+            await client.post(
+                "/objectives",
+                json={"title": f"Objective {i}", "period_name": f"Q{i % 4 + 1} {2000 + i // 4}"},
+                headers=headers,
+            )
+        ).json()
+        for j in range(krs):
+            kr = (
+                await client.post(
+                    f"/objectives/{obj['id']}/key-results",
+                    json={"title": f"KR {j}", "metric": "count", "target": 100, "progress": j},
+                    headers=headers,
+                )
+            ).json()
+            kr_ids.append(kr["id"])
+    return headers, kr_ids
+
+
+async def drive(base_url: str, users: int, duration: float, objectives: int, krs: int) -> dict:
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers, kr_ids = await seed(client, objectives, krs)
+        latencies = {"GET /objectives": [], "GET /stats": [], "PUT /key-results/{id}": []}
+        errors = 0
+        stop_at = time.monotonic() + duration
+
+        async def virtual_user(n: int):
+            nonlocal errors
+            i = n
+            while time.monotonic() < stop_at:
+                kr_id = kr_ids[i % len(kr_ids)]
+                for name, send in (
+                    ("GET /objectives", lambda: client.get("/objectives", headers=headers)),
+                    ("GET /stats", lambda: client.get("/stats", headers=headers)),
+                    (
+                        "PUT /key-results/{id}",
+                        lambda: client.put(
+                            f"/key-results/{kr_id}",
+                            json={
+                                "title": "KR under load",
+                                "metric": "count",
+                                "target": 100,
+                                "progress": i % 100,
+                            },
+                            headers=headers,
+                        ),
+                    ),
+                ):
+                    started = time.perf_counter()
+                    try:
+                        response = await send()
+                        ok = response.status_code < 400
+                    except httpx.HTTPError:
+                        ok = False
+                    latencies[name].append(time.perf_counter() - started)
+                    errors += not ok
+                i += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(virtual_user(n) for n in range(users)))
+        elapsed = time.monotonic() - started
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def run_mode(mode: str, args) -> dict:
+    env = dict(os.environ, DB_MODE=mode)
+    with tempfile.TemporaryDirectory() as tmp:
+        env.setdefault("DATABASE_URL", f"sqlite:///{tmp}/load_{mode}.db")
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port)],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            asyncio.run(wait_ready(base_url))
+            return asyncio.run(
+                drive(base_url, args.users, args.duration, args.objectives, args.krs)
+            )
+        finally:
+            server.terminate()
+            server.wait(10)
+
+
+def report(mode: str, result: dict):
+    total = sum(len(v) for v in result["latencies"].values())
+    print(
+        f"\n== DB_MODE={mode}: {total} requests in {result['elapsed']:.1f}s "
+        f"({total / result['elapsed']:.0f} req/s), {result['errors']} errors"
+    )
+    print(f"{'endpoint':<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, samples in result["latencies"].items():
+        ms = [s * 1000 for s in samples]
+        print(
+            f"{name:<24}{len(ms):>8}{statistics.fmean(ms) if ms else float('nan'):>10.1f}"
+            f"{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}{percentile(ms, 99):>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--users", type=int, default=200, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per mode")
+    parser.add_argument("--objectives", type=int, default=20)
+    parser.add_argument("--krs", type=int, default=3, help="key results per objective")
+    args = parser.parse_args()
+    for mode in args.modes:
+        report(mode, run_mode(mode, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""NFR load suite: seeded data sets, a mixed workload, percentiles and baseline comparison.
+
+Seeds `users x objectives x key results` for the chosen scale (signup plus one
+bulk import per user), then N concurrent virtual users run a weighted mix of
+login, objective CRUD, key-result updates, /stats, reports and /health for a
+fixed duration. Prints throughput and p50/p95/p99 per endpoint and checks the
+latency NFRs (p95 <= 200 ms, /health <= 200 ms).
+
+    python benchmarks/nfr_suite.py --scale small
+    python benchmarks/nfr_suite.py --scale medium --save-baseline
+    python benchmarks/nfr_suite.py --scale medium --compare   # exit 1 on regression
+    DATABASE_URL=postgresql://... python benchmarks/nfr_suite.py --scale large --db-mode async
+    python benchmarks/nfr_suite.py --base-url http://127.0.0.1:8000   # already running server
+
+Baselines are machine-specific: save one on the main branch, then compare the
+branch under test on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from load_db_modes import ROOT, free_port, percentile, wait_ready
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# users, objectives per user, key results per objective
+SCALES = {
+    "small": (10, 5, 3),
+    "medium": (50, 20, 4),
+    "large": (200, 40, 5),
+}
+
+# Relative weight of each scenario in a virtual user's loop
+MIX = {
+    "GET /objectives": 20,
+    "GET /objectives/{id}/key-results": 10,
+    "GET /stats": 20,
+    "GET /reports/objective/{id}?format=json": 8,
+    "GET /reports/objective/{id}?format=csv": 4,
+    "PUT /key-results/{id}": 15,
+    "objective CRUD": 5,
+    "POST /token": 1,
+    "GET /health": 5,
+}
+
+NFR_P95_MS = 200.0
+PASSWORD = "bench-password"
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    async def timed(self, name: str, request) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.latencies.setdefault(name, []).append(time.perf_counter() - started)
+        self.errors[name] = self.errors.get(name, 0) + (not ok)
+        return response if ok else None
+
+
+async def seed_user(client: httpx.AsyncClient, recorder: Recorder, n: int, objectives, krs):
+    username = f"nfr_{int(time.time())}_{n}"
+    signup = await recorder.timed(
+        "POST /signup", client.post("/signup", json={"username": username, "password": PASSWORD})
+    )
+    if signup is None:
+        raise SystemExit(f"seeding failed: could not sign up {username} at {client.base_url}")
+    headers = {"Authorization": f"Bearer {signup.json()['access_token']}"}
+    items = [
+        {
+            "title": f"Objective {i}",
+            "period_name": f"Q{i % 4 + 1} {2000 + i // 4}",
+            "key_results": [
+                {"title": f"KR {j}", "metric": "count", "target": 100, "progress": j}
+                for j in range(krs)
+            ],
+        }
+        for i in range(objectives)
+    ]
+    imported = await client.post("/objectives/import", json=items, headers=headers)
+    imported.raise_for_status()
+    objective_ids = [json.loads(line)["id"] for line in imported.text.splitlines()]
+    kr_ids = []
+    for objective_id in objective_ids[:5]:
+        listing = await client.get(f"/objectives/{objective_id}/key-results", headers=headers)
+        kr_ids += [kr["id"] for kr in listing.json()]
+    return {"username": username, "headers": headers, "objectives": objective_ids, "krs": kr_ids}
+
+
+async def seed(client, recorder: Recorder, users: int, objectives: int, krs: int) -> list[dict]:
+    # A handful at a time: signups are Argon2-bound and the hashing pool is small
+    accounts = []
+    for start in range(0, users, 8):
+        batch = range(start, min(start + 8, users))
+        accounts += await asyncio.gather(
+            *(seed_user(client, recorder, n, objectives, krs) for n in batch)
+        )
+    return accounts
+
+
+async def scenario(name: str, client, recorder: Recorder, account: dict, vu: int, rng):
+    headers = account["headers"]
+    objective_id = rng.choice(account["objectives"])
+    if name == "GET /objectives":
+        await recorder.timed(name, client.get("/objectives", headers=headers))
+    elif name == "GET /objectives/{id}/key-results":
+        await recorder.timed(
+            name, client.get(f"/objectives/{objective_id}/key-results", headers=headers)
+        )
+    elif name == "GET /stats":
+        await recorder.timed(name, client.get("/stats", headers=headers))
+    elif name.startswith("GET /reports/objective/"):
+        format = name.rsplit("=", 1)[1]
+        await recorder.timed(
+            name,
+            client.get(
+                f"/reports/objective/{objective_id}", params={"format": format}, headers=headers
+            ),
+        )
+    elif name == "PUT /key-results/{id}":
+        await recorder.timed(
+            name,
+            client.put(
+                f"/key-results/{rng.choice(account['krs'])}",
+                json={
+                    "title": "KR under load",
+                    "metric": "count",
+                    "target": 100,
+                    "progress": rng.randint(0, 100),
+                },
+                headers=headers,
+            ),
+        )
+    elif name == "objective CRUD":
+        # FY periods are never seeded and each VU owns one, so creates cannot collide
+        payload = {"title": "Load objective", "period_name": f"FY {1000 + vu}"}
+        created = await recorder.timed(
+            "POST /objectives", client.post("/objectives", json=payload, headers=headers)
+        )
+        if created is None:
+            return
+        new_id = created.json()["id"]
+        await recorder.timed(
+            "PUT /objectives/{id}",
+            client.put(
+                f"/objectives/{new_id}", json={**payload, "title": "Renamed"}, headers=headers
+            ),
+        )
+        await recorder.timed(
+            "DELETE /objectives/{id}", client.delete(f"/objectives/{new_id}", headers=headers)
+        )
+    elif name == "POST /token":
+        await recorder.timed(
+            name,
+            client.post("/token", data={"username": account["username"], "password": PASSWORD}),
+        )
+    elif name == "GET /health":
+        await recorder.timed(name, client.get("/health"))
+
+
+async def drive(base_url: str, args) -> dict:
+    users, objectives, krs = SCALES[args.scale]
+    limits = httpx.Limits(max_connections=args.vus, max_keepalive_connections=args.vus)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        seeding = Recorder()
+        started = time.monotonic()
+        accounts = await seed(client, seeding, users, objectives, krs)
+        print(
+            f"seeded {users} users x {objectives} objectives x {krs} KRs "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+        recorder = Recorder()
+        recorder.latencies.update(seeding.latencies)
+        recorder.errors.update(seeding.errors)
+        names, weights = list(MIX), list(MIX.values())
+        stop_at = time.monotonic() + args.duration
+        completed = 0
+
+        async def virtual_user(vu: int):
+            nonlocal completed
+            rng = random.Random(args.seed + vu)
+            account = accounts[vu % len(accounts)]
+            while time.monotonic() < stop_at:
+                name = rng.choices(names, weights)[0]
+                await scenario(name, client, recorder, account, vu, rng)
+                completed += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(virtual_user(vu) for vu in range(args.vus)))
+        elapsed = time.monotonic() - started
+
+    endpoints = {}
+    for name, samples in sorted(recorder.latencies.items()):
+        ms = [s * 1000 for s in samples]
+        endpoints[name] = {
+            "count": len(ms),
+            "errors": recorder.errors.get(name, 0),
+            "mean_ms": statistics.fmean(ms),
+            "p50_ms": percentile(ms, 50),
+            "p95_ms": percentile(ms, 95),
+            "p99_ms": percentile(ms, 99),
+        }
+    return {
+        "scale": args.scale,
+        "vus": args.vus,
+        "duration": args.duration,
+        "iterations_per_second": completed / elapsed,
+        "endpoints": endpoints,
+    }
+
+
+def run_local(args) -> dict:
+    env = dict(os.environ, DB_MODE=args.db_mode, VALIDATION_LOG_LEVEL="ERROR")
+    with tempfile.TemporaryDirectory() as tmp:
+        env.setdefault("DATABASE_URL", f"sqlite:///{tmp}/nfr_{args.scale}.db")
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.app.main:app", "--port", str(port)],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            asyncio.run(wait_ready(base_url))
+            return asyncio.run(drive(base_url, args))
+        finally:
+            server.terminate()
+            server.wait(10)
+
+
+def report(result: dict) -> bool:
+    """Print the table; return whether every endpoint meets the p95 NFR."""
+    print(
+        f"\n== scale={result['scale']} vus={result['vus']} duration={result['duration']:.0f}s: "
+        f"{result['iterations_per_second']:.0f} iterations/s"
+    )
+    print(
+        f"{'endpoint':<42}{'count':>7}{'errors':>7}{'req/s':>8}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  NFR"
+    )
+    meets_nfr = True
+    for name, stats in result["endpoints"].items():
+        ok = stats["p95_ms"] <= NFR_P95_MS
+        # Signup is seeding, and Argon2 time is the point of it; report it but do not judge it
+        judged = name not in ("POST /signup", "POST /token")
+        meets_nfr &= ok or not judged
+        print(
+            f"{name:<42}{stats['count']:>7}{stats['errors']:>7}"
+            f"{stats['count'] / result['duration']:>8.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+            f"  {('ok' if ok else 'FAIL') if judged else '-'}"
+        )
+    return meets_nfr
+
+
+def compare(result: dict, baseline: dict, tolerance: float, floor_ms: float) -> list[str]:
+    """Regressions against `baseline`: p95 or throughput worse by more than `tolerance`."""
+    regressions = []
+    for name, before in baseline["endpoints"].items():
+        after = result["endpoints"].get(name)
+        if after is None:
+            continue
+        # Sub-millisecond jitter on fast endpoints is noise, hence the absolute floor
+        if (
+            after["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+            and after["p95_ms"] - before["p95_ms"] > floor_ms
+        ):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.1f} ms -> {after['p95_ms']:.1f} ms")
+    before_rate = baseline["iterations_per_second"]
+    after_rate = result["iterations_per_second"]
+    if after_rate < before_rate * (1 - tolerance):
+        regressions.append(f"throughput: {before_rate:.0f} -> {after_rate:.0f} iterations/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--vus", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of mixed load")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the workload mix")
+    parser.add_argument("--db-mode", choices=["sync", "async"], default="sync")
+    parser.add_argument("--base-url", help="drive this server instead of starting one")
+    parser.add_argument("--baseline", type=Path, help="default: benchmarks/baselines/<scale>.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--floor-ms", type=float, default=5.0, help="ignore smaller p95 changes")
+    parser.add_argument("--enforce-nfr", action="store_true", help="exit 1 if p95 > 200 ms")
+    args = parser.parse_args()
+    baseline_path = args.baseline or BASELINE_DIR / f"{args.scale}.json"
+    if args.compare and not baseline_path.is_file():
+        parser.error(f"--compare: no baseline at {baseline_path}; record one with --save-baseline")
+
+    if args.base_url:
+        asyncio.run(wait_ready(args.base_url))
+        result = asyncio.run(drive(args.base_url, args))
+    else:
+        result = run_local(args)
+    meets_nfr = report(result)
+
+    failed = args.enforce_nfr and not meets_nfr
+    if args.compare:
+        regressions = compare(
+            result, json.loads(baseline_path.read_text()), args.tolerance, args.floor_ms
+        )
+        print(f"\ncompared with {baseline_path}: ", end="")
+        print("no regressions" if not regressions else "REGRESSIONS")
+        for line in regressions:
+            print(f"  {line}")
+        failed |= bool(regressions)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\nbaseline saved to {baseline_path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
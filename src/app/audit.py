@@ -0,0 +1,175 @@
+# app/audit.py
+"""Audit trail of auth events and objective/key-result writes.
+
+Handlers call `audit_log.record(...)`, which only appends to a bounded
+in-process queue and never waits: when the queue is full the event is
+dropped and counted. A writer thread drains the queue into the append-only
+`auditevent` table in batches of AUDIT_BATCH_SIZE, or whatever has arrived
+after AUDIT_FLUSH_SECONDS, so events are queryable within seconds (NFR 6
+allows 15 s). It writes through the sync engine, the same one in both
+DB modes, so it does not depend on any request's event loop.
+"""
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from src.app import database
+from src.app.models import AuditEvent
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", "1.0"))
+
+_STOP = object()
+
+
+class AuditStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_lag_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+                "max_lag_seconds": self.max_lag_seconds,
+            }
+
+
+class AuditPipeline:
+    def __init__(
+        self,
+        maxsize: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_seconds: float = AUDIT_FLUSH_SECONDS,
+    ):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.stats = AuditStats()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        action: str,
+        user_id: Optional[int] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[int] = None,
+        ip: Optional[str] = None,
+        **detail: Any,
+    ):
+        event = {
+            "action": action,
+            "user_id": user_id,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "ip": ip,
+            "detail": detail or None,
+            "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self.stats._lock:
+                self.stats.dropped += 1
+            return
+        with self.stats._lock:
+            self.stats.recorded += 1
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is _STOP:
+                self.queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_seconds
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stop = True
+                    self.queue.task_done()
+                    break
+                batch.append(event)
+            self._write(batch)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[dict]):
+        try:
+            with Session(database.engine) as session:
+                # Not part of any request, so kept out of query profiles
+                session.execute(insert(AuditEvent), batch, execution_options={"profile": False})
+                session.commit()
+        except Exception as exc:  # auditing must never take the writer down
+            with self.stats._lock:
+                self.stats.failed += len(batch)
+            print(f"WARNING: could not write {len(batch)} audit event(s): {exc!r}")
+            return
+        lag = (
+            datetime.now(timezone.utc).replace(tzinfo=None) - batch[0]["created_at"]
+        ).total_seconds()
+        with self.stats._lock:
+            self.stats.written += len(batch)
+            self.stats.batches += 1
+            self.stats.max_lag_seconds = max(self.stats.max_lag_seconds, lag)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued event is written (or failed); False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout: float = 10.0):
+        """Write what is queued and stop the writer."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join(timeout)
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats.snapshot(),
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+        }
+
+
+audit_log = AuditPipeline()
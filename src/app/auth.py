@@ -1,85 +1,180 @@
 # app/auth.py
 import os
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-import argon2
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.exc import PasslibSecurityError
-from sqlmodel import Session, select
+from sqlmodel import select
 
-from src.app.database import get_session
-from src.app.models import User
-
-# Argon2 hasher
-ph = argon2.PasswordHasher(
-    time_cost=3, memory_cost=65536, parallelism=4, hash_len=32, salt_len=16  # 64 MB
-)
+from src.app.database import DBSession, open_session
+from src.app.hashing import hash_pool
+from src.app.lru import LRUCache
+from src.app.models import RefreshToken, User
+from src.app.revocation import denylist
 
 # Load secrets/config from environment (set these in .env / CI / orchestrator)
 SECRET_KEY = os.getenv("SECRET_KEY", "CHANGE_THIS_SECRET_IN_DEVELOPMENT")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", str(60 * 24)))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token")
 
 
-# Password utils
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        ph.verify(hashed_password, plain_password)
-        return True
-    except PasslibSecurityError:
-        return False
-    except Exception:  # fallback — только если нужно (ruff не ругается, если явно)
-        return False
+# Password utils (Argon2 runs in the hashing pool; may raise HashQueueFull)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hash_pool.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
-    return ph.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await hash_pool.hash(password)
 
 
-# Token utils
+# Token utils. `iat` is a float so a password change revokes exactly the tokens issued before it.
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid.uuid4().hex, "type": "access"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def max_token_lifetime() -> float:
+    """Seconds after which every token issued now has expired."""
+    return max(ACCESS_TOKEN_EXPIRE_MINUTES * 60, REFRESH_TOKEN_EXPIRE_DAYS * 86400)
+
+
+async def issue_tokens(session: DBSession, user: User, family: Optional[str] = None) -> dict:
+    """Access token plus a new refresh token of `family` (a new family by default).
+
+    The refresh token is added to `session`; the caller commits.
+    """
+    jti = uuid.uuid4().hex
+    family = family or uuid.uuid4().hex
+    expires_at = time.time() + REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    session.add(RefreshToken(jti=jti, user_id=user.id, family=family, expires_at=expires_at))
+    refresh_token = jwt.encode(
+        {
+            "sub": user.username,
+            "exp": expires_at,
+            "iat": time.time(),
+            "jti": jti,
+            "type": "refresh",
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    return {
+        # `sid` ties the access token to its refresh family, so logout can end the session
+        "access_token": create_access_token({"sub": user.username, "sid": family}),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
+
+def decode_token(token: str, token_type: str = "access") -> Optional[dict]:
+    """Verified claims of a `token_type` token, or None."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    # Every token issued since revocation exists has a type and a jti; older ones
+    # could never be revoked individually, so they are no longer accepted
+    if payload.get("sub") is None or payload.get("jti") is None:
+        return None
+    if payload.get("type") != token_type:
+        return None
+    return payload
+
+
 # User helpers
-def get_user_by_username(session: Session, username: str) -> Optional[User]:
+async def get_user_by_username(session: DBSession, username: str) -> Optional[User]:
     statement = select(User).where(User.username == username)
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def authenticate_user(session: Session, username: str, password: str) -> Optional[User]:
-    user = get_user_by_username(session, username)
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(session: DBSession, username: str, password: str) -> Optional[User]:
+    user = await get_user_by_username(session, username)
+    if not user or not await verify_password(password, user.hashed_password):
         return None
     return user
 
 
+# Authenticated principal
+class Principal:
+    """What request handlers know about the caller; built once per token, not per request.
+
+    Besides the user it carries the claims of the token it was built from, so
+    handlers such as logout never have to decode the token a second time.
+    """
+
+    __slots__ = ("id", "username", "jti", "session_id", "expires_at")
+
+    def __init__(
+        self,
+        id: int,
+        username: str,
+        jti: Optional[str] = None,
+        session_id: Optional[str] = None,
+        expires_at: Optional[float] = None,
+    ):
+        self.id = id
+        self.username = username
+        self.jti = jti
+        self.session_id = session_id
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id!r}, username={self.username!r})"
+
+
+# Verified token -> Principal. Entries never outlive the token's own expiry.
+token_cache = LRUCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_tokens(user_id: int) -> int:
+    """Forget cached principals of a user. Call on password change and user deletion."""
+    return token_cache.delete_where(lambda _, principal: principal.id == user_id)
+
+
+def forget_token(token: str) -> bool:
+    """Drop one cached principal. Call when that token is revoked."""
+    return token_cache.delete(token)
+
+
 # Current user dependency
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
-) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_token(token)
+    if payload is None:
         raise credentials_exception
 
-    user = get_user_by_username(session, username)
-    if user is None:
+    # Only cache misses touch the DB, through a short session released right away
+    async with open_session(read_only=True) as session:
+        user = await get_user_by_username(session, payload["sub"])
+    # Revocations are checked against the in-memory denylist, never the DB
+    if user is None or denylist.is_revoked(payload.get("jti"), user.id, payload.get("iat", 0)):
         raise credentials_exception
-    return user
+    expires_at = payload.get("exp")
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        jti=payload["jti"],
+        session_id=payload.get("sid"),
+        expires_at=expires_at,
+    )
+    token_cache.set(token, principal, ttl=expires_at - time.time() if expires_at else None)
+    return principal
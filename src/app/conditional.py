@@ -0,0 +1,76 @@
+# app/conditional.py
+"""Conditional GET (ETag / If-None-Match) from a per-user data version.
+
+`User.data_version` is bumped in the same transaction as every objective or
+key-result write of that user, so `(user, version, URL)` identifies the exact
+bytes a read endpoint would return. `conditional_get` runs before the handler
+with a single primary-key lookup and answers `304 Not Modified` when the
+client already has them, skipping the list/aggregation queries entirely.
+"""
+import hashlib
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import update
+from sqlmodel import select
+
+from src.app.auth import Principal, get_current_user
+from src.app.database import DBSession, get_read_session
+from src.app.models import User
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+async def bump_data_version(session: DBSession, user_id: int):
+    """Invalidate the user's ETags; call inside the write's transaction."""
+    await session.exec(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_data_version(session: DBSession, user_id: int) -> int:
+    return (await session.exec(select(User.data_version).where(User.id == user_id))).one()
+
+
+def make_etag(user_id: int, version: int, request: Request) -> str:
+    resource = f"{request.url.path}?{request.url.query}".encode()
+    digest = hashlib.blake2b(resource, digest_size=8).hexdigest()
+    return f'"{user_id}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: a `W/` prefix is ignored.
+
+    `*` is not honored: `conditional_get` runs before the handler's 404 and
+    ownership checks, so a 304 for `*` would tell a client that some other
+    user's resource exists.
+    """
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
+) -> str:
+    """Dependency: set the ETag header, or short-circuit with 304 if the client has it."""
+    version = await get_data_version(session, current_user.id)
+    # Handlers key server-side caches by the same version (src/app/response_cache.py)
+    request.state.data_version = version
+    etag = make_etag(current_user.id, version, request)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    return etag
+
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag})
@@ -1,17 +1,290 @@
 import os
+import re
+import threading
 import time
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping, Optional, Sequence, Union
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, false, update, util
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.app.migrations import run_migrations
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./okr.db")
-engine = create_engine(DATABASE_URL, echo=False)
+# "sync": blocking driver, DB calls run in Starlette's threadpool.
+# "async": AsyncSession on asyncpg / aiosqlite, DB calls run on the event loop.
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Connection pool, per process. Size it so that
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below Postgres max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 = no limit
+
+# Opt-in per-request SQL profiling: Server-Timing header, log summary, N+1 warnings
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+# A statement shape seen this many times in one request is reported as a likely N+1
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "3"))
+
+
+def to_async_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+
+class PoolStats:
+    """Checkout counters shared by every pool of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def observe(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class _TimedCheckout:
+    """Pool mixin measuring how long a checkout waits for a free connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.observe(time.perf_counter() - started)
+        return conn
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+WHITESPACE_RE = re.compile(r"\s+")
+# Literal values that end up inlined (IN lists expanded per row, LIMIT ...)
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)"
+)
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace collapsed and literals / IN lists folded to `?`."""
+    shape = WHITESPACE_RE.sub(" ", statement).strip()
+    shape = IN_LIST_RE.sub("(?)", shape)
+    return LITERAL_RE.sub("?", shape)
+
+
+class QueryProfile:
+    """Statements executed while the profile was active, grouped by shape.
+
+    Every request has one (see `MetricsMiddleware`), so recording stays cheap:
+    statement texts are counted as they are and only folded into shapes when
+    someone asks for them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    @property
+    def shapes(self) -> Counter:
+        shapes: Counter = Counter()
+        for statement, n in self.statements.items():
+            shapes[statement_shape(statement)] += n
+        return shapes
+
+    def repeated(self, threshold: int = SQL_PROFILE_REPEAT_THRESHOLD) -> dict[str, int]:
+        """Shapes executed at least `threshold` times: the usual N+1 signature."""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+    def summary(self) -> dict:
+        shapes = self.shapes
+        return {
+            "queries": self.count,
+            "db_ms": round(self.seconds * 1000, 3),
+            "distinct": len(shapes),
+            "repeated": {
+                shape: n for shape, n in shapes.items() if n >= SQL_PROFILE_REPEAT_THRESHOLD
+            },
+        }
+
+
+# The profile of the request being served; threadpool calls and AsyncSession
+# greenlets inherit the context, so every statement of the request lands here.
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_profile", default=None)
+# Profiles capturing every statement of the process (tests, see `capture_queries`)
+_global_profiles: list[QueryProfile] = []
+
+
+def _profile_before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _profile_after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["profile_started"].pop()
+    if context is not None and not context.execution_options.get("profile", True):
+        return  # background work such as the audit writer opts out
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    for profile in _global_profiles:
+        profile.record(statement, elapsed)
+
+
+def _profile_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profile_started"):
+        conn.info["profile_started"].pop()
+
+
+def install_query_profiler():
+    """Attach the profiling cursor listeners to every Engine; idempotent."""
+    if not event.contains(Engine, "before_cursor_execute", _profile_before_execute):
+        event.listen(Engine, "before_cursor_execute", _profile_before_execute)
+        event.listen(Engine, "after_cursor_execute", _profile_after_execute)
+        event.listen(Engine, "handle_error", _profile_error)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Profile the statements run by the current context (one request).
+
+    Joins the profile already open for this context, so the metrics and the
+    SQL profiler middleware share one collector per request.
+    """
+    install_query_profiler()
+    profile = current_profile.get()
+    if profile is not None:
+        yield profile
+        return
+    profile = QueryProfile()
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryProfile]:
+    """Profile every statement of the process while the block runs, whatever its thread."""
+    install_query_profiler()
+    profile = QueryProfile()
+    _global_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        _global_profiles.remove(profile)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine keyword arguments for `url` from the DB_* settings."""
+    options: dict[str, Any] = {"echo": False, "pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args: dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        if ":memory:" in url or url.rstrip("/").endswith(":"):
+            return options  # in-memory databases keep SQLAlchemy's single-connection pool
+        # Sessions may hop between threadpool threads between two statements
+        connect_args["check_same_thread"] = False
+    elif DB_STATEMENT_TIMEOUT_MS > 0 and url.startswith("postgres"):
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        connect_args=connect_args,
+    )
+    return options
+
+
+def build_async_engine(url: str = ASYNC_DATABASE_URL, **kwargs):
+    return create_async_engine(url, **{**engine_options(url, is_async=True), **kwargs})
+
+
+# The sync engine always exists: DDL, migrations and CLI tools use it.
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+async_engine = build_async_engine() if DB_MODE == "async" else None
+
+
+def pool_status() -> dict:
+    """Live pool occupancy plus cumulative checkout counters."""
+    pool = (async_engine.sync_engine if async_engine is not None else engine).pool
+    status = pool_stats.snapshot()
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            idle=pool.checkedin(),
+        )
+    return status
 
 
 def create_db_and_tables():
     for _ in range(10):
         try:
             SQLModel.metadata.create_all(engine)
+            run_migrations(engine)
             print("Database connected and tables created.")
             break
         except OperationalError:
@@ -19,6 +292,133 @@ def create_db_and_tables():
             time.sleep(2)
 
 
-def get_session():
-    with Session(engine) as session:
+# Same option AsyncSession uses: fetch all rows before handing the result back,
+# so iterating it never touches the connection outside the threadpool.
+_PREBUFFER = util.immutabledict({"prebuffer_rows": True})
+
+
+class ThreadedSession:
+    """AsyncSession-compatible facade over a sync Session.
+
+    Lets the async routes run unchanged in sync mode: every call that may hit
+    the database is awaited and executed in the threadpool.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def exec(
+        self,
+        statement,
+        *,
+        params: Optional[Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]] = None,
+        execution_options: Mapping[str, Any] = util.EMPTY_DICT,
+    ):
+        return await run_in_threadpool(
+            self.sync_session.exec,
+            statement,
+            params=params,
+            execution_options=_PREBUFFER.union(execution_options),
+        )
+
+    async def stream(self, statement, *, execution_options: Mapping[str, Any] = util.EMPTY_DICT):
+        """Unbuffered result read partition by partition, like AsyncSession.stream."""
+        result = await run_in_threadpool(
+            self.sync_session.exec,
+            statement,
+            execution_options=util.immutabledict({"stream_results": True}).union(execution_options),
+        )
+        return ThreadedStreamResult(result)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance: Any):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance: Any, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+@asynccontextmanager
+async def open_session(read_only: bool = False):
+    """A session for the configured DB_MODE, closed (and its connection returned) on exit.
+
+    Read-only sessions skip autoflush since they never hold pending changes.
+    No session expires its objects on commit: an expired attribute would be
+    reloaded lazily, which AsyncSession cannot do outside an `await`. A
+    write handler that returns an object after commit must `refresh` it if
+    the row was changed behind the ORM's back, e.g. by a rollup UPDATE.
+    """
+    options = {"expire_on_commit": False, "autoflush": not read_only}
+    if async_engine is not None:
+        async with AsyncSession(async_engine, **options) as session:
+            yield session
+    else:
+        session = ThreadedSession(Session(engine, **options))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+class ThreadedStreamResult:
+    """The `partitions()` part of AsyncResult for ThreadedSession.stream."""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def partitions(self, size: Optional[int] = None):
+        partitions = self._result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                return
+            yield partition
+
+
+async def get_session():
+    async with open_session() as session:
+        yield session
+
+
+async def get_read_session():
+    async with open_session(read_only=True) as session:
         yield session
+
+
+# What route handlers receive from `get_session`, depending on DB_MODE
+DBSession = Union[AsyncSession, ThreadedSession]
+
+
+async def select_for_update(session: DBSession, statement, of):
+    """Run `statement` as SELECT ... FOR UPDATE OF `of`; the rows stay locked until commit.
+
+    Read-modify-write handlers (rollup deltas) use it so that two concurrent
+    requests cannot both read the same old values. SQLite has no row locks and
+    drops FOR UPDATE, so there a no-op UPDATE takes the database write lock
+    first, which serializes the writers the same way.
+    """
+    if engine.dialect.name == "sqlite":
+        table = of.__table__
+        (pk,) = table.primary_key.columns
+        await session.exec(update(table).where(false()).values({pk.name: pk}))
+    return await session.exec(statement.with_for_update(of=of))
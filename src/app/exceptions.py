@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
@@ -15,6 +15,7 @@ class ProblemException(Exception):
         type: str = "about:blank",
         instance: Optional[str] = None,
         errors: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
     ):
         self.status_code = status_code
         self.title = title
@@ -22,6 +23,16 @@ class ProblemException(Exception):
         self.type = type
         self.instance = instance
         self.errors = errors
+        self.headers = headers
+
+
+def validation_error_map(errors: Iterable[dict]) -> dict[str, list[str]]:
+    """Group pydantic error dicts into `{"field -> path": [messages]}`."""
+    grouped: dict[str, list[str]] = {}
+    for err in errors:
+        field = " -> ".join(str(x) for x in err["loc"] if x != "__root__")
+        grouped.setdefault(field or "body", []).append(err["msg"])
+    return grouped
 
 
 async def problem_exception_handler(request: Request, exc: ProblemException):
@@ -36,5 +47,5 @@ async def problem_exception_handler(request: Request, exc: ProblemException):
     return JSONResponse(
         status_code=exc.status_code,
         content=problem.model_dump(exclude_none=True),
-        headers={"Content-Type": "application/problem+json"},
+        headers={**(exc.headers or {}), "Content-Type": "application/problem+json"},
     )
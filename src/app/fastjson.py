@@ -0,0 +1,41 @@
+# app/fastjson.py
+"""Opt-in fast path for JSON list responses (`FAST_JSON_RESPONSES=true`).
+
+The default path builds one `*Read` model per row, FastAPI validates each
+against `response_model`, runs `jsonable_encoder` and finally `json.dumps`.
+The fast path selects only the columns of the read model, zips rows into
+dicts in the model's field order and encodes them with one precompiled C
+encoder configured exactly like Starlette's `JSONResponse`, so the bytes on
+the wire are identical. (pydantic-core and orjson format floats differently,
+e.g. `1e-05` as `0.00001`, which is why neither is used here.)
+"""
+import json
+import os
+from typing import Any, Iterable, Sequence, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Same settings as starlette.responses.JSONResponse.render
+encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encoder.encode(content).encode("utf-8")
+
+
+class RowSerializer:
+    """Column list and row -> dict conversion for one read model, computed once."""
+
+    def __init__(self, read_model: Type[BaseModel], entity):
+        self.fields: Sequence[str] = tuple(read_model.model_fields)
+        self.columns = tuple(getattr(entity, name) for name in self.fields)
+
+    def dicts(self, rows: Iterable[Sequence[Any]]) -> list:
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
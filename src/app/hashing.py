@@ -0,0 +1,162 @@
+# app/hashing.py
+"""Argon2 hashing offloaded to a dedicated, size-limited process pool.
+
+Hashing runs outside the request workers so a burst of logins cannot starve
+the CRUD endpoints. At most `HASH_POOL_WORKERS + HASH_QUEUE_DEPTH` jobs are
+admitted at a time; callers beyond that get `HashQueueFull` immediately.
+A pool broken by a dying worker (64 MB per Argon2 run is an OOM-killer
+target) is replaced and the job retried once.
+This module must stay import-light: pool workers are spawned processes that
+import it on startup.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import argon2
+
+from src.app.metrics import argon2_seconds
+
+# Argon2 hasher
+ph = argon2.PasswordHasher(
+    time_cost=3, memory_cost=65536, parallelism=4, hash_len=32, salt_len=16  # 64 MB
+)
+
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+HASH_QUEUE_DEPTH = int(os.getenv("HASH_QUEUE_DEPTH", "16"))
+
+
+class HashQueueFull(Exception):
+    """Raised when the hashing pool is saturated and the job was not admitted."""
+
+
+# Worker functions. They report their own start/end so the caller can split
+# queue wait from hashing time (time.monotonic is system-wide on Linux).
+def _hash(password: str) -> tuple[str, float, float]:
+    started = time.monotonic()
+    hashed = ph.hash(password)
+    return hashed, started, time.monotonic()
+
+
+def _verify(hashed_password: str, password: str) -> tuple[bool, float, float]:
+    started = time.monotonic()
+    try:
+        ok = ph.verify(hashed_password, password)
+    except Exception:
+        ok = False
+    return ok, started, time.monotonic()
+
+
+class HashingStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    def observe(self, queue_wait: float, hash_time: float):
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_seconds += max(queue_wait, 0.0)
+            self.hash_seconds += hash_time
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "restarts": self.restarts,
+                "queue_wait_seconds": self.queue_wait_seconds,
+                "hash_seconds": self.hash_seconds,
+            }
+
+
+class HashPool:
+    def __init__(self, workers: int = HASH_POOL_WORKERS, queue_depth: int = HASH_QUEUE_DEPTH):
+        self.workers = workers
+        self.max_pending = max(workers, 1) + queue_depth
+        self.stats = HashingStats()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.workers > 0:
+                        # spawn: forking a process that already runs threads is unsafe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    else:
+                        # HASH_POOL_WORKERS=0 hashes in a single local thread (dev/tests)
+                        self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    def _discard(self, executor: Executor):
+        """Drop a broken pool (e.g. a worker was OOM-killed); the next job starts a new one."""
+        with self._lock:
+            if self._executor is not executor:
+                return  # another caller already replaced it
+            self._executor = None
+            self.stats.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard(executor)
+        # Retry once on a fresh pool; if that one breaks too, report the pool as busy
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise HashQueueFull()
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats.rejected += 1
+                raise HashQueueFull()
+            self._pending += 1
+        submitted = time.monotonic()
+        try:
+            result, started, finished = await self._submit(fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+        self.stats.observe(queue_wait=started - submitted, hash_time=finished - started)
+        argon2_seconds.observe(finished - started, fn.__name__.lstrip("_"))
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, hashed_password, password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+hash_pool = HashPool()
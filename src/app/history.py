@@ -0,0 +1,91 @@
+# app/history.py
+"""Append-only key-result progress history and downsampled trends.
+
+Every write that sets a key result's progress (create, update, batch update,
+import) appends a `(key_result_id, at, value)` row to `progresspoint` in the
+same transaction; an update that leaves progress unchanged appends nothing.
+`at` is whole epoch seconds (UTC), which keeps rows small and makes bucketing
+plain integer division.
+
+`trend` answers "one series per key result of an objective" with a single
+query: the `(key_result_id, at)` index range-scans the window and the
+database keeps only the last value of each bucket, so the response holds at
+most one point per bucket however many updates were made.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlmodel import delete, select
+
+from src.app.database import DBSession
+from src.app.models import KeyResult, ProgressPoint
+
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+clock = time.time
+
+
+def epoch(moment: datetime) -> int:
+    """Whole epoch seconds; naive datetimes are taken as UTC."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+async def record(session: DBSession, points: Iterable[Tuple[int, float]], at: Optional[int] = None):
+    """Append `(key_result_id, progress)` points in the current transaction."""
+    at = int(clock()) if at is None else at
+    rows = [{"key_result_id": kr_id, "at": at, "value": value} for kr_id, value in points]
+    if rows:
+        await session.exec(insert(ProgressPoint), params=rows)
+
+
+async def forget(session: DBSession, key_result_ids):
+    """Drop the history of deleted key results; accepts ids or a subquery."""
+    await session.exec(delete(ProgressPoint).where(ProgressPoint.key_result_id.in_(key_result_ids)))
+
+
+def trend_statement(
+    objective_id: int, bucket: int, since: Optional[int] = None, until: Optional[int] = None
+):
+    """Last value per (key result, bucket) of an objective's key results, in order."""
+    slot = ProgressPoint.at // bucket
+    last_ids = (
+        select(func.max(ProgressPoint.id))
+        .where(
+            ProgressPoint.key_result_id.in_(
+                select(KeyResult.id).where(KeyResult.objective_id == objective_id)
+            )
+        )
+        .group_by(ProgressPoint.key_result_id, slot)
+    )
+    if since is not None:
+        last_ids = last_ids.where(ProgressPoint.at >= since)
+    if until is not None:
+        last_ids = last_ids.where(ProgressPoint.at < until)
+    return (
+        select(ProgressPoint.key_result_id, slot * bucket, ProgressPoint.value)
+        .where(ProgressPoint.id.in_(last_ids))
+        .order_by(ProgressPoint.key_result_id, ProgressPoint.at)
+    )
+
+
+async def trend(
+    session: DBSession,
+    objective_id: int,
+    bucket: str = "day",
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> dict[str, Any]:
+    """`{"key_results": [{"id", "points": [[bucket_start, value], ...]}]}` for one objective."""
+    rows = await session.exec(trend_statement(objective_id, BUCKETS[bucket], since, until))
+    series: dict[int, list] = {}
+    for kr_id, start, value in rows:
+        series.setdefault(kr_id, []).append([start, value])
+    return {
+        "objective_id": objective_id,
+        "bucket": bucket,
+        "key_results": [{"id": kr_id, "points": points} for kr_id, points in series.items()],
+    }
@@ -0,0 +1,215 @@
+# app/imports.py
+"""Bulk import of objectives with nested key results.
+
+Accepts either a JSON list of `{title, period_name, key_results: [...]}` or a
+CSV in the `/reports/all` column layout (rows grouped by `objective_id`).
+At most IMPORT_MAX_OBJECTIVES objectives are accepted per request.
+Everything is validated up front, duplicate periods are checked against one
+preloaded set, and all accepted objectives and key results are written with
+two multi-row `INSERT ... RETURNING` statements in a single transaction.
+"""
+import csv
+import io
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlmodel import select
+
+from src.app import history
+from src.app.conditional import bump_data_version
+from src.app.database import DBSession
+from src.app.exceptions import validation_error_map
+from src.app.models import KeyResult, Objective
+from src.app.periods import period_columns
+from src.app.reports import ALL_OBJECTIVES_FIELDS
+from src.app.rollups import clamp_ratio
+from src.app.schemas.validation import ValidatedKeyResultCreate, ValidatedObjectiveCreate
+
+IMPORT_MEDIA_TYPES = {"application/json": "json", "text/csv": "csv"}
+IMPORT_MAX_OBJECTIVES = int(os.getenv("IMPORT_MAX_OBJECTIVES", "1000"))
+
+KR_COLUMNS = ("kr_title", "metric", "target", "progress")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def parse_json(body: bytes) -> List[Dict[str, Any]]:
+    try:
+        items = json.loads(body)
+    except ValueError as exc:
+        raise ImportFormatError(f"Invalid JSON: {exc}")
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        raise ImportFormatError("Expected a JSON list of objective objects")
+    return items
+
+
+def parse_csv(body: bytes) -> List[Dict[str, Any]]:
+    """Group report-layout rows into objective dicts; a row without KR columns adds no KR."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFormatError("CSV must be UTF-8 encoded")
+    reader = csv.DictReader(io.StringIO(text))
+    missing = set(ALL_OBJECTIVES_FIELDS) - set(reader.fieldnames or ())
+    if missing:
+        raise ImportFormatError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for row in reader:
+        key = row["objective_id"] or f"line {reader.line_num}"
+        item = grouped.get(key)
+        if item is None:
+            item = grouped[key] = {
+                "title": row["objective_title"],
+                "period_name": row["period_name"],
+                "key_results": [],
+            }
+        if any(row[column] for column in KR_COLUMNS):
+            item["key_results"].append(
+                {
+                    "title": row["kr_title"],
+                    "metric": row["metric"],
+                    "target": row["target"],
+                    "progress": row["progress"],
+                }
+            )
+    return list(grouped.values())
+
+
+def parse_body(body: bytes, format: str) -> List[Dict[str, Any]]:
+    items = parse_json(body) if format == "json" else parse_csv(body)
+    if len(items) > IMPORT_MAX_OBJECTIVES:
+        raise ImportFormatError(f"At most {IMPORT_MAX_OBJECTIVES} objectives per import")
+    return items
+
+
+def validate_item(
+    raw: Dict[str, Any]
+) -> Tuple[Optional[Tuple[ValidatedObjectiveCreate, list]], Optional[dict]]:
+    """Return `((objective, key_results), None)` or `(None, errors)` for one import item."""
+    errors: Dict[str, List[str]] = {}
+    objective = None
+    try:
+        objective = ValidatedObjectiveCreate.model_validate(raw)
+    except ValidationError as exc:
+        errors.update(validation_error_map(exc.errors()))
+    raw_krs = raw.get("key_results") or []
+    if not isinstance(raw_krs, list):
+        errors["key_results"] = ["must be a list"]
+        raw_krs = []
+    key_results = []
+    for position, raw_kr in enumerate(raw_krs):
+        try:
+            key_results.append(ValidatedKeyResultCreate.model_validate(raw_kr))
+        except ValidationError as exc:
+            for field, messages in validation_error_map(exc.errors()).items():
+                errors[f"key_results -> {position} -> {field}"] = messages
+    if errors:
+        return None, errors
+    return (objective, key_results), None
+
+
+async def import_objectives(
+    session: DBSession, owner_id: int, items: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Validate and insert `items`; return one result dict per item, in input order."""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    periods = set(
+        (
+            await session.exec(select(Objective.period_name).where(Objective.owner_id == owner_id))
+        ).all()
+    )
+    accepted = []
+    for index, raw in enumerate(items):
+        valid, errors = validate_item(raw)
+        if errors:
+            results[index] = {
+                "index": index,
+                "status": 422,
+                "detail": "Validation failed",
+                "errors": errors,
+            }
+            continue
+        objective, key_results = valid
+        if objective.period_name in periods:
+            results[index] = {
+                "index": index,
+                "status": 400,
+                "detail": "Objective in the same period already exists",
+            }
+            continue
+        periods.add(objective.period_name)
+        accepted.append((index, objective, key_results))
+
+    if not accepted:
+        return results
+
+    # Rollups are known up front, so they are written with the objectives themselves
+    objective_ids = (
+        (
+            await session.exec(
+                insert(Objective).returning(Objective.id, sort_by_parameter_order=True),
+                params=[
+                    {
+                        "title": objective.title,
+                        "period_name": objective.period_name,
+                        **period_columns(objective.period_name),
+                        "owner_id": owner_id,
+                        "kr_count": len(key_results),
+                        "progress_sum": sum(
+                            clamp_ratio(kr.progress, kr.target) for kr in key_results
+                        ),
+                    }
+                    for _, objective, key_results in accepted
+                ],
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    kr_rows = [
+        {
+            "title": kr.title,
+            "metric": kr.metric,
+            "target": kr.target,
+            "progress": kr.progress,
+            "objective_id": objective_id,
+        }
+        for objective_id, (_, _, key_results) in zip(objective_ids, accepted)
+        for kr in key_results
+    ]
+    new_ids = []
+    if kr_rows:
+        new_ids = (
+            (
+                await session.exec(
+                    insert(KeyResult).returning(KeyResult.id, sort_by_parameter_order=True),
+                    params=kr_rows,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        await history.record(session, zip(new_ids, (row["progress"] for row in kr_rows)))
+    kr_ids = iter(new_ids)
+    await bump_data_version(session, owner_id)
+    await session.commit()
+
+    for objective_id, (index, _, key_results) in zip(objective_ids, accepted):
+        results[index] = {
+            "index": index,
+            "status": 201,
+            "id": objective_id,
+            "key_result_ids": [next(kr_ids) for _ in key_results],
+        }
+    return results
+
+
+def ndjson_lines(results: List[Dict[str, Any]]) -> Iterator[str]:
+    for result in results:
+        yield json.dumps(result, ensure_ascii=False) + "\n"
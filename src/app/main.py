@@ -1,13 +1,42 @@
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 
-from src.app.database import create_db_and_tables
-from src.app.exceptions import ProblemException, problem_exception_handler
+from src.app import revocation
+from src.app.audit import audit_log
+from src.app.auth import invalidate_user_tokens, token_cache
+from src.app.conditional import NotModified, not_modified_handler
+from src.app.database import create_db_and_tables, pool_status
+from src.app.exceptions import ProblemException, problem_exception_handler, validation_error_map
+from src.app.hashing import hash_pool
+from src.app.metrics import MetricsMiddleware, registry
+from src.app.profiling import SQLProfilerMiddleware
+from src.app.ratelimit import login_limiter
+from src.app.response_cache import response_cache
 from src.app.routes import router as api_router
+from src.app.schemas.validation import shutdown_logging
 
 app = FastAPI(title="OKR Tracker")
 app.add_exception_handler(ProblemException, problem_exception_handler)
+app.add_exception_handler(NotModified, not_modified_handler)
+app.add_middleware(SQLProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+registry.add_snapshot("okr_db_pool", "DB connection pool", pool_status)
+registry.add_snapshot("okr_hashing", "Argon2 hashing pool", hash_pool.stats.snapshot)
+registry.add_snapshot(
+    "okr_token_cache",
+    "Verified-token cache",
+    lambda: {"hits": token_cache.hits, "misses": token_cache.misses, "size": len(token_cache)},
+)
+registry.add_snapshot("okr_response_cache", "Response cache", response_cache.snapshot)
+registry.add_snapshot("okr_login_limiter", "Login lockout", login_limiter.stats.snapshot)
+registry.add_snapshot(
+    "okr_token_denylist", "Token revocation denylist", lambda: {"size": len(revocation.denylist)}
+)
+registry.add_snapshot("okr_audit", "Audit pipeline", audit_log.snapshot)
 
 
 @app.exception_handler(HTTPException)
@@ -37,19 +66,13 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    errors = {}
-    for err in exc.errors():
-        field = " -> ".join(str(x) for x in err["loc"] if x != "__root__")
-        msg = err["msg"]
-        errors.setdefault(field or "body", []).append(msg)
-
     raise ProblemException(
         status_code=422,
         title="Unprocessable Entity",
         detail="Validation failed",
         type="https://api.okr.example.com/probs/validation-error",
         instance=str(request.url),
-        errors=errors,
+        errors=validation_error_map(exc.errors()),
     )
 
 
@@ -58,6 +81,29 @@ def on_startup():
     create_db_and_tables()
 
 
+def drop_revoked_principals(entry):
+    # Revoked elsewhere: stop serving this worker's cached principals for the user
+    invalidate_user_tokens(entry.user_id)
+
+
+@app.on_event("startup")
+async def start_revocation_sync():
+    await revocation.sync_once(drop_revoked_principals)
+    app.state.revocation_sync = asyncio.create_task(
+        revocation.sync_forever(drop_revoked_principals)
+    )
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    sync_task = getattr(app.state, "revocation_sync", None)
+    if sync_task is not None:
+        sync_task.cancel()
+    audit_log.shutdown()
+    hash_pool.shutdown()
+    shutdown_logging()
+
+
 app.include_router(api_router)
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+# app/metrics.py
+"""Request, database and hashing metrics in the Prometheus text format (`GET /metrics`).
+
+`MetricsMiddleware` times every request by route template (not raw path, to
+keep label cardinality bounded) and reads the number and duration of its SQL
+statements from the request's `database.QueryProfile`, the one collector
+behind the cursor events. Counters that other modules already keep
+(`pool_status()`, hashing and cache stats) are added as snapshot collectors
+and read at scrape time.
+
+Stdlib only: `hashing.py` imports it and is itself imported by the spawned
+hashing workers.
+"""
+import threading
+import time
+from typing import Callable, Iterable
+
+# Default Prometheus latency buckets plus 0.2 s, the p95 NFR threshold
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += n
+                bucket = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{bucket} {cumulative}"
+            label_str = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_str} {_format_value(series[-1])}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list = []
+        self.collectors: list[tuple[str, str, Callable[[], dict]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_snapshot(self, prefix: str, help: str, snapshot: Callable[[], dict]):
+        """Expose the numeric fields of `snapshot()` as `<prefix>_<field>` untyped metrics."""
+        self.collectors.append((prefix, help, snapshot))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for prefix, help, snapshot in self.collectors:
+            for field, value in snapshot().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{field}"
+                lines.append(f"# HELP {name} {help} ({field})")
+                lines.append(f"# TYPE {name} untyped")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter("okr_http_requests_total", "HTTP requests served", ("method", "route", "status"))
+)
+http_request_seconds = registry.register(
+    Histogram("okr_http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+)
+http_in_flight = registry.register(
+    Gauge("okr_http_requests_in_flight", "HTTP requests currently being served")
+)
+db_queries_per_request = registry.register(
+    Histogram(
+        "okr_db_queries_per_request",
+        "SQL statements executed per HTTP request",
+        ("route",),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+db_seconds_per_request = registry.register(
+    Histogram(
+        "okr_db_query_duration_seconds_per_request",
+        "Time spent in SQL statements per HTTP request",
+        ("route",),
+    )
+)
+argon2_seconds = registry.register(
+    Histogram(
+        "okr_argon2_duration_seconds",
+        "Argon2 time in a hashing worker, queue wait excluded",
+        ("operation",),
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5),
+    )
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are timed until their last chunk."""
+
+    def __init__(self, app, skip_paths: tuple = ("/metrics",)):
+        # Imported here: this module stays stdlib-only for the hashing workers
+        from src.app.database import profile_queries
+
+        self.app = app
+        self.skip_paths = skip_paths
+        self.profile_queries = profile_queries
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        # The request's QueryProfile also feeds the SQL profiler middleware inside
+        with self.profile_queries() as profile:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - started
+                http_in_flight.dec()
+                route = scope.get("route")
+                # Unmatched paths share one label instead of one series per URL
+                template = getattr(route, "path_format", None) or "<unmatched>"
+                method = scope["method"]
+                http_requests.inc(method, template, str(status))
+                http_request_seconds.observe(elapsed, method, template)
+                db_queries_per_request.observe(profile.count, template)
+                db_seconds_per_request.observe(profile.seconds, template)
@@ -0,0 +1,96 @@
+# app/migrations.py
+"""Idempotent schema upgrades for databases created by older versions.
+
+`SQLModel.metadata.create_all` only creates missing tables, so columns and
+indexes added to existing tables are applied here on startup.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel
+
+from src.app.periods import period_columns
+
+# (table, column, DDL type) added after the table was first released
+ADDED_COLUMNS = [
+    ("objective", "kr_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("objective", "progress_sum", "FLOAT NOT NULL DEFAULT 0"),
+    ("user", "data_version", "INTEGER NOT NULL DEFAULT 0"),
+    ("objective", "period_year", "INTEGER"),
+    ("objective", "period_quarter", "INTEGER"),
+]
+
+
+def add_missing_columns(engine: Engine) -> set[tuple[str, str]]:
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    added = set()
+    with engine.begin() as conn:
+        for table, column, ddl in ADDED_COLUMNS:
+            if table not in tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            if column not in existing:
+                conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {column} {ddl}'))
+                added.add((table, column))
+    return added
+
+
+def create_missing_indexes(engine: Engine) -> list[str]:
+    """Create declared indexes absent from existing tables.
+
+    A unique index that existing rows violate is skipped with a warning; the
+    offending duplicates have to be resolved by hand before it can be created.
+    """
+    tables = set(inspect(engine).get_table_names())
+    created = []
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {ix["name"] for ix in inspect(engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(engine)
+                created.append(index.name)
+            except IntegrityError:
+                print(f"WARNING: could not create unique index {index.name}: duplicate rows")
+    return created
+
+
+def backfill_period_columns(engine: Engine) -> int:
+    """Derive period_year / period_quarter for rows written before they existed."""
+    filled = 0
+    with engine.begin() as conn:
+        names = conn.execute(
+            text("SELECT DISTINCT period_name FROM objective WHERE period_year IS NULL")
+        ).scalars()
+        for name in list(names):
+            columns = period_columns(name)
+            if columns["period_year"] is None:
+                continue  # not a period name; left out of period-scoped stats
+            filled += conn.execute(
+                text(
+                    "UPDATE objective SET period_year = :period_year,"
+                    " period_quarter = :period_quarter"
+                    " WHERE period_name = :name AND period_year IS NULL"
+                ),
+                {**columns, "name": name},
+            ).rowcount
+    return filled
+
+
+def run_migrations(engine: Engine):
+    added = add_missing_columns(engine)
+    create_missing_indexes(engine)
+    if {("objective", "kr_count"), ("objective", "progress_sum")} & added:
+        # rollups -> database -> migrations: import late to keep the cycle open
+        from src.app import rollups
+
+        with Session(engine) as session:
+            fixed = rollups.rebuild(session)
+        print(f"Backfilled progress rollups for {fixed} objective(s).")
+    if ("objective", "period_year") in added:
+        filled = backfill_period_columns(engine)
+        print(f"Backfilled period columns for {filled} objective(s).")
@@ -1,18 +1,21 @@
-from datetime import date, timedelta
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
+from sqlalchemy import JSON, Column, Index
 from sqlmodel import Field, Relationship, SQLModel
 
 
 # USERS
 class UserBase(SQLModel):
-    username: str
+    username: str = Field(index=True, unique=True)
 
 
 class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     hashed_password: str
+    # Bumped on every objective/key-result write; drives ETags (src/app/conditional.py)
+    data_version: int = Field(default=0)
     objectives: List["Objective"] = Relationship(back_populates="owner")
 
 
@@ -24,6 +27,43 @@ class UserCreate(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class PasswordChange(BaseModel):
+    current_password: str
+    new_password: str
+
+
+# TOKENS
+class RefreshToken(SQLModel, table=True):
+    """An issued refresh token. Rotation marks it used; presenting a used one
+    again revokes its whole family (every token rotated from the same login)."""
+
+    jti: str = Field(primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    family: str = Field(index=True)
+    expires_at: float = Field(index=True)
+    used: bool = Field(default=False)
+
+
+class RevokedToken(SQLModel, table=True):
+    """Denylist entry: one token by `jti`, or all of a user's tokens issued before
+    `issued_before`. Kept until the tokens it covers expire (src/app/revocation.py)."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    jti: Optional[str] = None
+    issued_before: Optional[float] = None
+    expires_at: float = Field(index=True)
 
 
 # PERIODS
@@ -33,17 +73,6 @@ class Period(SQLModel):
     end_date: date
 
 
-def default_period_templates(now: date = date.today()):
-    templates: List[Period] = []
-    year = now.year
-    for y in (year, year + 1):
-        for q in range(1, 5):
-            start = date(y, 3 * (q - 1) + 1, 1)
-            end = date(y, 3 * q, 1) - timedelta(days=1) if q < 4 else date(y, 12, 31)
-            templates.append(Period(name=f"Q{q} {y}", start_date=start, end_date=end))
-    return templates
-
-
 # OBJECTIVES
 class ObjectiveBase(SQLModel):
     title: str
@@ -51,10 +80,29 @@ class ObjectiveBase(SQLModel):
 
 
 class Objective(ObjectiveBase, table=True):
+    # One objective per period and owner; the leading owner_id also serves owner lookups
+    __table_args__ = (
+        Index("ix_objective_owner_id_period_name", "owner_id", "period_name", unique=True),
+        # keyset pagination: WHERE owner_id = ? AND id > ? ORDER BY id
+        Index("ix_objective_owner_id_id", "owner_id", "id"),
+        # period-scoped stats: WHERE owner_id = ? AND period_year = ? [AND period_quarter ...]
+        Index(
+            "ix_objective_owner_id_period_year_quarter", "owner_id", "period_year", "period_quarter"
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     owner_id: int = Field(foreign_key="user.id")
+    # Derived from period_name on every write (src/app/periods.py); quarter is NULL for "FY"
+    period_year: Optional[int] = None
+    period_quarter: Optional[int] = None
+    # Progress rollup, maintained incrementally by src/app/rollups.py
+    kr_count: int = Field(default=0)
+    progress_sum: float = Field(default=0.0)
     owner: Optional[User] = Relationship(back_populates="objectives")
-    key_results: List["KeyResult"] = Relationship(back_populates="objective")
+    key_results: List["KeyResult"] = Relationship(
+        back_populates="objective", sa_relationship_kwargs={"order_by": "KeyResult.id"}
+    )
 
 
 class ObjectiveCreate(ObjectiveBase):
@@ -76,10 +124,24 @@ class KeyResultBase(SQLModel):
 
 class KeyResult(KeyResultBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    objective_id: int = Field(foreign_key="objective.id")
+    objective_id: int = Field(foreign_key="objective.id", index=True)
     objective: Optional[Objective] = Relationship(back_populates="key_results")
 
 
+class ProgressPoint(SQLModel, table=True):
+    """One progress value of a key result; append-only, see src/app/history.py."""
+
+    __table_args__ = (
+        # trends: WHERE key_result_id IN (...) AND at >= ? AND at < ?
+        Index("ix_progresspoint_key_result_id_at", "key_result_id", "at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    key_result_id: int = Field(foreign_key="keyresult.id")
+    at: int  # epoch seconds, UTC
+    value: float
+
+
 class KeyResultCreate(KeyResultBase):
     pass
 
@@ -87,3 +149,47 @@ class KeyResultCreate(KeyResultBase):
 class KeyResultRead(KeyResultBase):
     id: int
     objective_id: int
+
+
+class ObjectiveReadWithKeyResults(ObjectiveRead):
+    """`?expand=key_results` form of an objective."""
+
+    key_results: List[KeyResultRead] = []
+
+
+class KeyResultBatchResult(SQLModel):
+    index: int
+    kr_id: Optional[int] = None
+    status: int
+    key_result: Optional[KeyResultRead] = None
+    detail: Optional[str] = None
+    errors: Optional[Dict[str, List[str]]] = None
+
+
+# AUDIT
+class AuditEventBase(SQLModel):
+    action: str
+    user_id: Optional[int] = None
+    resource_type: Optional[str] = None
+    resource_id: Optional[int] = None
+    ip: Optional[str] = None
+    created_at: datetime
+
+
+class AuditEvent(AuditEventBase, table=True):
+    """Append-only; written in batches by src/app/audit.py."""
+
+    __table_args__ = (
+        # GET /audit: WHERE user_id = ? [AND action = ?] [AND created_at ...] AND id > ? ORDER BY id
+        Index("ix_auditevent_user_id_id", "user_id", "id"),
+        Index("ix_auditevent_user_id_action_id", "user_id", "action", "id"),
+        Index("ix_auditevent_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    detail: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+
+
+class AuditEventRead(AuditEventBase):
+    id: int
+    detail: Optional[Dict[str, Any]] = None
@@ -0,0 +1,46 @@
+# app/pagination.py
+"""Opaque keyset cursors over integer primary keys.
+
+A cursor encodes the last id of the previous page; the next page is
+`WHERE id > :last ORDER BY id LIMIT :n`, which costs the same on every page.
+"""
+import base64
+import binascii
+import json
+
+from fastapi import Request, Response
+
+DEFAULT_PAGE_SIZE = 50
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursor(cursor)
+    return last_id
+
+
+def set_next_page(request: Request, response: Response, rows: list, limit: int):
+    """Advertise the next page via `Link: <...>; rel="next"` and `X-Next-Cursor` headers.
+
+    A full page means there may be more rows; a short page is the last one.
+    """
+    if limit <= 0 or len(rows) < limit:
+        return
+    cursor = encode_cursor(rows[-1].id)
+    url = request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
@@ -0,0 +1,123 @@
+# app/periods.py
+"""Calendar of OKR periods ("Q1 2025" ... "Q4 2025", "FY 2025") and their date ranges.
+
+`period_calendar` builds the `/period-templates` payload (quarters of this
+year and the next) once, already serialized, and an index from period name
+to `(start_date, end_date)` for PERIOD_INDEX_YEARS around today. Both are
+rebuilt lazily on the first call after the date rolls over, so a worker that
+runs past New Year's Eve serves the new year without a restart. Names
+outside the indexed years are still resolved, just without the dict hit.
+"""
+import hashlib
+import os
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+
+from src.app import fastjson
+from src.app.models import Period
+
+PERIOD_INDEX_YEARS = int(os.getenv("PERIOD_INDEX_YEARS", "10"))
+
+PERIOD_NAME_RE = re.compile(r"(Q[1-4]|FY) (\d{4})")
+
+DateRange = tuple[date, date]
+
+
+def parse_period(name: str) -> Optional[tuple[int, Optional[int]]]:
+    """`(year, quarter)` of a period name, quarter None for "FY"; None if it is not one."""
+    match = PERIOD_NAME_RE.fullmatch(name)
+    if match is None:
+        return None
+    kind, year = match.group(1), int(match.group(2))
+    if year < 1:
+        return None
+    return year, None if kind == "FY" else int(kind[1])
+
+
+def period_columns(name: str) -> dict[str, Optional[int]]:
+    """`Objective.period_year` / `period_quarter` values for `period_name`."""
+    year, quarter = parse_period(name) or (None, None)
+    return {"period_year": year, "period_quarter": quarter}
+
+
+def format_period(year: int, quarter: Optional[int]) -> str:
+    return f"FY {year}" if quarter is None else f"Q{quarter} {year}"
+
+
+def period_range(name: str) -> Optional[DateRange]:
+    """Date range of a period name, or None if it is not one."""
+    parsed = parse_period(name)
+    if parsed is None:
+        return None
+    year, q = parsed
+    if q is None:
+        return date(year, 1, 1), date(year, 12, 31)
+    end = date(year, 3 * q + 1, 1) - timedelta(days=1) if q < 4 else date(year, 12, 31)
+    return date(year, 3 * (q - 1) + 1, 1), end
+
+
+def default_period_templates(today: date) -> list[Period]:
+    """Quarters of `today`'s year and the next."""
+    templates: list[Period] = []
+    for year in (today.year, today.year + 1):
+        for q in range(1, 5):
+            start, end = period_range(f"Q{q} {year}")
+            templates.append(Period(name=f"Q{q} {year}", start_date=start, end_date=end))
+    return templates
+
+
+class PeriodCalendar:
+    def __init__(self, clock: Callable[[], date] = date.today, years: int = PERIOD_INDEX_YEARS):
+        self.clock = clock
+        self.years = years
+        self._lock = threading.Lock()
+        self.today: Optional[date] = None
+        self.index: dict[str, DateRange] = {}
+        self.templates_body = b""
+        self.templates_etag = ""
+        self.rebuilds = 0
+
+    def _current(self) -> date:
+        today = self.clock()
+        if today != self.today:
+            with self._lock:
+                if today != self.today:
+                    self._rebuild(today)
+        return today
+
+    def _rebuild(self, today: date):
+        if self.today is None or today.year != self.today.year:
+            index: dict[str, DateRange] = {}
+            for year in range(max(1, today.year - self.years), today.year + self.years + 1):
+                for quarter in (1, 2, 3, 4, None):
+                    name = format_period(year, quarter)
+                    index[name] = period_range(name)
+            templates = [p.model_dump(mode="json") for p in default_period_templates(today)]
+            body = fastjson.encoder.encode(templates).encode("utf-8")
+            self.index = index
+            self.templates_body = body
+            self.templates_etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            self.rebuilds += 1
+        self.today = today
+
+    def lookup(self, name: str) -> Optional[DateRange]:
+        """`(start_date, end_date)` of `name`; None if it is not a period name."""
+        self._current()
+        found = self.index.get(name)
+        return found if found is not None else period_range(name)
+
+    def templates(self) -> tuple[bytes, str]:
+        """Serialized `/period-templates` body and its ETag."""
+        self._current()
+        return self.templates_body, self.templates_etag
+
+    def seconds_until_rollover(self) -> int:
+        """Seconds until the next local midnight, when the templates may change."""
+        today = self._current()
+        midnight = datetime.combine(today + timedelta(days=1), time())
+        return max(1, int((midnight - datetime.now()).total_seconds()))
+
+
+period_calendar = PeriodCalendar()
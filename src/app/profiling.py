@@ -0,0 +1,55 @@
+# app/profiling.py
+"""Per-request SQL profiling, enabled with SQL_PROFILE=true.
+
+Every profiled response gets a `Server-Timing: db;dur=...` header and one
+JSON summary line on the `sql_profile` logger. Statement shapes repeated
+SQL_PROFILE_REPEAT_THRESHOLD times or more are logged as a warning: that is
+how N+1 loops show up.
+"""
+import json
+import logging
+
+from src.app import database
+
+logger = logging.getLogger("sql_profile")
+
+
+def server_timing(profile: database.QueryProfile) -> str:
+    return f'db;dur={profile.seconds * 1000:.3f};desc="{profile.count} queries"'
+
+
+class SQLProfilerMiddleware:
+    """Pure ASGI middleware; a pass-through unless `database.SQL_PROFILE` is set."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not database.SQL_PROFILE:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        with database.profile_queries() as profile:
+
+            async def send_wrapper(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # Streamed bodies keep querying afterwards; the log line has the full count
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(profile).encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path_format", scope["path"])
+                summary = {"method": scope["method"], "route": route, "status": status}
+                summary.update(profile.summary())
+                if summary["repeated"]:
+                    logger.warning("possible N+1: %s", json.dumps(summary))
+                else:
+                    logger.info("%s", json.dumps(summary))
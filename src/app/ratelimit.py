@@ -0,0 +1,201 @@
+# app/ratelimit.py
+"""Login lockout: failed attempts counted per username and per client IP.
+
+`POST /token` asks `login_limiter.retry_after()` before touching the database
+or the hashing pool, so a locked-out credential-stuffing client costs one
+dictionary lookup instead of an Argon2 verification. A key is locked for
+LOGIN_LOCKOUT_SECONDS once it collects its failure limit within
+LOGIN_WINDOW_SECONDS; a successful login clears the username's failures.
+
+Backends:
+
+* `MemoryBackend` (default) - exact sliding windows, one bounded deque of
+  failure times per key, stored in an `LRUCache` so a flood of distinct
+  usernames cannot grow memory without bound. Locks live in a separate dict
+  that is never evicted, only swept once they expire: otherwise failures on
+  LOGIN_LIMITER_SIZE throwaway usernames would push a victim's lock out.
+* `SharedBackend` - any async client with the redis-py subset `get(key)`,
+  `set(key, value, px=ms)`, `incr(key)`, `pexpire(key, ms)` and
+  `delete(*keys)`; selected with LOGIN_LIMITER_URL (needs the `redis`
+  package). Windows are approximated from two fixed buckets.
+* LOGIN_LIMITER_BACKEND=none disables the lockout.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, NamedTuple, Optional
+
+from src.app.lru import LRUCache
+
+LOGIN_LIMITER_BACKEND = os.getenv("LOGIN_LIMITER_BACKEND", "memory")
+LOGIN_LIMITER_URL = os.getenv("LOGIN_LIMITER_URL")
+LOGIN_LIMITER_SIZE = int(os.getenv("LOGIN_LIMITER_SIZE", "100000"))
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_IP_MAX_FAILURES = int(os.getenv("LOGIN_IP_MAX_FAILURES", "50"))
+LOGIN_WINDOW_SECONDS = float(os.getenv("LOGIN_WINDOW_SECONDS", "180"))
+LOGIN_LOCKOUT_SECONDS = float(os.getenv("LOGIN_LOCKOUT_SECONDS", "300"))
+
+
+class Rule(NamedTuple):
+    max_failures: int
+    window: float
+    lockout: float
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = LOGIN_LIMITER_SIZE, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        # Only the last `max_failures` times of a key matter, so every operation is O(1)
+        self.failures = LRUCache(maxsize=maxsize, ttl=LOGIN_WINDOW_SECONDS, clock=clock)
+        self.locks: dict[str, float] = {}
+        self._sweep_at = maxsize
+        self._lock = threading.Lock()
+
+    async def locked_for(self, key: str) -> float:
+        locked_until = self.locks.get(key)
+        if locked_until is None:
+            return 0.0
+        return max(0.0, locked_until - self.clock())
+
+    def _sweep(self, now: float):
+        # Amortized O(1): the dict is scanned only each time it doubles past maxsize
+        self.locks = {key: until for key, until in self.locks.items() if until > now}
+        self._sweep_at = max(self._sweep_at, 2 * len(self.locks))
+
+    async def add_failure(self, key: str, rule: Rule) -> float:
+        now = self.clock()
+        with self._lock:
+            failures = self.failures.get(key)
+            if failures is None or failures.maxlen != rule.max_failures:
+                failures = deque(maxlen=rule.max_failures)
+            failures.append(now)
+            if len(failures) < rule.max_failures or now - failures[0] > rule.window:
+                self.failures.set(key, failures, ttl=rule.window)
+                return 0.0
+            self.failures.delete(key)
+            if len(self.locks) >= self._sweep_at:
+                self._sweep(now)
+            self.locks[key] = now + rule.lockout
+        return rule.lockout
+
+    async def reset(self, key: str, rule: Rule):
+        with self._lock:
+            self.failures.delete(key)
+            self.locks.pop(key, None)
+
+
+class SharedBackend:
+    """Lockout state shared by all workers; expiry is left to the store."""
+
+    def __init__(self, client, prefix: str = "okr:login:", clock: Callable[[], float] = time.time):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    async def locked_for(self, key: str) -> float:
+        raw = await self.client.get(f"{self.prefix}lock:{key}")
+        if raw is None:
+            return 0.0
+        return max(0.0, float(raw) - self.clock())
+
+    async def add_failure(self, key: str, rule: Rule) -> float:
+        now = self.clock()
+        bucket = int(now // rule.window)
+        current_key = f"{self.prefix}fail:{key}:{bucket}"
+        current = await self.client.incr(current_key)
+        if current == 1:
+            await self.client.pexpire(current_key, int(rule.window * 2000))
+        previous = int(await self.client.get(f"{self.prefix}fail:{key}:{bucket - 1}") or 0)
+        # The previous bucket counts for the part of it still inside the window
+        elapsed = (now % rule.window) / rule.window
+        if previous * (1 - elapsed) + current < rule.max_failures:
+            return 0.0
+        locked_until = now + rule.lockout
+        await self.client.set(
+            f"{self.prefix}lock:{key}", repr(locked_until), px=int(rule.lockout * 1000)
+        )
+        await self.client.delete(current_key)
+        return rule.lockout
+
+    async def reset(self, key: str, rule: Rule):
+        bucket = int(self.clock() // rule.window)
+        await self.client.delete(
+            f"{self.prefix}lock:{key}",
+            f"{self.prefix}fail:{key}:{bucket}",
+            f"{self.prefix}fail:{key}:{bucket - 1}",
+        )
+
+
+class LimiterStats:
+    def __init__(self):
+        self.checks = 0
+        self.rejected = 0
+        self.failures = 0
+        self.lockouts = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "checks": self.checks,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "lockouts": self.lockouts,
+        }
+
+
+class LoginLimiter:
+    def __init__(
+        self, backend=None, user_rule: Optional[Rule] = None, ip_rule: Optional[Rule] = None
+    ):
+        self.backend = backend
+        self.user_rule = user_rule or Rule(
+            LOGIN_MAX_FAILURES, LOGIN_WINDOW_SECONDS, LOGIN_LOCKOUT_SECONDS
+        )
+        self.ip_rule = ip_rule or Rule(
+            LOGIN_IP_MAX_FAILURES, LOGIN_WINDOW_SECONDS, LOGIN_LOCKOUT_SECONDS
+        )
+        self.stats = LimiterStats()
+
+    def _keys(self, username: str, ip: Optional[str]):
+        yield f"user:{username.lower()}", self.user_rule
+        if ip:
+            yield f"ip:{ip}", self.ip_rule
+
+    async def retry_after(self, username: str, ip: Optional[str]) -> float:
+        """Seconds until this username/IP may try again; 0 when the attempt is allowed."""
+        if self.backend is None:
+            return 0.0
+        self.stats.checks += 1
+        wait = 0.0
+        for key, _ in self._keys(username, ip):
+            wait = max(wait, await self.backend.locked_for(key))
+        if wait > 0:
+            self.stats.rejected += 1
+        return wait
+
+    async def failed(self, username: str, ip: Optional[str]):
+        if self.backend is None:
+            return
+        self.stats.failures += 1
+        for key, rule in self._keys(username, ip):
+            if await self.backend.add_failure(key, rule) > 0:
+                self.stats.lockouts += 1
+
+    async def succeeded(self, username: str):
+        if self.backend is not None:
+            await self.backend.reset(f"user:{username.lower()}", self.user_rule)
+
+
+def build_backend():
+    if LOGIN_LIMITER_BACKEND == "none":
+        return None
+    if LOGIN_LIMITER_URL:
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("LOGIN_LIMITER_URL needs the 'redis' package: pip install redis")
+        return SharedBackend(redis.asyncio.from_url(LOGIN_LIMITER_URL))
+    return MemoryBackend()
+
+
+login_limiter = LoginLimiter(build_backend())
@@ -0,0 +1,62 @@
+# app/reports.py
+"""Streaming CSV / NDJSON report bodies.
+
+Rows come from a server-side cursor (`yield_per`) in a session owned by the
+generator itself: dependency sessions are closed before a StreamingResponse
+starts sending, and memory stays flat regardless of report size.
+"""
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, Sequence
+
+from src.app.database import open_session
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+REPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+OBJECTIVE_REPORT_FIELDS = ["id", "title", "metric", "target", "progress"]
+ALL_OBJECTIVES_FIELDS = [
+    "objective_id",
+    "objective_title",
+    "period_name",
+    "kr_id",
+    "kr_title",
+    "metric",
+    "target",
+    "progress",
+]
+
+
+async def stream_rows(statement, fieldnames: Sequence[str]) -> AsyncIterator[list[dict]]:
+    """Yield batches of row dicts keyed by `fieldnames` (in select column order)."""
+    statement = statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    async with open_session(read_only=True) as session:
+        result = await session.stream(statement)
+        async for partition in result.partitions(EXPORT_BATCH_SIZE):
+            yield [dict(zip(fieldnames, row)) for row in partition]
+
+
+async def csv_chunks(statement, fieldnames: Sequence[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for batch in stream_rows(statement, fieldnames):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+async def ndjson_chunks(statement, fieldnames: Sequence[str]) -> AsyncIterator[str]:
+    async for batch in stream_rows(statement, fieldnames):
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch)
+
+
+def report_chunks(format: str, statement, fieldnames: Sequence[str]) -> AsyncIterator[str]:
+    if format == "ndjson":
+        return ndjson_chunks(statement, fieldnames)
+    return csv_chunks(statement, fieldnames)
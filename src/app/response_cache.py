@@ -0,0 +1,143 @@
+# app/response_cache.py
+"""Server-side cache of rendered `/stats` and objective report bodies.
+
+Entries are keyed per user (and objective/format for reports) and by the
+user's `data_version`, the same value the ETag is built from. Every write
+bumps the version, so a write makes the old entries unreachable in every
+process at once, and a body computed before a write can only ever be stored
+under the version it was computed for. Nothing has to be invalidated; the
+TTL and the LRU bound only the memory held by superseded versions.
+
+Backends:
+
+* `MemoryBackend` (default) - the in-process `LRUCache`.
+* `SharedBackend` - any async client with the redis-py subset
+  `get(key)` and `set(key, value, px=ms)`; selected with
+  RESPONSE_CACHE_URL (needs the `redis` package) or by assigning
+  `response_cache.backend` at startup.
+* RESPONSE_CACHE_BACKEND=none disables caching.
+"""
+import os
+from typing import AsyncIterator, NamedTuple, Optional
+
+from src.app.lru import LRUCache
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))
+# Versioned keys never go stale; the TTL only reclaims superseded versions
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+# Larger bodies (big streamed reports) are served but not kept
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024)))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: str
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        self.cache.set(key, value, ttl=ttl)
+
+    @property
+    def evictions(self) -> int:
+        return self.cache.evictions
+
+
+class SharedBackend:
+    """Cache shared by all workers; eviction is left to the store."""
+
+    evictions = 0
+
+    def __init__(self, client, prefix: str = "okr:response:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        media_type, _, body = raw.partition(b"\n")
+        return CachedResponse(body, media_type.decode())
+
+    async def set(self, key: str, value: CachedResponse, ttl: float):
+        raw = value.media_type.encode() + b"\n" + value.body
+        await self.client.set(self.prefix + key, raw, px=max(1, int(ttl * 1000)))
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        if self.backend is None:
+            return None
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def put(self, key: str, body: bytes, media_type: str) -> CachedResponse:
+        value = CachedResponse(body, media_type)
+        if self.backend is not None and len(body) <= RESPONSE_CACHE_MAX_BYTES:
+            await self.backend.set(key, value, self.ttl)
+        return value
+
+    async def tee(self, key: str, chunks: AsyncIterator[str], media_type: str):
+        """Pass a streamed body through, caching it afterwards if it stayed small."""
+        parts: Optional[list] = []
+        size = 0
+        async for chunk in chunks:
+            data = chunk.encode("utf-8")
+            if parts is not None:
+                size += len(data)
+                if size <= RESPONSE_CACHE_MAX_BYTES:
+                    parts.append(data)
+                else:
+                    parts = None
+            yield data
+        if parts is not None:
+            await self.put(key, b"".join(parts), media_type)
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions if self.backend else 0,
+        }
+
+
+def stats_key(user_id: int, version: int) -> str:
+    return f"stats:{user_id}:{version}"
+
+
+def report_key(user_id: int, version: int, objective_id: int, format: str) -> str:
+    return f"report:{user_id}:{version}:{objective_id}:{format}"
+
+
+def build_backend():
+    if RESPONSE_CACHE_BACKEND == "none":
+        return None
+    if RESPONSE_CACHE_URL:
+        try:
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL needs the 'redis' package: pip install redis")
+        return SharedBackend(redis.asyncio.from_url(RESPONSE_CACHE_URL))
+    return MemoryBackend()
+
+
+response_cache = ResponseCache(build_backend())
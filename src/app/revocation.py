@@ -0,0 +1,124 @@
+# app/revocation.py
+"""Token revocation checked in memory, persisted in the `revokedtoken` table.
+
+Two kinds of entries: one token by `jti` (logout) and every token of a user
+issued before a point in time (password change). Each lives only until the
+tokens it covers would have expired anyway, so the denylist stays small.
+
+Revocations apply to the local `denylist` immediately; other workers pick
+them up from the table every REVOCATION_SYNC_SECONDS, on top of which their
+token caches may serve a revoked token for up to TOKEN_CACHE_TTL_SECONDS.
+Both bounds together stay well inside the 5-minute revocation NFR.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlmodel import delete, select
+
+from src.app.database import DBSession, open_session
+from src.app.models import RefreshToken, RevokedToken
+
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+
+
+class Denylist:
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._tokens: dict[str, float] = {}  # jti -> token expiry
+        self._users: dict[int, tuple[float, float]] = {}  # user id -> (issued_before, expiry)
+        self._lock = threading.Lock()
+        # Ids of the rows already applied, until they expire. Ids are not a
+        # watermark: on Postgres a row with a lower id may commit after a higher one.
+        self._seen: dict[int, float] = {}  # row id -> expiry
+
+    def __len__(self) -> int:
+        return len(self._tokens) + len(self._users)
+
+    def apply(self, entry: RevokedToken):
+        with self._lock:
+            if entry.jti is not None:
+                self._tokens[entry.jti] = entry.expires_at
+            if entry.issued_before is not None:
+                before, expires_at = self._users.get(entry.user_id, (0.0, 0.0))
+                self._users[entry.user_id] = (
+                    max(before, entry.issued_before),
+                    max(expires_at, entry.expires_at),
+                )
+            if entry.id is not None:
+                self._seen[entry.id] = entry.expires_at
+
+    def is_revoked(self, jti: Optional[str], user_id: int, issued_at: float) -> bool:
+        if jti is not None and jti in self._tokens:
+            return True
+        user = self._users.get(user_id)
+        return user is not None and issued_at < user[0]
+
+    def prune(self) -> int:
+        now = self.clock()
+        with self._lock:
+            tokens = [jti for jti, expires_at in self._tokens.items() if expires_at <= now]
+            users = [uid for uid, (_, expires_at) in self._users.items() if expires_at <= now]
+            for jti in tokens:
+                del self._tokens[jti]
+            for uid in users:
+                del self._users[uid]
+            self._seen = {
+                row_id: expires_at for row_id, expires_at in self._seen.items() if expires_at > now
+            }
+        return len(tokens) + len(users)
+
+    async def sync(self, session: DBSession) -> list[RevokedToken]:
+        """Load entries not applied yet (written by any worker); return them.
+
+        Every unexpired row is read, which stays cheap because rows only live
+        as long as the tokens they cover.
+        """
+        rows = (
+            await session.exec(
+                select(RevokedToken)
+                .where(RevokedToken.expires_at > self.clock())
+                .order_by(RevokedToken.id)
+            )
+        ).all()
+        entries = [entry for entry in rows if entry.id not in self._seen]
+        for entry in entries:
+            self.apply(entry)
+        self.prune()
+        return entries
+
+
+denylist = Denylist()
+
+
+async def revoke(session: DBSession, entry: RevokedToken):
+    """Persist `entry` and commit; it is enforced locally right away."""
+    session.add(entry)
+    await session.commit()
+    await session.refresh(entry)
+    denylist.apply(entry)
+
+
+async def purge_expired(session: DBSession, now: Optional[float] = None):
+    now = time.time() if now is None else now
+    await session.exec(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    await session.exec(delete(RefreshToken).where(RefreshToken.expires_at <= now))
+    await session.commit()
+
+
+async def sync_once(on_revoked: Callable[[RevokedToken], None] = lambda entry: None):
+    async with open_session() as session:
+        for entry in await denylist.sync(session):
+            on_revoked(entry)
+        await purge_expired(session)
+
+
+async def sync_forever(on_revoked: Callable[[RevokedToken], None]):
+    while True:
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+        try:
+            await sync_once(on_revoked)
+        except Exception as exc:  # keep syncing through transient DB errors
+            print(f"WARNING: token revocation sync failed: {exc!r}")
@@ -0,0 +1,141 @@
+# app/rollups.py
+"""Incrementally maintained per-objective progress rollups.
+
+`Objective.kr_count` and `Objective.progress_sum` hold the number of key
+results and the sum of their clamped progress ratios. Write handlers apply
+deltas inside their own transaction; `rebuild` and `verify` recompute the
+rollups from the key results to repair or detect drift:
+
+    python -m src.app.rollups verify
+    python -m src.app.rollups rebuild
+"""
+import argparse
+import math
+import sys
+from typing import List, Mapping, Optional, Tuple
+
+from sqlalchemy import bindparam, case, update
+from sqlmodel import Session, select
+
+from src.app.database import DBSession
+from src.app.models import Objective
+from src.app.stats import aggregate_statement
+
+DRIFT_TOLERANCE = 1e-6
+
+
+def clamp_ratio(progress: float, target: float) -> float:
+    ratio = progress / target if target > 0 else 0.0
+    return min(max(ratio, 0.0), 1.0)
+
+
+async def apply_delta(session: DBSession, objective_id: int, count_delta: int, ratio_delta: float):
+    """Shift an objective's rollup in the current transaction without reading it first."""
+    new_count = Objective.kr_count + count_delta
+    await session.exec(
+        update(Objective)
+        .where(Objective.id == objective_id)
+        .values(
+            kr_count=new_count,
+            # An empty objective always resets to an exact zero, so float error cannot pile up.
+            progress_sum=case((new_count <= 0, 0.0), else_=Objective.progress_sum + ratio_delta),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def key_result_added(session: DBSession, objective_id: int, progress: float, target: float):
+    await apply_delta(session, objective_id, 1, clamp_ratio(progress, target))
+
+
+async def key_result_changed(
+    session: DBSession,
+    objective_id: int,
+    old: Tuple[float, float],
+    new: Tuple[float, float],
+):
+    delta = clamp_ratio(*new) - clamp_ratio(*old)
+    if delta:
+        await apply_delta(session, objective_id, 0, delta)
+
+
+async def key_results_changed(session: DBSession, ratio_deltas: Mapping[int, float]):
+    """Apply several objectives' progress deltas as one executemany UPDATE.
+
+    Rows are updated in id order, so concurrent batches lock them in the same order.
+    """
+    params = [{"obj_id": k, "delta": d} for k, d in sorted(ratio_deltas.items()) if d]
+    if not params:
+        return
+    await session.exec(
+        update(Objective.__table__)
+        .where(Objective.__table__.c.id == bindparam("obj_id"))
+        .values(progress_sum=Objective.__table__.c.progress_sum + bindparam("delta")),
+        params=params,
+    )
+
+
+async def key_result_removed(session: DBSession, objective_id: int, progress: float, target: float):
+    await apply_delta(session, objective_id, -1, -clamp_ratio(progress, target))
+
+
+# Drift detection / repair
+def find_drift(
+    session: Session, owner_id: Optional[int] = None
+) -> List[Tuple[int, int, float, int, float]]:
+    """Return (objective_id, kr_count, progress_sum, expected_count, expected_sum) mismatches."""
+    statement = select(Objective.id, Objective.kr_count, Objective.progress_sum)
+    if owner_id is not None:
+        statement = statement.where(Objective.owner_id == owner_id)
+    stored = {
+        obj_id: (kr_count, progress_sum)
+        for obj_id, kr_count, progress_sum in session.exec(statement)
+    }
+    drift = []
+    for obj_id, count, ratio_sum in session.exec(aggregate_statement(owner_id)):
+        kr_count, progress_sum = stored.get(obj_id, (0, 0.0))
+        if kr_count != count or not math.isclose(
+            progress_sum, ratio_sum, rel_tol=DRIFT_TOLERANCE, abs_tol=DRIFT_TOLERANCE
+        ):
+            drift.append((obj_id, kr_count, progress_sum, count, ratio_sum))
+    return drift
+
+
+def rebuild(session: Session, owner_id: Optional[int] = None) -> int:
+    """Recompute rollups from key results and commit. Returns the number of fixed objectives."""
+    drift = find_drift(session, owner_id)
+    for obj_id, _, _, count, ratio_sum in drift:
+        session.exec(
+            update(Objective)
+            .where(Objective.id == obj_id)
+            .values(kr_count=count, progress_sum=ratio_sum)
+            .execution_options(synchronize_session=False)
+        )
+    session.commit()
+    return len(drift)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.app.database import engine
+
+    parser = argparse.ArgumentParser(description="Verify or rebuild objective progress rollups")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--owner-id", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        if args.command == "rebuild":
+            print(f"Rebuilt rollups for {rebuild(session, args.owner_id)} objective(s).")
+            return 0
+        drift = find_drift(session, args.owner_id)
+    for obj_id, kr_count, progress_sum, count, ratio_sum in drift:
+        print(
+            f"objective {obj_id}: stored kr_count={kr_count} progress_sum={progress_sum!r}, "
+            f"expected kr_count={count} progress_sum={ratio_sum!r}"
+        )
+    print(f"{len(drift)} objective(s) drifted.")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,114 @@
 # app/routes.py
-import csv
-import io
-from typing import List
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlmodel import delete, select, update
 
-from src.app.auth import authenticate_user, create_access_token, get_current_user, get_password_hash
-from src.app.database import get_session
-from src.app.exceptions import ProblemException
+from src.app import fastjson, history, rollups
+from src.app.audit import audit_log
+from src.app.auth import (
+    Principal,
+    decode_token,
+    forget_token,
+    get_current_user,
+    get_password_hash,
+    get_user_by_username,
+    invalidate_user_tokens,
+    issue_tokens,
+    max_token_lifetime,
+    oauth2_scheme,
+    verify_password,
+)
+from src.app.conditional import bump_data_version, conditional_get, etag_matches
+from src.app.database import DBSession, get_read_session, get_session, select_for_update
+from src.app.exceptions import ProblemException, validation_error_map
+from src.app.fastjson import FastJSONResponse, RowSerializer
+from src.app.hashing import HashQueueFull
+from src.app.imports import (
+    IMPORT_MEDIA_TYPES,
+    ImportFormatError,
+    import_objectives,
+    ndjson_lines,
+    parse_body,
+)
+from src.app.metrics import registry
 from src.app.models import (
+    AuditEvent,
+    AuditEventRead,
     KeyResult,
+    KeyResultBatchResult,
     KeyResultRead,
+    LogoutRequest,
     Objective,
     ObjectiveRead,
+    ObjectiveReadWithKeyResults,
+    PasswordChange,
     Period,
+    RefreshRequest,
+    RefreshToken,
+    RevokedToken,
     Token,
     User,
     UserCreate,
-    default_period_templates,
 )
-from src.app.schemas.validation import ValidatedKeyResultCreate, ValidatedObjectiveCreate
+from src.app.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, decode_cursor, set_next_page
+from src.app.periods import parse_period, period_calendar, period_columns
+from src.app.ratelimit import login_limiter
+from src.app.reports import (
+    ALL_OBJECTIVES_FIELDS,
+    OBJECTIVE_REPORT_FIELDS,
+    REPORT_MEDIA_TYPES,
+    report_chunks,
+)
+from src.app.response_cache import report_key, response_cache, stats_key
+from src.app.revocation import revoke
+from src.app.schemas.validation import (
+    ValidatedKeyResultCreate,
+    ValidatedKeyResultUpdate,
+    ValidatedObjectiveCreate,
+)
+from src.app.stats import compute_stats
 
 router = APIRouter()
 
+KEY_RESULT_BATCH_LIMIT = 500
+AUDIT_PAGE_LIMIT = 500
+
+OBJECTIVE_ROWS = RowSerializer(ObjectiveRead, Objective)
+KEY_RESULT_ROWS = RowSerializer(KeyResultRead, KeyResult)
+
+Expand = Optional[Literal["key_results"]]
+
+
+def with_key_results(obj: Objective) -> ObjectiveReadWithKeyResults:
+    """Read model of an objective whose `key_results` were loaded with `selectinload`."""
+    return ObjectiveReadWithKeyResults(
+        id=obj.id,
+        title=obj.title,
+        period_name=obj.period_name,
+        owner_id=obj.owner_id,
+        key_results=[
+            KeyResultRead(
+                id=kr.id,
+                title=kr.title,
+                metric=kr.metric,
+                target=kr.target,
+                progress=kr.progress,
+                objective_id=kr.objective_id,
+            )
+            for kr in obj.key_results
+        ],
+    )
+
+
 PROBLEM_TYPES = {
     "username_exists": "https://api.okr.example.com/probs/username-exists",
     "invalid_credentials": "https://api.okr.example.com/probs/invalid-credentials",
@@ -34,101 +117,392 @@ PROBLEM_TYPES = {
     "access_denied": "https://api.okr.example.com/probs/access-denied",
     "duplicate_objective": "https://api.okr.example.com/probs/duplicate-objective",
     "unauthorized": "https://api.okr.example.com/probs/unauthorized",
+    "too_many_requests": "https://api.okr.example.com/probs/too-many-requests",
+    "invalid_cursor": "https://api.okr.example.com/probs/invalid-cursor",
 }
 
 
-# AUTH endpoints
-@router.post("/signup", response_model=Token)
-def signup(user_in: UserCreate, session: Session = Depends(get_session)):
-    if session.exec(select(User).where(User.username == user_in.username)).first():
+def parse_cursor(cursor: str) -> int:
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursor:
         raise ProblemException(
             status_code=400,
             title="Bad Request",
-            detail="Username already registered",
-            type=PROBLEM_TYPES["username_exists"],
+            detail="Malformed pagination cursor",
+            type=PROBLEM_TYPES["invalid_cursor"],
         )
-    user = User(username=user_in.username, hashed_password=get_password_hash(user_in.password))
+
+
+def username_exists() -> ProblemException:
+    return ProblemException(
+        status_code=400,
+        title="Bad Request",
+        detail="Username already registered",
+        type=PROBLEM_TYPES["username_exists"],
+    )
+
+
+def duplicate_objective() -> ProblemException:
+    return ProblemException(
+        status_code=400,
+        title="Bad Request",
+        detail="Objective in the same period already exists",
+        type=PROBLEM_TYPES["duplicate_objective"],
+    )
+
+
+def hashing_busy() -> ProblemException:
+    return ProblemException(
+        status_code=429,
+        title="Too Many Requests",
+        detail="Too many concurrent sign-ins, retry shortly",
+        type=PROBLEM_TYPES["too_many_requests"],
+    )
+
+
+def client_ip(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
+
+# AUTH endpoints
+@router.post("/signup", response_model=Token)
+async def signup(request: Request, user_in: UserCreate, session: DBSession = Depends(get_session)):
+    if await get_user_by_username(session, user_in.username):
+        raise username_exists()
+    try:
+        hashed_password = await get_password_hash(user_in.password)
+    except HashQueueFull:
+        raise hashing_busy()
+    user = User(username=user_in.username, hashed_password=hashed_password)
     session.add(user)
-    session.commit()
-    session.refresh(user)
-    access_token = create_access_token({"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    try:
+        await session.commit()
+    except IntegrityError:
+        # Lost a race against a concurrent signup for the same username
+        await session.rollback()
+        raise username_exists()
+    await session.refresh(user)
+    tokens = await issue_tokens(session, user)
+    await session.commit()
+    audit_log.record("auth.signup", user.id, "user", user.id, ip=client_ip(request))
+    return tokens
+
+
+def login_locked(retry_after: float) -> ProblemException:
+    return ProblemException(
+        status_code=429,
+        title="Too Many Requests",
+        detail="Too many failed login attempts, retry later",
+        type=PROBLEM_TYPES["too_many_requests"],
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: DBSession = Depends(get_session),
 ):
-    user = authenticate_user(session, form_data.username, form_data.password)
-    if not user:
+    # Locked-out attempts are refused before any DB lookup or Argon2 verification
+    ip = client_ip(request)
+    retry_after = await login_limiter.retry_after(form_data.username, ip)
+    if retry_after > 0:
+        audit_log.record("auth.login_locked", ip=ip, username=form_data.username)
+        raise login_locked(retry_after)
+    user = await get_user_by_username(session, form_data.username)
+    try:
+        valid = user is not None and await verify_password(form_data.password, user.hashed_password)
+    except HashQueueFull:
+        raise hashing_busy()
+    if not valid:
+        await login_limiter.failed(form_data.username, ip)
+        # Attributed to the account when it exists, so its owner can read the attempts
+        user_id = user.id if user is not None else None
+        audit_log.record(
+            "auth.login_failed", user_id, "user", user_id, ip=ip, username=form_data.username
+        )
         raise ProblemException(
             status_code=400,
             title="Bad Request",
             detail="Incorrect username or password",
             type=PROBLEM_TYPES["invalid_credentials"],
         )
-    access_token = create_access_token({"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    await login_limiter.succeeded(form_data.username)
+    tokens = await issue_tokens(session, user)
+    await session.commit()
+    audit_log.record("auth.login", user.id, "user", user.id, ip=ip)
+    return tokens
+
+
+def invalid_refresh_token() -> ProblemException:
+    return ProblemException(
+        status_code=401,
+        title="Unauthorized",
+        detail="Invalid or expired refresh token",
+        type=PROBLEM_TYPES["unauthorized"],
+    )
+
+
+async def revoke_family(session: DBSession, family: str):
+    await session.exec(delete(RefreshToken).where(RefreshToken.family == family))
+
+
+@router.post("/auth/refresh", response_model=Token)
+async def refresh_tokens(
+    request: Request, body: RefreshRequest, session: DBSession = Depends(get_session)
+):
+    """Trade a refresh token for a new access/refresh pair; the old one is spent."""
+    payload = decode_token(body.refresh_token, "refresh")
+    if payload is None:
+        raise invalid_refresh_token()
+    stored = await session.get(RefreshToken, payload["jti"])
+    if stored is None:
+        raise invalid_refresh_token()
+    # Only one concurrent refresh can flip `used`; everyone else sees a reuse
+    spent = await session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.jti == stored.jti, RefreshToken.used.is_(False))
+        .values(used=True)
+        .execution_options(synchronize_session=False)
+    )
+    if spent.rowcount != 1:
+        # A spent token came back: assume it leaked and end the whole login session
+        await revoke_family(session, stored.family)
+        await session.commit()
+        audit_log.record(
+            "auth.refresh_reused", stored.user_id, "user", stored.user_id, ip=client_ip(request)
+        )
+        raise invalid_refresh_token()
+    user = await session.get(User, stored.user_id)
+    if user is None:
+        raise invalid_refresh_token()
+    tokens = await issue_tokens(session, user, family=stored.family)
+    await session.commit()
+    audit_log.record("auth.refresh", user.id, "user", user.id, ip=client_ip(request))
+    return tokens
+
+
+@router.post("/auth/logout")
+async def logout(
+    request: Request,
+    body: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
+):
+    """Revoke the presented access token and end its login session.
+
+    The session's refresh tokens are found through the access token's `sid`;
+    a refresh token in the body ends that token's session as well.
+    """
+    families = set()
+    if current_user.session_id is not None:
+        families.add(current_user.session_id)
+    if body is not None and body.refresh_token:
+        refresh = decode_token(body.refresh_token, "refresh")
+        stored = refresh and await session.get(RefreshToken, refresh["jti"])
+        if stored and stored.user_id == current_user.id:
+            families.add(stored.family)
+    for family in families:
+        await revoke_family(session, family)
+    await revoke(
+        session,
+        RevokedToken(
+            user_id=current_user.id,
+            jti=current_user.jti,
+            expires_at=current_user.expires_at or time.time() + max_token_lifetime(),
+        ),
+    )
+    forget_token(token)
+    audit_log.record("auth.logout", current_user.id, "user", current_user.id, ip=client_ip(request))
+    return {"ok": True}
+
+
+@router.post("/auth/change-password", response_model=Token)
+async def change_password(
+    request: Request,
+    body: PasswordChange,
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
+):
+    """Set a new password and revoke every token issued before; returns a fresh pair."""
+    user = await session.get(User, current_user.id)
+    try:
+        if not await verify_password(body.current_password, user.hashed_password):
+            audit_log.record(
+                "auth.password_change_failed", user.id, "user", user.id, ip=client_ip(request)
+            )
+            raise ProblemException(
+                status_code=400,
+                title="Bad Request",
+                detail="Incorrect password",
+                type=PROBLEM_TYPES["invalid_credentials"],
+            )
+        user.hashed_password = await get_password_hash(body.new_password)
+    except HashQueueFull:
+        raise hashing_busy()
+    session.add(user)
+    await session.exec(delete(RefreshToken).where(RefreshToken.user_id == user.id))
+    now = time.time()
+    await revoke(
+        session,
+        RevokedToken(user_id=user.id, issued_before=now, expires_at=now + max_token_lifetime()),
+    )
+    invalidate_user_tokens(user.id)
+    tokens = await issue_tokens(session, user)
+    await session.commit()
+    audit_log.record("auth.password_changed", user.id, "user", user.id, ip=client_ip(request))
+    return tokens
 
 
 # Period templates endpoint
 @router.get("/period-templates", response_model=List[Period])
-def list_period_templates():
-    return default_period_templates()
+async def list_period_templates(request: Request):
+    # Precomputed bytes; they only change when the calendar rolls over
+    body, etag = period_calendar.templates()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={period_calendar.seconds_until_rollover()}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 # Objective CRUD
 @router.post("/objectives", response_model=ObjectiveRead)
-def create_objective(
+async def create_objective(
     obj_in: ValidatedObjectiveCreate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    statement = select(Objective).where(
-        Objective.owner_id == current_user.id,
-        Objective.period_name == obj_in.period_name,
+    obj = Objective(
+        title=obj_in.title,
+        period_name=obj_in.period_name,
+        owner_id=current_user.id,
+        **period_columns(obj_in.period_name),
     )
-    existing = session.exec(statement).first()
-    if existing:
-        raise ProblemException(
-            status_code=400,
-            title="Bad Request",
-            detail="Objective in the same period already exists",
-            type=PROBLEM_TYPES["duplicate_objective"],
-        )
-    obj = Objective(title=obj_in.title, period_name=obj_in.period_name, owner_id=current_user.id)
     session.add(obj)
-    session.commit()
-    session.refresh(obj)
+    # The (owner_id, period_name) unique index rejects duplicates, no lookup needed
+    try:
+        await bump_data_version(session, current_user.id)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise duplicate_objective()
+    audit_log.record("objective.create", current_user.id, "objective", obj.id)
+    await session.refresh(obj)
     return ObjectiveRead(
         id=obj.id, title=obj.title, period_name=obj.period_name, owner_id=obj.owner_id
     )
 
 
-@router.get("/objectives", response_model=List[ObjectiveRead])
-def list_objectives(
+@router.get(
+    "/objectives", response_model=Union[List[ObjectiveReadWithKeyResults], List[ObjectiveRead]]
+)
+async def list_objectives(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 50,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    expand: Expand = None,
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
 ):
-    objs = session.exec(
-        select(Objective).where(Objective.owner_id == current_user.id).offset(skip).limit(limit)
-    ).all()
+    # Expanded pages need ORM entities for the relationship; still two queries per page
+    fast = fastjson.FAST_JSON_RESPONSES and expand is None
+    statement = (
+        select(*OBJECTIVE_ROWS.columns if fast else (Objective,))
+        .where(Objective.owner_id == current_user.id)
+        .order_by(Objective.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        statement = statement.where(Objective.id > parse_cursor(cursor))
+    elif skip:
+        statement = statement.offset(skip)
+    if expand is not None:
+        statement = statement.options(selectinload(Objective.key_results))
+    objs = (await session.exec(statement)).all()
+    set_next_page(request, response, objs, limit)
+    if fast:
+        return FastJSONResponse(OBJECTIVE_ROWS.dicts(objs), headers=response.headers)
+    if expand is not None:
+        return [with_key_results(o) for o in objs]
     return [
         ObjectiveRead(id=o.id, title=o.title, period_name=o.period_name, owner_id=o.owner_id)
         for o in objs
     ]
 
 
-@router.get("/objectives/{objective_id}", response_model=ObjectiveRead)
-def get_objective(
+@router.post("/objectives/import")
+async def import_objectives_route(
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
+):
+    """Create objectives with nested key results from a JSON list or a report-layout CSV.
+
+    Answers with one NDJSON line per imported objective.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    format = IMPORT_MEDIA_TYPES.get(content_type)
+    if format is None:
+        raise ProblemException(
+            status_code=415,
+            title="Unsupported Media Type",
+            detail="Send application/json or text/csv",
+            type=PROBLEM_TYPES["validation_error"],
+        )
+    body = await request.body()
+    try:
+        items = parse_body(body, format)
+    except ImportFormatError as exc:
+        raise ProblemException(
+            status_code=422,
+            title="Unprocessable Entity",
+            detail=str(exc),
+            type=PROBLEM_TYPES["validation_error"],
+        )
+    try:
+        results = await import_objectives(session, current_user.id, items)
+    except IntegrityError:
+        # A concurrent write took one of the periods after they were preloaded
+        await session.rollback()
+        raise duplicate_objective()
+    imported = [r["id"] for r in results if r["status"] == 201]
+    if imported:
+        audit_log.record("objective.import", current_user.id, "objective", objective_ids=imported)
+    return StreamingResponse(ndjson_lines(results), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/objectives/{objective_id}",
+    response_model=Union[ObjectiveReadWithKeyResults, ObjectiveRead],
+)
+async def get_objective(
     objective_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    expand: Expand = None,
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
 ):
-    obj = session.get(Objective, objective_id)
+    if expand is not None:
+        # Ownership is part of the query, so a foreign objective's KRs are never loaded
+        obj = (
+            await session.exec(
+                select(Objective)
+                .where(Objective.id == objective_id, Objective.owner_id == current_user.id)
+                .options(selectinload(Objective.key_results))
+            )
+        ).first()
+    else:
+        obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -137,19 +511,21 @@ def get_objective(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/objectives/{objective_id}",
         )
+    if expand is not None:
+        return with_key_results(obj)
     return ObjectiveRead(
         id=obj.id, title=obj.title, period_name=obj.period_name, owner_id=obj.owner_id
     )
 
 
 @router.put("/objectives/{objective_id}", response_model=ObjectiveRead)
-def update_objective(
+async def update_objective(
     objective_id: int,
     obj_in: ValidatedObjectiveCreate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    obj = session.get(Objective, objective_id)
+    obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -160,21 +536,28 @@ def update_objective(
         )
     obj.title = obj_in.title
     obj.period_name = obj_in.period_name
+    obj.sqlmodel_update(period_columns(obj_in.period_name))
     session.add(obj)
-    session.commit()
-    session.refresh(obj)
+    try:
+        await bump_data_version(session, current_user.id)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise duplicate_objective()
+    audit_log.record("objective.update", current_user.id, "objective", objective_id)
+    await session.refresh(obj)
     return ObjectiveRead(
         id=obj.id, title=obj.title, period_name=obj.period_name, owner_id=obj.owner_id
     )
 
 
 @router.delete("/objectives/{objective_id}")
-def delete_objective(
+async def delete_objective(
     objective_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    obj = session.get(Objective, objective_id)
+    obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -183,20 +566,26 @@ def delete_objective(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/objectives/{objective_id}",
         )
-    session.delete(obj)
-    session.commit()
+    await history.forget(
+        session, select(KeyResult.id).where(KeyResult.objective_id == objective_id)
+    )
+    await session.exec(delete(KeyResult).where(KeyResult.objective_id == objective_id))
+    await session.delete(obj)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+    audit_log.record("objective.delete", current_user.id, "objective", objective_id)
     return {"ok": True}
 
 
 # KeyResult CRUD
 @router.post("/objectives/{objective_id}/key-results", response_model=KeyResultRead)
-def create_key_result(
+async def create_key_result(
     objective_id: int,
     kr_in: ValidatedKeyResultCreate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    obj = session.get(Objective, objective_id)
+    obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -213,8 +602,13 @@ def create_key_result(
         objective_id=objective_id,
     )
     session.add(kr)
-    session.commit()
-    session.refresh(kr)
+    await session.flush()
+    await history.record(session, [(kr.id, kr.progress)])
+    await rollups.key_result_added(session, objective_id, kr.progress, kr.target)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+    await session.refresh(kr)
+    audit_log.record("key_result.create", current_user.id, "key_result", kr.id)
     return KeyResultRead(
         id=kr.id,
         title=kr.title,
@@ -226,12 +620,17 @@ def create_key_result(
 
 
 @router.get("/objectives/{objective_id}/key-results", response_model=List[KeyResultRead])
-def list_key_results(
+async def list_key_results(
     objective_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
 ):
-    obj = session.get(Objective, objective_id)
+    obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -240,7 +639,23 @@ def list_key_results(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/objectives/{objective_id}/key-results",
         )
-    results = session.exec(select(KeyResult).where(KeyResult.objective_id == objective_id)).all()
+    fast = fastjson.FAST_JSON_RESPONSES
+    statement = (
+        select(*KEY_RESULT_ROWS.columns if fast else (KeyResult,))
+        .where(KeyResult.objective_id == objective_id)
+        .order_by(KeyResult.id)
+    )
+    # Without limit/cursor the whole list is returned, as before pagination existed
+    if limit is not None or cursor is not None:
+        limit = limit or DEFAULT_PAGE_SIZE
+        statement = statement.limit(limit)
+        if cursor is not None:
+            statement = statement.where(KeyResult.id > parse_cursor(cursor))
+    results = (await session.exec(statement)).all()
+    if limit is not None:
+        set_next_page(request, response, results, limit)
+    if fast:
+        return FastJSONResponse(KEY_RESULT_ROWS.dicts(results), headers=response.headers)
     return [
         KeyResultRead(
             id=r.id,
@@ -254,14 +669,161 @@ def list_key_results(
     ]
 
 
+@router.get("/objectives/{objective_id}/progress-history")
+async def objective_progress_history(
+    objective_id: int,
+    response: Response,
+    bucket: Literal["hour", "day", "week"] = "day",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
+):
+    """Progress of each key result, downsampled to the last value per UTC bucket."""
+    obj = await session.get(Objective, objective_id)
+    if not obj or obj.owner_id != current_user.id:
+        raise ProblemException(
+            status_code=404,
+            title="Not Found",
+            detail="Objective not found or access denied",
+            type=PROBLEM_TYPES["resource_not_found"],
+            instance=f"/objectives/{objective_id}/progress-history",
+        )
+    series = await history.trend(
+        session,
+        objective_id,
+        bucket,
+        since=None if since is None else history.epoch(since),
+        until=None if until is None else history.epoch(until),
+    )
+    return FastJSONResponse(series, headers=response.headers)
+
+
+@router.put(
+    "/key-results", response_model=List[KeyResultBatchResult], response_model_exclude_none=True
+)
+async def update_key_results(
+    items: List[Dict[str, Any]] = Body(...),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
+):
+    """Update many key results in one transaction; every item gets its own result.
+
+    Items are validated like a single PUT. Invalid, unknown, foreign and repeated
+    ids are reported per item and do not block the rest of the batch.
+    """
+    if len(items) > KEY_RESULT_BATCH_LIMIT:
+        raise ProblemException(
+            status_code=422,
+            title="Unprocessable Entity",
+            detail=f"At most {KEY_RESULT_BATCH_LIMIT} items per batch",
+            type=PROBLEM_TYPES["validation_error"],
+        )
+    results: List[Optional[KeyResultBatchResult]] = [None] * len(items)
+    valid: Dict[int, tuple] = {}
+    for index, raw in enumerate(items):
+        try:
+            item = ValidatedKeyResultUpdate.model_validate(raw)
+        except ValidationError as exc:
+            kr_id = raw.get("kr_id")
+            results[index] = KeyResultBatchResult(
+                index=index,
+                kr_id=kr_id if isinstance(kr_id, int) else None,
+                status=422,
+                detail="Validation failed",
+                errors=validation_error_map(exc.errors()),
+            )
+            continue
+        if item.kr_id in valid:
+            results[index] = KeyResultBatchResult(
+                index=index, kr_id=item.kr_id, status=400, detail="Duplicate kr_id in batch"
+            )
+            continue
+        valid[item.kr_id] = (index, item)
+
+    # One ownership query covers the whole batch
+    owned = {}
+    if valid:
+        # Locked in id order until commit, so the deltas below are computed from
+        # values no concurrent write can change, and two batches cannot deadlock
+        rows = await select_for_update(
+            session,
+            select(KeyResult.id, KeyResult.objective_id, KeyResult.progress, KeyResult.target)
+            .join(Objective, Objective.id == KeyResult.objective_id)
+            .where(KeyResult.id.in_(valid), Objective.owner_id == current_user.id)
+            .order_by(KeyResult.id),
+            KeyResult,
+        )
+        owned = {kr_id: (obj_id, progress, target) for kr_id, obj_id, progress, target in rows}
+
+    updates = []
+    ratio_deltas: Dict[int, float] = {}
+    for kr_id, (index, item) in valid.items():
+        if kr_id not in owned:
+            results[index] = KeyResultBatchResult(
+                index=index, kr_id=kr_id, status=404, detail="KeyResult not found or access denied"
+            )
+            continue
+        objective_id, old_progress, old_target = owned[kr_id]
+        updates.append(
+            {
+                "id": kr_id,
+                "title": item.title,
+                "metric": item.metric,
+                "target": item.target,
+                "progress": item.progress,
+            }
+        )
+        ratio_deltas[objective_id] = (
+            ratio_deltas.get(objective_id, 0.0)
+            + rollups.clamp_ratio(item.progress, item.target)
+            - rollups.clamp_ratio(old_progress, old_target)
+        )
+        results[index] = KeyResultBatchResult(
+            index=index,
+            kr_id=kr_id,
+            status=200,
+            key_result=KeyResultRead(
+                id=kr_id,
+                title=item.title,
+                metric=item.metric,
+                target=item.target,
+                progress=item.progress,
+                objective_id=objective_id,
+            ),
+        )
+
+    if updates:
+        # ORM bulk UPDATE by primary key: a single executemany statement
+        await session.exec(update(KeyResult), params=updates)
+        await history.record(
+            session,
+            [(u["id"], u["progress"]) for u in updates if u["progress"] != owned[u["id"]][1]],
+        )
+        await rollups.key_results_changed(session, ratio_deltas)
+        await bump_data_version(session, current_user.id)
+        await session.commit()
+        audit_log.record(
+            "key_result.batch_update",
+            current_user.id,
+            "key_result",
+            key_result_ids=[u["id"] for u in updates],
+        )
+    return results
+
+
 @router.put("/key-results/{kr_id}", response_model=KeyResultRead)
-def update_key_result(
+async def update_key_result(
     kr_id: int,
     kr_in: ValidatedKeyResultCreate,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    kr = session.get(KeyResult, kr_id)
+    locked = await select_for_update(
+        session, select(KeyResult).where(KeyResult.id == kr_id), KeyResult
+    )
+    kr = locked.first()
     if not kr:
         raise ProblemException(
             status_code=404,
@@ -270,7 +832,7 @@ def update_key_result(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/key-results/{kr_id}",
         )
-    obj = session.get(Objective, kr.objective_id)
+    obj = await session.get(Objective, kr.objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -279,13 +841,20 @@ def update_key_result(
             type=PROBLEM_TYPES["access_denied"],
             instance=f"/key-results/{kr_id}",
         )
+    await rollups.key_result_changed(
+        session, kr.objective_id, (kr.progress, kr.target), (kr_in.progress, kr_in.target)
+    )
+    if kr_in.progress != kr.progress:
+        await history.record(session, [(kr.id, kr_in.progress)])
     kr.title = kr_in.title
     kr.metric = kr_in.metric
     kr.target = kr_in.target
     kr.progress = kr_in.progress
     session.add(kr)
-    session.commit()
-    session.refresh(kr)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+    audit_log.record("key_result.update", current_user.id, "key_result", kr.id)
+    await session.refresh(kr)
     return KeyResultRead(
         id=kr.id,
         title=kr.title,
@@ -297,12 +866,15 @@ def update_key_result(
 
 
 @router.delete("/key-results/{kr_id}")
-def delete_key_result(
+async def delete_key_result(
     kr_id: int,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_session),
 ):
-    kr = session.get(KeyResult, kr_id)
+    locked = await select_for_update(
+        session, select(KeyResult).where(KeyResult.id == kr_id), KeyResult
+    )
+    kr = locked.first()
     if not kr:
         raise ProblemException(
             status_code=404,
@@ -311,8 +883,8 @@ def delete_key_result(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/key-results/{kr_id}",
         )
-    obj = session.get(Objective, kr.objective_id)
-    if not obj or obj.owner_id == current_user.id:
+    obj = await session.get(Objective, kr.objective_id)
+    if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
             title="Not Found",
@@ -320,55 +892,106 @@ def delete_key_result(
             type=PROBLEM_TYPES["access_denied"],
             instance=f"/key-results/{kr_id}",
         )
-    session.delete(kr)
-    session.commit()
+    await rollups.key_result_removed(session, kr.objective_id, kr.progress, kr.target)
+    await history.forget(session, [kr.id])
+    await session.delete(kr)
+    await bump_data_version(session, current_user.id)
+    await session.commit()
+    audit_log.record("key_result.delete", current_user.id, "key_result", kr_id)
     return {"ok": True}
 
 
 # Stats endpoint
 @router.get("/stats")
-def get_stats(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+async def get_stats(
+    request: Request,
+    response: Response,
+    period: Optional[str] = None,
+    year: Optional[int] = None,
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
 ):
-    objs = session.exec(select(Objective).where(Objective.owner_id == current_user.id)).all()
-    resp = {"objectives": []}
-    total_weighted = 0.0
-    total_targets = 0.0
-    for o in objs:
-        krs = session.exec(select(KeyResult).where(KeyResult.objective_id == o.id)).all()
-        if not krs:
-            obj_progress = None
-        else:
-            ratios = []
-            for k in krs:
-                ratio = k.progress / k.target if k.target > 0 else 0.0
-                ratios.append(min(max(ratio, 0.0), 1.0))
-            obj_progress = sum(ratios) / len(ratios)
-            total_weighted += obj_progress * len(ratios)
-            total_targets += len(ratios)
-        resp["objectives"].append(
-            {
-                "id": o.id,
-                "title": o.title,
-                "period_name": o.period_name,
-                "progress": obj_progress,
-            }
+    scope = None
+    if period is not None:
+        scope = parse_period(period)
+        if scope is None:
+            raise ProblemException(
+                status_code=422,
+                title="Unprocessable Entity",
+                detail="period must be 'Q1 2025', ..., 'Q4 2025', or 'FY 2025'",
+                type=PROBLEM_TYPES["validation_error"],
+            )
+    if scope is not None or year is not None:
+        # Served from the period index; only the unfiltered stats are cached
+        stats = await compute_stats(session, current_user.id, year=year, period=scope)
+        return FastJSONResponse(stats, headers=response.headers)
+    key = stats_key(current_user.id, request.state.data_version)
+    cached = await response_cache.get(key)
+    if cached is None:
+        stats = await compute_stats(session, current_user.id)
+        cached = await response_cache.put(
+            key, fastjson.encoder.encode(stats).encode("utf-8"), "application/json"
         )
-    overall = total_weighted / total_targets if total_targets > 0 else None
-    resp["overall_progress"] = overall
-    return resp
+    return Response(cached.body, media_type=cached.media_type, headers=response.headers)
+
+
+# Audit trail
+def utc_naive(moment: datetime) -> datetime:
+    # Events are stored as naive UTC
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/audit", response_model=List[AuditEventRead])
+async def list_audit_events(
+    request: Request,
+    response: Response,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=AUDIT_PAGE_LIMIT),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
+):
+    """The caller's own audit events, oldest first; events land within seconds."""
+    statement = (
+        select(AuditEvent)
+        .where(AuditEvent.user_id == current_user.id)
+        .order_by(AuditEvent.id)
+        .limit(limit)
+    )
+    if action is not None:
+        statement = statement.where(AuditEvent.action == action)
+    if since is not None:
+        statement = statement.where(AuditEvent.created_at >= utc_naive(since))
+    if until is not None:
+        statement = statement.where(AuditEvent.created_at < utc_naive(until))
+    if cursor is not None:
+        statement = statement.where(AuditEvent.id > parse_cursor(cursor))
+    events = (await session.exec(statement)).all()
+    set_next_page(request, response, events, limit)
+    return events
 
 
 # Reports
 @router.get("/reports/objective/{objective_id}")
-def objective_report(
+async def objective_report(
     objective_id: int,
-    format: str = Query("csv", enum=["csv", "json"]),
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    request: Request,
+    format: str = Query("csv", enum=["csv", "json", "ndjson"]),
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+    session: DBSession = Depends(get_read_session),
 ):
-    obj = session.get(Objective, objective_id)
+    # Keys are per owner, so a hit implies the ownership check already passed
+    key = report_key(current_user.id, request.state.data_version, objective_id, format)
+    cached = await response_cache.get(key)
+    if cached is not None:
+        return Response(cached.body, media_type=cached.media_type, headers={"ETag": etag})
+    obj = await session.get(Objective, objective_id)
     if not obj or obj.owner_id != current_user.id:
         raise ProblemException(
             status_code=404,
@@ -377,7 +1000,31 @@ def objective_report(
             type=PROBLEM_TYPES["resource_not_found"],
             instance=f"/reports/objective/{objective_id}",
         )
-    krs = session.exec(select(KeyResult).where(KeyResult.objective_id == objective_id)).all()
+    if format != "json":
+        statement = (
+            select(
+                KeyResult.id,
+                KeyResult.title,
+                KeyResult.metric,
+                KeyResult.target,
+                KeyResult.progress,
+            )
+            .where(KeyResult.objective_id == objective_id)
+            .order_by(KeyResult.id)
+        )
+        media_type = REPORT_MEDIA_TYPES[format]
+        return StreamingResponse(
+            response_cache.tee(
+                key, report_chunks(format, statement, OBJECTIVE_REPORT_FIELDS), media_type
+            ),
+            media_type=media_type,
+            headers={"ETag": etag},
+        )
+    krs = (
+        await session.exec(
+            select(KeyResult).where(KeyResult.objective_id == objective_id).order_by(KeyResult.id)
+        )
+    ).all()
     rows = [
         {
             "id": k.id,
@@ -388,24 +1035,63 @@ def objective_report(
         }
         for k in krs
     ]
-    if format == "json":
-        return {
-            "objective": {
-                "id": obj.id,
-                "title": obj.title,
-                "period_name": obj.period_name,
-            },
-            "key_results": rows,
-        }
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=["id", "title", "metric", "target", "progress"])
-    writer.writeheader()
-    for r in rows:
-        writer.writerow(r)
-    return Response(content=output.getvalue(), media_type="text/csv")
+    report = {
+        "objective": {
+            "id": obj.id,
+            "title": obj.title,
+            "period_name": obj.period_name,
+        },
+        "key_results": rows,
+    }
+    cached = await response_cache.put(
+        key, fastjson.encoder.encode(report).encode("utf-8"), "application/json"
+    )
+    return Response(cached.body, media_type=cached.media_type, headers={"ETag": etag})
+
+
+@router.get("/reports/all")
+async def all_objectives_report(
+    format: str = Query("csv", enum=["csv", "ndjson"]),
+    etag: str = Depends(conditional_get),
+    current_user: Principal = Depends(get_current_user),
+):
+    statement = (
+        select(
+            Objective.id,
+            Objective.title,
+            Objective.period_name,
+            KeyResult.id,
+            KeyResult.title,
+            KeyResult.metric,
+            KeyResult.target,
+            KeyResult.progress,
+        )
+        .select_from(Objective)
+        .outerjoin(KeyResult, KeyResult.objective_id == Objective.id)
+        .where(Objective.owner_id == current_user.id)
+        .order_by(Objective.id, KeyResult.id)
+    )
+    return StreamingResponse(
+        report_chunks(format, statement, ALL_OBJECTIVES_FIELDS),
+        media_type=REPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="okr-report.{format}"',
+            "ETag": etag,
+        },
+    )
 
 
 # Health check
 @router.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+@router.get("/health/cache")
+async def cache_health():
+    return {"response_cache": response_cache.snapshot()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
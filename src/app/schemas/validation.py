@@ -1,23 +1,85 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import re
-from typing import Annotated
+from typing import Annotated, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+from src.app.periods import period_calendar
+
+# Validators run for every field of every write request, so logging here is
+# off by default and never formats a message unless its level is enabled.
+VALIDATION_LOG_LEVEL = os.getenv("VALIDATION_LOG_LEVEL", "WARNING").upper()
+# Fraction of debug messages actually emitted once DEBUG is enabled
+VALIDATION_LOG_SAMPLE_RATE = float(os.getenv("VALIDATION_LOG_SAMPLE_RATE", "1.0"))
+# Hand records to a background thread instead of writing to stderr inline
+VALIDATION_LOG_QUEUE = os.getenv("VALIDATION_LOG_QUEUE", "false").lower() in ("1", "true", "yes")
+
+WHITESPACE_RE = re.compile(r"\s+")
+
 logger = logging.getLogger("validation")
-if not logger.handlers:
+log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock `prepare` renders the message in the caller so records can be
+    pickled; an in-process queue does not need that.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: str = VALIDATION_LOG_LEVEL, use_queue: bool = VALIDATION_LOG_QUEUE):
+    """Attach the stderr handler, behind a QueueHandler/QueueListener pair if `use_queue`."""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
     handler = logging.StreamHandler()
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    if use_queue:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        log_listener = logging.handlers.QueueListener(records, handler)
+        log_listener.start()
+        handler = DeferredQueueHandler(records)
     logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(level)
+
+
+def shutdown_logging():
+    """Flush and stop the queue listener, if one is running."""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+
+configure_logging()
+atexit.register(shutdown_logging)
+
+
+def log_debug(msg: str, *args):
+    """Lazily formatted, sampled debug message."""
+    if logger.isEnabledFor(logging.DEBUG) and (
+        VALIDATION_LOG_SAMPLE_RATE >= 1.0 or random.random() < VALIDATION_LOG_SAMPLE_RATE
+    ):
+        logger.debug(msg, *args)
 
 
 def normalize_string(v: str) -> str:
     if v is None:
         return v
-    normalized = re.sub(r"\s+", " ", v.strip())
-    logger.info(f"Normalized string: '{v}' -> '{normalized}'")
+    normalized = WHITESPACE_RE.sub(" ", v.strip())
+    log_debug("Normalized string: %r -> %r", v, normalized)
     return normalized
 
 
@@ -34,12 +96,12 @@ class ValidatedObjectiveCreate(BaseModel):
         original = v
         v = normalize_string(v)
         if len(v) < 3:
-            logger.warning(f"Title validation failed (too short): '{original}' -> '{v}'")
+            logger.warning("Title validation failed (too short): %r -> %r", original, v)
             raise ValueError("must be at least 3 characters")
         if len(v) > 200:
-            logger.warning(f"Title validation failed (too long): '{original}' -> '{v}'")
+            logger.warning("Title validation failed (too long): %r -> %r", original, v)
             raise ValueError("must not exceed 200 characters")
-        logger.info(f"Title validated: '{v}'")
+        log_debug("Title validated: %r", v)
         return v
 
     @field_validator("period_name")
@@ -47,10 +109,10 @@ class ValidatedObjectiveCreate(BaseModel):
     def validate_period_name(cls, v: str) -> str:
         original = v
         v = normalize_string(v)
-        if not re.match(r"^(Q[1-4]|FY) \d{4}$", v):
-            logger.warning(f"Period name format invalid: '{original}' -> '{v}'")
+        if period_calendar.lookup(v) is None:
+            logger.warning("Period name format invalid: %r -> %r", original, v)
             raise ValueError("must be 'Q1 2025', 'Q2 2025', ..., 'Q4 2025', or 'FY 2025'")
-        logger.info(f"Period name validated: '{v}'")
+        log_debug("Period name validated: %r", v)
         return v
 
 
@@ -66,12 +128,12 @@ class ValidatedKeyResultCreate(BaseModel):
         original = v
         v = normalize_string(v)
         if len(v) < 3:
-            logger.warning(f"KR title too short: '{original}' -> '{v}'")
+            logger.warning("KR title too short: %r -> %r", original, v)
             raise ValueError("must be at least 3 characters")
         if len(v) > 200:
-            logger.warning(f"KR title too long: '{original}' -> '{v}'")
+            logger.warning("KR title too long: %r -> %r", original, v)
             raise ValueError("must not exceed 200 characters")
-        logger.info(f"KR title validated: '{v}'")
+        log_debug("KR title validated: %r", v)
         return v
 
     @field_validator("metric")
@@ -80,12 +142,12 @@ class ValidatedKeyResultCreate(BaseModel):
         original = v
         v = normalize_string(v)
         if len(v) < 1:
-            logger.warning(f"Metric empty: '{original}'")
+            logger.warning("Metric empty: %r", original)
             raise ValueError("must not be empty")
         if len(v) > 100:
-            logger.warning(f"Metric too long: '{original}' -> '{v}'")
+            logger.warning("Metric too long: %r -> %r", original, v)
             raise ValueError("must not exceed 100 characters")
-        logger.info(f"Metric validated: '{v}'")
+        log_debug("Metric validated: %r", v)
         return v
 
     @field_validator("progress")
@@ -93,7 +155,13 @@ class ValidatedKeyResultCreate(BaseModel):
     def validate_progress(cls, v: float, info) -> float:
         target = info.data.get("target")
         if target is not None and v > target:
-            logger.warning(f"Progress exceeds target: {v} > {target}")
+            logger.warning("Progress exceeds target: %s > %s", v, target)
             raise ValueError("must not exceed target")
-        logger.info(f"Progress validated: {v} (target: {target})")
+        log_debug("Progress validated: %s (target: %s)", v, target)
         return v
+
+
+class ValidatedKeyResultUpdate(ValidatedKeyResultCreate):
+    """One item of a batch key-result update: the full KR payload plus its id."""
+
+    kr_id: int
@@ -0,0 +1,152 @@
+# app/stats.py
+from typing import Any, Optional
+
+from sqlalchemy import case, func
+from sqlmodel import select
+
+from src.app.database import DBSession
+from src.app.models import KeyResult, Objective
+from src.app.periods import format_period
+
+PeriodKey = tuple[int, Optional[int]]
+
+# Clamped progress ratio of a single key result, computed by the database.
+# Mirrors `min(max(progress / target, 0), 1)` with `target <= 0` counted as 0.
+# Objectives without key results get NULL for every column of the outer join,
+# which falls through to the ELSE branch and is ignored by SUM().
+clamped_ratio = case(
+    (KeyResult.target <= 0, 0.0),
+    (KeyResult.progress >= KeyResult.target, 1.0),
+    (KeyResult.progress <= 0, 0.0),
+    else_=KeyResult.progress / KeyResult.target,
+)
+
+
+def aggregate_statement(owner_id: Optional[int] = None):
+    """KR count and summed clamped ratio per objective, recomputed from key results."""
+    statement = (
+        select(
+            Objective.id,
+            func.count(KeyResult.id),
+            func.coalesce(func.sum(clamped_ratio), 0.0),
+        )
+        .select_from(Objective)
+        .outerjoin(KeyResult, KeyResult.objective_id == Objective.id)
+        .group_by(Objective.id)
+        .order_by(Objective.id)
+    )
+    if owner_id is not None:
+        statement = statement.where(Objective.owner_id == owner_id)
+    return statement
+
+
+def scoped(statement, year: Optional[int] = None, period: Optional[PeriodKey] = None):
+    """Restrict an objective statement to a year and/or one exact period."""
+    if year is not None:
+        statement = statement.where(Objective.period_year == year)
+    if period is not None:
+        period_year, quarter = period
+        statement = statement.where(
+            Objective.period_year == period_year,
+            (
+                Objective.period_quarter.is_(None)
+                if quarter is None
+                else Objective.period_quarter == quarter
+            ),
+        )
+    return statement
+
+
+def stats_statement(owner_id: int):
+    return (
+        select(
+            Objective.id,
+            Objective.title,
+            Objective.period_name,
+            Objective.kr_count,
+            Objective.progress_sum,
+        )
+        .where(Objective.owner_id == owner_id)
+        .order_by(Objective.id)
+    )
+
+
+def period_statement(owner_id: int):
+    """Objective count, KR count and summed clamped ratio per (year, quarter)."""
+    return (
+        select(
+            Objective.period_year,
+            Objective.period_quarter,
+            func.count(Objective.id),
+            func.sum(Objective.kr_count),
+            func.sum(Objective.progress_sum),
+        )
+        .where(Objective.owner_id == owner_id, Objective.period_year.is_not(None))
+        .group_by(Objective.period_year, Objective.period_quarter)
+    )
+
+
+def period_aggregates(rows) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Per-period entries, quarters before FY, and their rollup per year."""
+    periods = []
+    years: dict[int, list] = {}
+    # NULL (FY) sorts differently per database, so order here
+    for year, quarter, objectives, kr_count, ratio_sum in sorted(
+        rows, key=lambda row: (row[0], row[1] or 5)
+    ):
+        periods.append(
+            {
+                "period": format_period(year, quarter),
+                "year": year,
+                "quarter": quarter,
+                "objectives": objectives,
+                "progress": ratio_sum / kr_count if kr_count else None,
+            }
+        )
+        totals = years.setdefault(year, [0, 0, 0.0])
+        totals[0] += objectives
+        totals[1] += kr_count
+        totals[2] += ratio_sum
+    return periods, [
+        {
+            "year": year,
+            "objectives": objectives,
+            "progress": ratio_sum / kr_count if kr_count else None,
+        }
+        for year, (objectives, kr_count, ratio_sum) in years.items()
+    ]
+
+
+async def compute_stats(
+    session: DBSession,
+    owner_id: int,
+    year: Optional[int] = None,
+    period: Optional[PeriodKey] = None,
+) -> dict[str, Any]:
+    """Per-objective, per-period and overall progress of a user, read from the objective rollups.
+
+    `year` and `period` (`(year, quarter)`, quarter None for FY) narrow every
+    part of the result through the (owner_id, period_year, period_quarter) index.
+    """
+    resp: dict[str, Any] = {"objectives": []}
+    total_ratio = 0.0
+    total_krs = 0
+    rows = (await session.exec(scoped(stats_statement(owner_id), year, period))).all()
+    for obj_id, title, period_name, kr_count, ratio_sum in rows:
+        obj_progress: Optional[float] = None
+        if kr_count:
+            obj_progress = ratio_sum / kr_count
+            total_ratio += ratio_sum
+            total_krs += kr_count
+        resp["objectives"].append(
+            {
+                "id": obj_id,
+                "title": title,
+                "period_name": period_name,
+                "progress": obj_progress,
+            }
+        )
+    resp["overall_progress"] = total_ratio / total_krs if total_krs > 0 else None
+    period_rows = (await session.exec(scoped(period_statement(owner_id), year, period))).all()
+    resp["periods"], resp["years"] = period_aggregates(period_rows)
+    return resp
@@ -1,13 +1,16 @@
+import json
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
+from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from sqlmodel import SQLModel
 
-from src.app.database import engine
+from src.app.database import capture_queries, engine
 from src.app.main import app
 
 
@@ -22,3 +25,43 @@ def create_test_database():
 async def client():
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
+
+
+@pytest.fixture
+def max_queries():
+    """`with max_queries(n): client.get(...)` fails if the block runs more than n statements."""
+
+    @contextmanager
+    def check(limit: int):
+        with capture_queries() as profile:
+            yield profile
+        assert (
+            profile.count <= limit
+        ), f"{profile.count} SQL statements, expected at most {limit}: " + json.dumps(
+            profile.shapes, indent=2
+        )
+
+    return check
+
+
+@pytest.fixture
+def signup():
+    """`signup(username)` creates a user and returns the token response."""
+    test_client = TestClient(app)
+
+    def create(username: str, password: str = "pass") -> dict:
+        response = test_client.post("/signup", json={"username": username, "password": password})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return create
+
+
+@pytest.fixture
+def auth_headers(signup):
+    """`auth_headers(username)` creates a user and returns their bearer headers."""
+
+    def headers(username: str, password: str = "pass") -> dict:
+        return {"Authorization": f"Bearer {signup(username, password)['access_token']}"}
+
+    return headers
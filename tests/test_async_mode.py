@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import database
+from src.app.database import DATABASE_URL, build_async_engine, to_async_url
+from src.app.main import app
+
+
+@pytest.fixture
+def async_client(monkeypatch):
+    """The app as started with DB_MODE=async: every session is an AsyncSession on aiosqlite."""
+    monkeypatch.setattr(database, "async_engine", build_async_engine(to_async_url(DATABASE_URL)))
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgresql://u:p@db:5432/okr", "postgresql+asyncpg://u:p@db:5432/okr"),
+        ("postgresql+psycopg2://u:p@db/okr", "postgresql+asyncpg://u:p@db/okr"),
+        ("sqlite:///./okr.db", "sqlite+aiosqlite:///./okr.db"),
+        ("postgresql+asyncpg://db/okr", "postgresql+asyncpg://db/okr"),
+    ],
+)
+def test_to_async_url(url, expected):
+    assert to_async_url(url) == expected
+
+
+def test_crud_and_stats_on_async_session(async_client, auth_headers):
+    headers = auth_headers("async_user")
+
+    obj = async_client.post(
+        "/objectives", json={"title": "Go async", "period_name": "Q2 2025"}, headers=headers
+    ).json()
+    kr = async_client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Routes ported", "metric": "count", "target": 10, "progress": 2},
+        headers=headers,
+    ).json()
+    updated = async_client.put(
+        f"/key-results/{kr['id']}",
+        json={"title": "Routes ported", "metric": "count", "target": 10, "progress": 5},
+        headers=headers,
+    )
+    assert updated.status_code == 200
+
+    stats = async_client.get("/stats", headers=headers).json()
+    assert stats["overall_progress"] == 0.5
+    report = async_client.get(
+        f"/reports/objective/{obj['id']}", params={"format": "json"}, headers=headers
+    ).json()
+    assert report["key_results"][0]["progress"] == 5
+    export = async_client.get("/reports/all", params={"format": "ndjson"}, headers=headers)
+    assert '"kr_title": "Routes ported"' in export.text
+    batch = async_client.put(
+        "/key-results",
+        json=[
+            {
+                "kr_id": kr["id"],
+                "title": "Routes ported",
+                "metric": "count",
+                "target": 10,
+                "progress": 10,
+            }
+        ],
+        headers=headers,
+    ).json()
+    assert batch[0]["status"] == 200
+    assert async_client.get("/stats", headers=headers).json()["overall_progress"] == 1.0
+
+    imported = async_client.post(
+        "/objectives/import",
+        json=[{"title": "Imported", "period_name": "Q3 2025", "key_results": []}],
+        headers=headers,
+    )
+    assert '"status": 201' in imported.text
+    imported_id = json.loads(imported.text)["id"]
+    assert async_client.delete(f"/objectives/{imported_id}", headers=headers).status_code == 200
+
+    assert async_client.delete(f"/key-results/{kr['id']}", headers=headers).status_code == 200
+    assert async_client.delete(f"/objectives/{obj['id']}", headers=headers).status_code == 200
+    assert async_client.get("/objectives", headers=headers).json() == []
+
+    login = async_client.post("/token", data={"username": "async_user", "password": "pass"})
+    assert login.status_code == 200
+
+
+def test_sessions_are_async_in_async_mode(async_client):
+    async def kinds():
+        async with database.open_session() as rw, database.open_session(read_only=True) as ro:
+            return type(rw).__name__, ro.sync_session.autoflush, rw.sync_session.autoflush
+
+    assert async_client.portal.call(kinds) == ("AsyncSession", False, True)
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src.app.audit import AuditPipeline, audit_log
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def audit(headers: dict, **params) -> list[dict]:
+    assert audit_log.flush()
+    response = client.get("/audit", headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_writes_and_auth_events_are_audited(auth_headers):
+    headers = auth_headers("audit_trail")
+    obj = client.post(
+        "/objectives", json={"title": "Audited", "period_name": "Q1 2030"}, headers=headers
+    ).json()
+    kr = client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Deploys", "metric": "count", "target": 10, "progress": 1},
+        headers=headers,
+    ).json()
+    client.put(
+        f"/key-results/{kr['id']}",
+        json={"title": "Deploys", "metric": "count", "target": 10, "progress": 5},
+        headers=headers,
+    )
+    client.delete(f"/key-results/{kr['id']}", headers=headers)
+    client.post("/token", data={"username": "audit_trail", "password": "pass"})
+
+    events = audit(headers)
+    assert [e["action"] for e in events] == [
+        "auth.signup",
+        "objective.create",
+        "key_result.create",
+        "key_result.update",
+        "key_result.delete",
+        "auth.login",
+    ]
+    assert events[1]["resource_type"] == "objective"
+    assert events[1]["resource_id"] == obj["id"]
+    assert [e["id"] for e in events] == sorted(e["id"] for e in events)
+
+    assert [e["action"] for e in audit(headers, action="key_result.update")] == [
+        "key_result.update"
+    ]
+    assert audit(headers, since="2999-01-01T00:00:00Z") == []
+
+
+def test_users_only_see_their_own_events(auth_headers):
+    mine = auth_headers("audit_mine")
+    auth_headers("audit_theirs")
+    assert {e["action"] for e in audit(mine)} == {"auth.signup"}
+    assert client.get("/audit").status_code == 401
+
+
+def test_audit_pages_by_cursor(auth_headers):
+    headers = auth_headers("audit_pages")
+    for i in range(5):
+        client.post(
+            "/objectives",
+            json={"title": f"Page {i}", "period_name": f"Q{i % 4 + 1} {2030 + i // 4}"},
+            headers=headers,
+        )
+    assert audit_log.flush()
+
+    first = client.get("/audit", headers=headers, params={"limit": 4})
+    assert len(first.json()) == 4
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get("/audit", headers=headers, params={"limit": 4, "cursor": cursor}).json()
+    assert len(rest) == 2
+    assert rest[0]["id"] > first.json()[-1]["id"]
+
+
+def test_failed_logins_are_visible_to_the_account_owner(auth_headers):
+    headers = auth_headers("audit_target")
+    client.post("/token", data={"username": "audit_target", "password": "wrong"})
+    client.post("/token", data={"username": "audit_nobody", "password": "wrong"})
+
+    (failed,) = audit(headers, action="auth.login_failed")
+    assert failed["resource_type"] == "user"
+    assert failed["resource_id"] == failed["user_id"]
+
+
+def test_audit_page_size_is_capped(auth_headers):
+    headers = auth_headers("audit_cap")
+    assert client.get("/audit", headers=headers, params={"limit": 500}).status_code == 200
+    for limit in (0, 501):
+        response = client.get("/audit", headers=headers, params={"limit": limit})
+        assert response.status_code == 422
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking(monkeypatch):
+    pipeline = AuditPipeline(maxsize=2, batch_size=10, flush_seconds=0.01)
+    release = threading.Event()
+    monkeypatch.setattr(pipeline, "_write", lambda batch: release.wait(5))
+
+    started = time.perf_counter()
+    for _ in range(20):
+        pipeline.record("objective.create", 1)
+    assert time.perf_counter() - started < 0.5
+
+    stats = pipeline.snapshot()
+    assert stats["recorded"] + stats["dropped"] == 20
+    assert stats["dropped"] >= 17
+    release.set()
+    assert pipeline.flush()
+    pipeline.shutdown()
+
+
+def test_snapshot_is_exported_as_metrics():
+    assert "okr_audit_dropped" in client.get("/metrics").text
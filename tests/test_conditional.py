@@ -0,0 +1,148 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from src.app.conditional import etag_matches
+from src.app.main import app
+from src.app.migrations import run_migrations
+
+client = TestClient(app)
+
+
+def revalidate(url: str, headers: dict, etag: str, **params):
+    return client.get(url, params=params, headers={**headers, "If-None-Match": etag})
+
+
+def test_etag_matching_rules():
+    assert etag_matches('"1-2-ab"', '"1-2-ab"')
+    assert etag_matches('"x", W/"1-2-ab"', '"1-2-ab"')
+    assert not etag_matches("*", '"1-2-ab"')
+    assert not etag_matches('"1-3-ab"', '"1-2-ab"')
+
+
+def test_unchanged_reads_revalidate_to_304(auth_headers):
+    headers = auth_headers("etag_reader")
+    obj = client.post(
+        "/objectives", json={"title": "Poll me", "period_name": "Q1 2041"}, headers=headers
+    ).json()
+    client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Be polled", "metric": "polls", "target": 10, "progress": 1},
+        headers=headers,
+    )
+
+    for url, params in (
+        ("/objectives", {}),
+        (f"/objectives/{obj['id']}", {}),
+        (f"/objectives/{obj['id']}/key-results", {}),
+        ("/stats", {}),
+        (f"/reports/objective/{obj['id']}", {}),
+        (f"/reports/objective/{obj['id']}", {"format": "json"}),
+        ("/reports/all", {"format": "ndjson"}),
+    ):
+        first = client.get(url, params=params, headers=headers)
+        etag = first.headers["ETag"]
+        again = revalidate(url, headers, etag, **params)
+        assert again.status_code == 304, url
+        assert again.content == b""
+        assert again.headers["ETag"] == etag
+
+    # different URLs never share an ETag
+    etags = {client.get(u, headers=headers).headers["ETag"] for u in ("/objectives", "/stats")}
+    assert len(etags) == 2
+
+
+def test_wildcard_does_not_reveal_other_users_resources(auth_headers):
+    owner = auth_headers("etag_wildcard_owner")
+    prober = auth_headers("etag_wildcard_prober")
+    obj = client.post(
+        "/objectives", json={"title": "Private", "period_name": "Q3 2041"}, headers=owner
+    ).json()
+    for url in (f"/objectives/{obj['id']}", "/objectives/999999"):
+        assert revalidate(url, prober, "*").status_code == 404
+    assert revalidate(f"/objectives/{obj['id']}", owner, "*").status_code == 200
+
+
+def test_304_skips_the_handler_queries(auth_headers, max_queries):
+    headers = auth_headers("etag_quiet")
+    etag = client.get("/stats", headers=headers).headers["ETag"]
+
+    with max_queries(1) as profile:
+        assert revalidate("/stats", headers, etag).status_code == 304
+    (statement,) = profile.statements
+    assert "data_version" in statement
+
+
+def test_writes_change_the_etag_only_for_their_owner(auth_headers):
+    headers = auth_headers("etag_writer")
+    bystander = auth_headers("etag_bystander")
+    etag = client.get("/objectives", headers=headers).headers["ETag"]
+    bystander_etag = client.get("/objectives", headers=bystander).headers["ETag"]
+
+    obj = client.post(
+        "/objectives", json={"title": "New work", "period_name": "Q2 2041"}, headers=headers
+    ).json()
+    changed = revalidate("/objectives", headers, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert revalidate("/objectives", bystander, bystander_etag).status_code == 304
+
+    etag = changed.headers["ETag"]
+    kr = client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Step one", "metric": "steps", "target": 2, "progress": 0},
+        headers=headers,
+    ).json()
+    for write in (
+        lambda: client.put(
+            f"/key-results/{kr['id']}",
+            json={"title": "Step one", "metric": "steps", "target": 2, "progress": 1},
+            headers=headers,
+        ),
+        lambda: client.put(
+            "/key-results",
+            json=[
+                {
+                    "kr_id": kr["id"],
+                    "title": "Step one",
+                    "metric": "steps",
+                    "target": 2,
+                    "progress": 2,
+                }
+            ],
+            headers=headers,
+        ),
+        lambda: client.delete(f"/key-results/{kr['id']}", headers=headers),
+        lambda: client.delete(f"/objectives/{obj['id']}", headers=headers),
+    ):
+        assert write().status_code == 200
+        response = revalidate("/objectives", headers, etag)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+    # a rejected write leaves the version alone
+    client.post("/objectives", json={"title": "Dupe", "period_name": "Q3 2041"}, headers=headers)
+    etag = client.get("/objectives", headers=headers).headers["ETag"]
+    client.post(
+        "/objectives", json={"title": "Dupe again", "period_name": "Q3 2041"}, headers=headers
+    )
+    assert revalidate("/objectives", headers, etag).status_code == 304
+
+
+def test_migration_adds_data_version(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(
+            text(
+                'CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR, '
+                "hashed_password VARCHAR)"
+            )
+        )
+        conn.execute(text("INSERT INTO \"user\" VALUES (1, 'old', 'x')"))
+    SQLModel.metadata.create_all(legacy)
+
+    run_migrations(legacy)
+
+    assert "data_version" in {c["name"] for c in inspect(legacy).get_columns("user")}
+    with legacy.connect() as conn:
+        assert conn.execute(text('SELECT data_version FROM "user"')).scalar() == 0
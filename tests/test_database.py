@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.app import database, rollups
+from src.app.database import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    engine_options,
+    open_session,
+    pool_stats,
+    pool_status,
+)
+from src.app.main import app
+from src.app.models import Objective
+
+client = TestClient(app)
+
+
+def test_engine_options_follow_env_settings(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(database, "DB_POOL_RECYCLE", 600)
+    monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 1500)
+
+    sync = engine_options("postgresql://u:p@db/okr")
+    assert sync["poolclass"] is TimedQueuePool
+    assert (sync["pool_size"], sync["max_overflow"], sync["pool_recycle"]) == (20, 5, 600)
+    assert sync["pool_pre_ping"] is True
+    assert sync["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+    async_ = engine_options("postgresql+asyncpg://u:p@db/okr", is_async=True)
+    assert async_["poolclass"] is TimedAsyncQueuePool
+    assert async_["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+
+    assert engine_options("sqlite:///./x.db")["connect_args"] == {"check_same_thread": False}
+    assert "poolclass" not in engine_options("sqlite://")
+
+
+def test_pool_checkouts_are_counted(auth_headers):
+    before = pool_stats.snapshot()["checkouts"]
+    assert client.get("/period-templates").status_code == 200
+    client.get("/objectives", headers=auth_headers("pool_user"))
+
+    status = pool_status()
+    assert status["checkouts"] > before
+    assert status["size"] == database.DB_POOL_SIZE
+    assert status["checked_out"] == 0
+
+
+def test_pool_timeout_is_counted(tmp_path):
+    small = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    before = pool_stats.snapshot()["timeouts"]
+    with small.connect():
+        with pytest.raises(PoolTimeoutError):
+            small.connect()
+    assert pool_stats.snapshot()["timeouts"] == before + 1
+    assert pool_stats.snapshot()["max_wait_seconds"] >= 0.05
+
+
+def test_write_sessions_keep_objects_loaded_after_commit(auth_headers):
+    headers = auth_headers("commit_user")
+    obj = client.post(
+        "/objectives", json={"title": "Committed", "period_name": "Q1 2030"}, headers=headers
+    ).json()
+
+    async def scenario():
+        async with open_session() as session:
+            loaded = await session.get(Objective, obj["id"])
+            await rollups.key_result_added(session, obj["id"], 5, 10)
+            await session.commit()
+            # Not expired: readable without a lazy load, but blind to the bulk UPDATE
+            assert loaded.__dict__["kr_count"] == 0
+            await session.refresh(loaded)
+            assert (loaded.kr_count, loaded.progress_sum) == (1, 0.5)
+            await rollups.key_result_removed(session, obj["id"], 5, 10)
+            await session.commit()
+
+    asyncio.run(scenario())
+
+
+def test_write_responses_match_the_committed_rows(auth_headers):
+    headers = auth_headers("commit_reader")
+    obj = client.post(
+        "/objectives", json={"title": "Before", "period_name": "Q1 2030"}, headers=headers
+    ).json()
+    updated = client.put(
+        f"/objectives/{obj['id']}",
+        json={"title": "After", "period_name": "Q2 2030"},
+        headers=headers,
+    ).json()
+    assert updated == client.get(f"/objectives/{obj['id']}", headers=headers).json()
+
+    kr = client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Deploys", "metric": "count", "target": 10, "progress": 1},
+        headers=headers,
+    ).json()
+    kr = client.put(
+        f"/key-results/{kr['id']}",
+        json={"title": "Deploys", "metric": "count", "target": 10, "progress": 7},
+        headers=headers,
+    ).json()
+    expanded = client.get(
+        f"/objectives/{obj['id']}", headers=headers, params={"expand": "key_results"}
+    ).json()
+    assert expanded["key_results"] == [kr]
@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def seed(headers: dict, objectives: int, krs: int) -> list:
+    created = []
+    for i in range(objectives):
+        obj = client.post(
+            "/objectives",
+            json={"title": f"Objective {i}", "period_name": f"Q{i % 4 + 1} {2040 + i // 4}"},
+            headers=headers,
+        ).json()
+        obj["key_results"] = [
+            client.post(
+                f"/objectives/{obj['id']}/key-results",
+                json={"title": f"Result {j}", "metric": "count", "target": 10, "progress": j},
+                headers=headers,
+            ).json()
+            for j in range(krs)
+        ]
+        created.append(obj)
+    return created
+
+
+def test_get_objective_expands_key_results(auth_headers, max_queries):
+    headers = auth_headers("expand_one")
+    (obj,) = seed(headers, 1, 3)
+
+    plain = client.get(f"/objectives/{obj['id']}", headers=headers).json()
+    assert "key_results" not in plain
+
+    # data version (ETag) + objective + one IN query for its key results
+    with max_queries(3):
+        response = client.get(
+            f"/objectives/{obj['id']}", params={"expand": "key_results"}, headers=headers
+        )
+    assert response.status_code == 200
+    assert response.json() == obj
+    assert (
+        response.headers["etag"]
+        != client.get(f"/objectives/{obj['id']}", headers=headers).headers["etag"]
+    )
+
+
+def test_list_objectives_expands_a_page_in_two_queries(auth_headers, max_queries):
+    headers = auth_headers("expand_page")
+    created = seed(headers, 6, 2)
+
+    with max_queries(3):
+        response = client.get(
+            "/objectives", params={"expand": "key_results", "limit": 4}, headers=headers
+        )
+    assert response.json() == created[:4]
+    assert "X-Next-Cursor" in response.headers
+
+    empty_headers = auth_headers("expand_empty")
+    seed(empty_headers, 1, 0)
+    expanded = client.get("/objectives", params={"expand": "key_results"}, headers=empty_headers)
+    assert expanded.json()[0]["key_results"] == []
+
+
+def test_expand_is_owner_scoped_and_validated(auth_headers):
+    headers = auth_headers("expand_owner")
+    (obj,) = seed(headers, 1, 1)
+    other = auth_headers("expand_other")
+    url = f"/objectives/{obj['id']}"
+    assert client.get(url, params={"expand": "key_results"}, headers=other).status_code == 404
+    assert client.get(url, params={"expand": "owner"}, headers=headers).status_code == 422
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from src.app import fastjson
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def fetch_both(monkeypatch, url: str, headers: dict, **params):
+    responses = {}
+    for fast in (False, True):
+        monkeypatch.setattr(fastjson, "FAST_JSON_RESPONSES", fast)
+        responses[fast] = client.get(url, params=params, headers=headers)
+    return responses[False], responses[True]
+
+
+def test_fast_path_is_byte_compatible(auth_headers, monkeypatch):
+    headers = auth_headers("fast_json")
+    objs = [
+        client.post(
+            "/objectives",
+            json={"title": f"Цель №{i} — «быстро»", "period_name": f"Q{i + 1} 2040"},
+            headers=headers,
+        ).json()
+        for i in range(3)
+    ]
+    # floats that pydantic-core/orjson would render differently from json.dumps
+    for target, progress in ((1e16, 1e-05), (3, 0.1), (7, 7)):
+        client.post(
+            f"/objectives/{objs[0]['id']}/key-results",
+            json={"title": "Edge floats", "metric": "µs", "target": target, "progress": progress},
+            headers=headers,
+        )
+
+    for url, params in (
+        ("/objectives", {}),
+        ("/objectives", {"limit": 2}),
+        (f"/objectives/{objs[0]['id']}/key-results", {}),
+        (f"/objectives/{objs[0]['id']}/key-results", {"limit": 2}),
+        ("/stats", {}),
+    ):
+        slow, fast = fetch_both(monkeypatch, url, headers, **params)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content, url
+        assert fast.headers["content-type"] == slow.headers["content-type"]
+        assert fast.headers.get("Link") == slow.headers.get("Link")
+        assert fast.headers.get("X-Next-Cursor") == slow.headers.get("X-Next-Cursor")
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.hashing import HashPool, HashQueueFull, hash_pool
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def test_hash_and_verify_in_process_pool():
+    pool = HashPool(workers=1, queue_depth=1)
+
+    async def roundtrip():
+        hashed = await pool.hash("s3cret")
+        return hashed, await pool.verify("s3cret", hashed), await pool.verify("wrong", hashed)
+
+    try:
+        hashed, ok, bad = asyncio.run(roundtrip())
+    finally:
+        pool.shutdown()
+    assert hashed.startswith("$argon2")
+    assert (ok, bad) == (True, False)
+    stats = pool.stats.snapshot()
+    assert stats["completed"] == 3
+    assert stats["hash_seconds"] > 0
+    assert stats["queue_wait_seconds"] >= 0
+
+
+def test_saturated_pool_rejects_immediately():
+    pool = HashPool(workers=0, queue_depth=0)
+    release = threading.Event()
+
+    def slow_job():
+        release.wait(5)
+        now = time.monotonic()
+        return "done", now, now
+
+    async def scenario():
+        first = asyncio.ensure_future(pool._run(slow_job))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HashQueueFull):
+            await pool._run(slow_job)
+        release.set()
+        return await first
+
+    try:
+        assert asyncio.run(scenario()) == "done"
+    finally:
+        pool.shutdown()
+    assert pool.stats.rejected == 1
+    assert pool.pending == 0
+
+
+def test_signup_returns_429_problem_when_pool_is_full(monkeypatch):
+    monkeypatch.setattr(hash_pool, "max_pending", 0)
+
+    response = client.post("/signup", json={"username": "hash_busy", "password": "pass"})
+    assert response.status_code == 429
+    assert response.headers["content-type"] == "application/problem+json"
+    assert response.json()["type"] == "https://api.okr.example.com/probs/too-many-requests"
+
+
+def test_login_verifies_through_pool(signup):
+    signup("hash_login")
+
+    ok = client.post("/token", data={"username": "hash_login", "password": "pass"})
+    bad = client.post("/token", data={"username": "hash_login", "password": "nope"})
+    assert ok.status_code == 200
+    assert "access_token" in ok.json()
+    assert bad.status_code == 400
+
+
+def test_killed_worker_is_replaced_and_job_retried():
+    pool = HashPool(workers=1, queue_depth=1)
+
+    async def hash_twice():
+        first = await pool.hash("s3cret")
+        # What the OOM killer does to a worker in the middle of an Argon2 run
+        for process in list(pool._executor._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join(5)
+        return first, await pool.hash("s3cret")
+
+    try:
+        first, second = asyncio.run(hash_twice())
+    finally:
+        pool.shutdown()
+    assert first.startswith("$argon2") and second.startswith("$argon2")
+    assert pool.stats.snapshot()["restarts"] == 1
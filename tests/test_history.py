@@ -0,0 +1,108 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.app import history
+from src.app.database import engine
+from src.app.main import app
+from src.app.models import ProgressPoint
+
+client = TestClient(app)
+
+DAY = 86400
+DAY0 = 20000 * DAY
+
+
+def kr_payload(progress: float) -> dict:
+    return {"title": "Deploys", "metric": "count", "target": 10, "progress": progress}
+
+
+def test_updates_are_recorded_and_downsampled(auth_headers, monkeypatch, max_queries):
+    headers = auth_headers("history_user")
+    obj = client.post(
+        "/objectives", json={"title": "Ship it", "period_name": "Q2 2030"}, headers=headers
+    ).json()
+    url = f"/objectives/{obj['id']}/key-results"
+
+    def at(seconds: int):
+        monkeypatch.setattr(history, "clock", lambda: seconds)
+
+    at(DAY0 + 100)
+    kr = client.post(url, json=kr_payload(1), headers=headers).json()
+    at(DAY0 + 200)
+    client.put(f"/key-results/{kr['id']}", json=kr_payload(2), headers=headers)
+    at(DAY0 + DAY + 50)
+    client.put(f"/key-results/{kr['id']}", json=kr_payload(3), headers=headers)
+    at(DAY0 + DAY + 60)
+    client.put(f"/key-results/{kr['id']}", json=kr_payload(3), headers=headers)  # unchanged
+    at(DAY0 + DAY + 70)
+    other = client.post(url, json=kr_payload(5), headers=headers).json()
+
+    with Session(engine) as session:
+        stored = session.exec(
+            select(ProgressPoint.at, ProgressPoint.value)
+            .where(ProgressPoint.key_result_id == kr["id"])
+            .order_by(ProgressPoint.id)
+        ).all()
+    assert stored == [(DAY0 + 100, 1), (DAY0 + 200, 2), (DAY0 + DAY + 50, 3)]
+
+    trend_url = f"/objectives/{obj['id']}/progress-history"
+    with max_queries(4):
+        daily = client.get(trend_url, headers=headers)
+    assert daily.status_code == 200
+    assert daily.json() == {
+        "objective_id": obj["id"],
+        "bucket": "day",
+        "key_results": [
+            {"id": kr["id"], "points": [[DAY0, 2.0], [DAY0 + DAY, 3.0]]},
+            {"id": other["id"], "points": [[DAY0 + DAY, 5.0]]},
+        ],
+    }
+
+    since = client.get(
+        trend_url, params={"since": "2024-10-05T00:00:00Z", "bucket": "hour"}, headers=headers
+    ).json()
+    assert since["key_results"] == [
+        {"id": kr["id"], "points": [[DAY0 + DAY, 3.0]]},
+        {"id": other["id"], "points": [[DAY0 + DAY, 5.0]]},
+    ]
+
+
+def test_batch_updates_record_and_deletes_forget(auth_headers):
+    headers = auth_headers("history_batch")
+    obj = client.post(
+        "/objectives", json={"title": "Ship it", "period_name": "Q3 2030"}, headers=headers
+    ).json()
+    url = f"/objectives/{obj['id']}/key-results"
+    first = client.post(url, json=kr_payload(1), headers=headers).json()
+    second = client.post(url, json=kr_payload(1), headers=headers).json()
+    client.put(
+        "/key-results",
+        json=[{"kr_id": first["id"], **kr_payload(4)}, {"kr_id": second["id"], **kr_payload(1)}],
+        headers=headers,
+    )
+
+    def values(kr_id: int) -> list:
+        with Session(engine) as session:
+            return session.exec(
+                select(ProgressPoint.value)
+                .where(ProgressPoint.key_result_id == kr_id)
+                .order_by(ProgressPoint.id)
+            ).all()
+
+    assert values(first["id"]) == [1, 4]
+    assert values(second["id"]) == [1]
+
+    client.delete(f"/key-results/{first['id']}", headers=headers)
+    assert values(first["id"]) == []
+    client.delete(f"/objectives/{obj['id']}", headers=headers)
+    assert values(second["id"]) == []
+
+
+def test_history_is_private_and_buckets_are_validated(auth_headers):
+    owner = auth_headers("history_owner")
+    obj = client.post(
+        "/objectives", json={"title": "Ship it", "period_name": "Q4 2030"}, headers=owner
+    ).json()
+    trend_url = f"/objectives/{obj['id']}/progress-history"
+    assert client.get(trend_url, headers=auth_headers("history_other")).status_code == 404
+    assert client.get(trend_url, params={"bucket": "minute"}, headers=owner).status_code == 422
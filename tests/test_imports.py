@@ -0,0 +1,107 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src.app import imports
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def run_import(headers: dict, body, content_type: str) -> list:
+    if not isinstance(body, (str, bytes)):
+        body = json.dumps(body)
+    response = client.post(
+        "/objectives/import", content=body, headers={**headers, "Content-Type": content_type}
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_json_import_reports_per_item_results(auth_headers):
+    headers = auth_headers("import_json")
+    client.post(
+        "/objectives", json={"title": "Already here", "period_name": "Q1 2033"}, headers=headers
+    )
+    results = run_import(
+        headers,
+        [
+            {
+                "title": "Grow the team",
+                "period_name": "Q2 2033",
+                "key_results": [
+                    {"title": "Hire engineers", "metric": "people", "target": 4, "progress": 1},
+                    {"title": "Onboard them", "metric": "people", "target": 4, "progress": 4},
+                ],
+            },
+            {"title": "Clashes", "period_name": "Q1 2033"},
+            {"title": "Also Q2", "period_name": "Q2 2033"},
+            {
+                "title": "Broken KR",
+                "period_name": "Q3 2033",
+                "key_results": [{"title": "x", "metric": "m", "target": 1, "progress": 0}],
+            },
+            {"title": "No key results", "period_name": "FY 2033"},
+        ],
+        "application/json",
+    )
+    assert [r["status"] for r in results] == [201, 400, 400, 422, 201]
+    assert len(results[0]["key_result_ids"]) == 2
+    assert results[3]["errors"] == {
+        "key_results -> 0 -> title": ["Value error, must be at least 3 characters"]
+    }
+
+    krs = client.get(f"/objectives/{results[0]['id']}/key-results", headers=headers).json()
+    assert [kr["id"] for kr in krs] == results[0]["key_result_ids"]
+    stats = {
+        o["id"]: o["progress"] for o in client.get("/stats", headers=headers).json()["objectives"]
+    }
+    assert stats[results[0]["id"]] == 0.625
+    assert stats[results[4]["id"]] is None
+
+
+def test_csv_export_round_trips_through_import(auth_headers):
+    source = auth_headers("import_csv_source")
+    obj = client.post(
+        "/objectives", json={"title": "Ship it", "period_name": "Q4 2033"}, headers=source
+    ).json()
+    client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Release 1.0", "metric": "releases", "target": 1, "progress": 1},
+        headers=source,
+    )
+    client.post(
+        "/objectives", json={"title": "Empty one", "period_name": "FY 2034"}, headers=source
+    )
+    exported = client.get("/reports/all", headers=source).text
+
+    target = auth_headers("import_csv_target")
+    results = run_import(target, exported, "text/csv; charset=utf-8")
+    assert [r["status"] for r in results] == [201, 201]
+    rows = client.get("/reports/all", params={"format": "ndjson"}, headers=target).text
+    records = [json.loads(line) for line in rows.splitlines()]
+    assert [(r["objective_title"], r["kr_title"]) for r in records] == [
+        ("Ship it", "Release 1.0"),
+        ("Empty one", None),
+    ]
+
+
+def test_import_rejects_bad_payloads(auth_headers, monkeypatch):
+    headers = auth_headers("import_bad")
+    response = client.post(
+        "/objectives/import", content="a,b\n1,2\n", headers={**headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 422
+    assert "Missing CSV columns" in response.json()["detail"]
+
+    response = client.post(
+        "/objectives/import", content="<xml/>", headers={**headers, "Content-Type": "text/xml"}
+    )
+    assert response.status_code == 415
+
+    monkeypatch.setattr(imports, "IMPORT_MAX_OBJECTIVES", 2)
+    too_many = [{"title": f"Item {i}", "period_name": f"Q{i + 1} 2034"} for i in range(3)]
+    response = client.post("/objectives/import", json=too_many, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"] == "At most 2 objectives per import"
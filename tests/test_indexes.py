@@ -0,0 +1,122 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from src.app.database import engine
+from src.app.main import app
+from src.app.migrations import run_migrations
+
+client = TestClient(app)
+
+DUPLICATE = "https://api.okr.example.com/probs/duplicate-objective"
+
+
+def index_columns(bind, table: str) -> dict:
+    return {
+        ix["name"]: (ix["column_names"], bool(ix["unique"]))
+        for ix in inspect(bind).get_indexes(table)
+    }
+
+
+def test_hot_lookup_columns_are_indexed():
+    assert (["username"], True) in index_columns(engine, "user").values()
+    assert index_columns(engine, "objective")["ix_objective_owner_id_period_name"] == (
+        ["owner_id", "period_name"],
+        True,
+    )
+    assert (["objective_id"], False) in index_columns(engine, "keyresult").values()
+
+
+def test_duplicate_period_maps_to_problem_type(auth_headers):
+    headers = auth_headers("dup_user")
+    first = client.post(
+        "/objectives", json={"title": "First one", "period_name": "Q1 2026"}, headers=headers
+    )
+    assert first.status_code == 200
+
+    again = client.post(
+        "/objectives", json={"title": "Second one", "period_name": "Q1 2026"}, headers=headers
+    )
+    assert again.status_code == 400
+    assert again.json()["type"] == DUPLICATE
+
+    other = client.post(
+        "/objectives", json={"title": "Other one", "period_name": "Q2 2026"}, headers=headers
+    ).json()
+    moved = client.put(
+        f"/objectives/{other['id']}",
+        json={"title": "Other one", "period_name": "Q1 2026"},
+        headers=headers,
+    )
+    assert moved.status_code == 400
+    assert moved.json()["type"] == DUPLICATE
+    assert len(client.get("/objectives", headers=headers).json()) == 2
+
+
+def test_same_period_allowed_for_different_users(auth_headers):
+    for name in ("dup_owner_a", "dup_owner_b"):
+        response = client.post(
+            "/objectives",
+            json={"title": "Shared period", "period_name": "Q3 2026"},
+            headers=auth_headers(name),
+        )
+        assert response.status_code == 200
+
+
+def test_migration_creates_indexes_and_skips_violated_unique(tmp_path, capsys):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(
+            text(
+                'CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR, '
+                "hashed_password VARCHAR)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE objective (id INTEGER PRIMARY KEY, title VARCHAR, "
+                "period_name VARCHAR, owner_id INTEGER)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO objective VALUES (1, 'A', 'Q1 2025', 1), (2, 'B', 'Q1 2025', 1)")
+        )
+    SQLModel.metadata.create_all(legacy)
+
+    run_migrations(legacy)
+
+    assert (["username"], True) in index_columns(legacy, "user").values()
+    assert "ix_objective_owner_id_period_name" not in index_columns(legacy, "objective")
+    assert "ix_objective_owner_id_period_name" in capsys.readouterr().out
+
+
+def test_period_columns_are_indexed_and_backfilled(tmp_path):
+    assert index_columns(engine, "objective")["ix_objective_owner_id_period_year_quarter"] == (
+        ["owner_id", "period_year", "period_quarter"],
+        False,
+    )
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE objective (id INTEGER PRIMARY KEY, title VARCHAR, "
+                "period_name VARCHAR, owner_id INTEGER)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO objective VALUES "
+                "(1, 'A', 'Q2 2025', 1), (2, 'B', 'FY 2025', 1), (3, 'C', 'someday', 1)"
+            )
+        )
+    SQLModel.metadata.create_all(legacy)
+
+    run_migrations(legacy)
+
+    with legacy.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, period_year, period_quarter FROM objective ORDER BY id")
+        ).all()
+    assert rows == [(1, 2025, 2), (2, 2025, None), (3, None, None)]
+    assert "ix_objective_owner_id_period_year_quarter" in index_columns(legacy, "objective")
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.app import rollups
+from src.app.database import engine
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def make_key_results(headers: dict, period: str, count: int) -> list:
+    obj = client.post(
+        "/objectives", json={"title": "Batch objective", "period_name": period}, headers=headers
+    ).json()
+    return [
+        client.post(
+            f"/objectives/{obj['id']}/key-results",
+            json={"title": f"Batch KR {i}", "metric": "pts", "target": 10, "progress": 0},
+            headers=headers,
+        ).json()
+        for i in range(count)
+    ]
+
+
+def payload(kr: dict, progress: float, **overrides) -> dict:
+    item = {
+        "kr_id": kr["id"],
+        "title": kr["title"],
+        "metric": kr["metric"],
+        "target": kr["target"],
+        "progress": progress,
+    }
+    item.update(overrides)
+    return item
+
+
+def test_batch_update_applies_valid_items_and_reports_the_rest(auth_headers):
+    headers = auth_headers("batch_owner")
+    first, second, third = make_key_results(headers, "Q1 2032", 3)
+    (foreign,) = make_key_results(auth_headers("batch_stranger"), "Q1 2032", 1)
+
+    response = client.put(
+        "/key-results",
+        json=[
+            payload(first, 5),
+            payload(second, 20),  # progress above target
+            payload(foreign, 1),
+            payload(third, 10, title="  Renamed   KR  "),
+            payload(first, 7),
+            {"progress": 3},
+        ],
+        headers=headers,
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [200, 422, 404, 200, 400, 422]
+    assert [r["index"] for r in results] == list(range(6))
+    assert results[0]["key_result"]["progress"] == 5
+    assert results[1]["errors"] == {"progress": ["Value error, must not exceed target"]}
+    assert results[3]["key_result"]["title"] == "Renamed KR"
+    assert "kr_id" not in results[5]
+
+    listed = client.get(f"/objectives/{first['objective_id']}/key-results", headers=headers)
+    assert [kr["progress"] for kr in listed.json()] == [5, 0, 10]
+    stats = client.get("/stats", headers=headers).json()
+    assert stats["objectives"][0]["progress"] == 0.5
+
+
+def test_batch_update_rejects_oversized_batches(auth_headers):
+    headers = auth_headers("batch_oversized")
+    response = client.put("/key-results", json=[{}] * 501, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["type"] == "https://api.okr.example.com/probs/validation-error"
+
+
+def test_concurrent_batches_keep_rollups_exact(auth_headers):
+    headers = auth_headers("batch_racer")
+    krs = make_key_results(headers, "Q3 2032", 3) + make_key_results(headers, "Q4 2032", 3)
+
+    def batch(i):
+        # Overlapping batches, each listing the key results in a different order
+        ordered = krs[i % len(krs) :] + krs[: i % len(krs)]
+        items = [payload(kr, (i + n) % 10 + 1) for n, kr in enumerate(ordered)]
+        response = client.put("/key-results", json=items, headers=headers)
+        return response.status_code, frozenset(r["status"] for r in response.json())
+
+    with ThreadPoolExecutor(8) as pool:
+        results = set(pool.map(batch, range(32)))
+    assert results == {(200, frozenset({200}))}
+
+    obj = client.get(f"/objectives/{krs[0]['objective_id']}", headers=headers).json()
+    with Session(engine) as session:
+        assert rollups.find_drift(session, obj["owner_id"]) == []
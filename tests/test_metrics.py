@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+
+from src.app import metrics
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def test_requests_are_recorded_by_route_template(auth_headers):
+    headers = auth_headers("metrics_user")
+    obj = client.post(
+        "/objectives", json={"title": "Measure", "period_name": "Q3 2043"}, headers=headers
+    ).json()
+    route = "/objectives/{objective_id}"
+    before = metrics.http_requests.value("GET", route, "200")
+    queries_before = metrics.db_queries_per_request.count(route)
+
+    assert client.get(f"/objectives/{obj['id']}", headers=headers).status_code == 200
+    assert client.get("/objectives/999999", headers=headers).status_code == 404
+
+    assert metrics.http_requests.value("GET", route, "200") == before + 1
+    assert metrics.http_requests.value("GET", route, "404") >= 1
+    assert metrics.http_request_seconds.count("GET", route) >= 2
+    assert metrics.db_queries_per_request.count(route) == queries_before + 2
+    assert metrics.http_in_flight.value() == 0
+
+
+def test_unmatched_paths_share_one_label():
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+    assert metrics.http_requests.value("GET", "<unmatched>", "404") >= 2
+
+
+def test_metrics_endpoint_renders_prometheus_text(auth_headers):
+    auth_headers("metrics_scrape")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert "# TYPE okr_http_request_duration_seconds histogram" in body
+    assert (
+        'okr_http_request_duration_seconds_bucket{method="POST",route="/signup",le="0.2"}' in body
+    )
+    assert 'le="+Inf"' in body
+    assert 'okr_argon2_duration_seconds_count{operation="hash"}' in body
+    assert "okr_db_pool_checkouts " in body
+    assert "okr_hashing_completed " in body
+    assert "okr_response_cache_hits " in body
+    assert 'route="/metrics"' not in body
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("t_seconds", "test", ("op",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "x")
+    assert list(histogram.samples()) == [
+        't_seconds_bucket{op="x",le="0.1"} 1',
+        't_seconds_bucket{op="x",le="1.0"} 3',
+        't_seconds_bucket{op="x",le="+Inf"} 4',
+        't_seconds_sum{op="x"} 6.05',
+        't_seconds_count{op="x"} 4',
+    ]
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+client = TestClient(app)
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(42)) == 42
+    for bad in ("", "not-base64!", encode_cursor(1)[:-2] + "zz", "eyJpZCI6ICJ4In0"):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(bad)
+
+
+def test_objectives_keyset_pages(auth_headers):
+    headers = auth_headers("page_user")
+    created = [
+        client.post(
+            "/objectives",
+            json={"title": f"Objective {i}", "period_name": f"Q{i % 4 + 1} {2030 + i // 4}"},
+            headers=headers,
+        ).json()["id"]
+        for i in range(5)
+    ]
+
+    seen = []
+    response = client.get("/objectives", params={"limit": 2}, headers=headers)
+    while True:
+        assert response.status_code == 200
+        seen += [o["id"] for o in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        assert response.headers["Link"].endswith('; rel="next"')
+        response = client.get(
+            "/objectives",
+            params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+            headers=headers,
+        )
+    assert seen == created
+
+    # skip/limit still works
+    legacy = client.get("/objectives", params={"skip": 3, "limit": 2}, headers=headers).json()
+    assert [o["id"] for o in legacy] == created[3:]
+
+
+def test_key_results_paginate_only_when_asked(auth_headers):
+    headers = auth_headers("page_kr_user")
+    obj = client.post(
+        "/objectives", json={"title": "Many KRs", "period_name": "Q1 2031"}, headers=headers
+    ).json()
+    url = f"/objectives/{obj['id']}/key-results"
+    for i in range(3):
+        client.post(
+            url,
+            json={"title": f"KR number {i}", "metric": "count", "target": 10, "progress": i},
+            headers=headers,
+        )
+
+    everything = client.get(url, headers=headers)
+    assert len(everything.json()) == 3
+    assert "Link" not in everything.headers
+
+    first = client.get(url, params={"limit": 2}, headers=headers)
+    assert len(first.json()) == 2
+    second = client.get(url, params={"cursor": first.headers["X-Next-Cursor"]}, headers=headers)
+    assert [kr["title"] for kr in second.json()] == ["KR number 2"]
+
+
+def test_malformed_cursor_is_a_problem(auth_headers):
+    headers = auth_headers("page_bad_cursor")
+    response = client.get("/objectives", params={"cursor": "%%%"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["type"] == "https://api.okr.example.com/probs/invalid-cursor"
@@ -0,0 +1,82 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from src.app.main import app
+from src.app.periods import PeriodCalendar, period_range
+
+client = TestClient(app)
+
+
+class FakeToday:
+    def __init__(self, today: date):
+        self.today = today
+
+    def __call__(self) -> date:
+        return self.today
+
+
+def test_period_ranges_cover_whole_quarters():
+    assert period_range("Q1 2025") == (date(2025, 1, 1), date(2025, 3, 31))
+    assert period_range("Q2 2024") == (date(2024, 4, 1), date(2024, 6, 30))
+    assert period_range("Q3 2025") == (date(2025, 7, 1), date(2025, 9, 30))
+    assert period_range("Q4 2025") == (date(2025, 10, 1), date(2025, 12, 31))
+    assert period_range("FY 2025") == (date(2025, 1, 1), date(2025, 12, 31))
+    for name in ("Q5 2025", "FY 0000", "q1 2025", "Q1 2025 ", ""):
+        assert period_range(name) is None
+
+
+def test_lookup_is_served_from_the_index_and_falls_back_outside_it():
+    calendar = PeriodCalendar(clock=FakeToday(date(2030, 5, 1)), years=2)
+    assert calendar.lookup("Q2 2031") == (date(2031, 4, 1), date(2031, 6, 30))
+    assert "Q2 2031" in calendar.index and "Q2 2040" not in calendar.index
+    assert calendar.lookup("Q2 2040") == (date(2040, 4, 1), date(2040, 6, 30))
+    assert calendar.lookup("Q9 2030") is None
+
+
+def test_templates_are_rebuilt_when_the_year_rolls_over():
+    clock = FakeToday(date(2030, 12, 31))
+    calendar = PeriodCalendar(clock=clock)
+    body, etag = calendar.templates()
+    assert b'"Q1 2030"' in body and b'"Q4 2031"' in body
+    assert calendar.templates() == (body, etag)
+
+    clock.today = date(2031, 1, 1)
+    rolled, rolled_etag = calendar.templates()
+    assert b'"Q1 2030"' not in rolled and b'"Q4 2032"' in rolled
+    assert rolled_etag != etag
+    assert calendar.rebuilds == 2
+
+    clock.today = date(2031, 1, 2)
+    calendar.templates()
+    assert calendar.rebuilds == 2
+
+
+def test_period_templates_endpoint_is_cacheable():
+    response = client.get("/period-templates")
+    assert response.status_code == 200
+    year = date.today().year
+    assert response.json()[0] == {
+        "name": f"Q1 {year}",
+        "start_date": f"{year}-01-01",
+        "end_date": f"{year}-03-31",
+    }
+    assert len(response.json()) == 8
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    etag = response.headers["etag"]
+    cached = client.get("/period-templates", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_validation_uses_the_calendar(auth_headers):
+    headers = auth_headers("period_user")
+    ok = client.post(
+        "/objectives", json={"title": "Ship", "period_name": "FY 2031"}, headers=headers
+    )
+    assert ok.status_code == 200
+    bad = client.post(
+        "/objectives", json={"title": "Ship", "period_name": "Q5 2031"}, headers=headers
+    )
+    assert bad.status_code == 422
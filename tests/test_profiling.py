@@ -0,0 +1,101 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from src.app import database
+from src.app.database import QueryProfile, open_session, profile_queries, statement_shape
+from src.app.main import app
+from src.app.models import KeyResult
+
+client = TestClient(app)
+
+
+def seed(headers: dict, objectives: int = 3):
+    ids = []
+    for i in range(objectives):
+        obj = client.post(
+            "/objectives",
+            json={"title": f"Profiled goal {i}", "period_name": f"Q{i % 4 + 1} 20{50 + i}"},
+            headers=headers,
+        ).json()
+        client.post(
+            f"/objectives/{obj['id']}/key-results",
+            json={"title": "Profiled KR", "metric": "pts", "target": 10, "progress": 1},
+            headers=headers,
+        )
+        ids.append(obj["id"])
+    return headers, ids
+
+
+def test_statement_shape_folds_literals_and_in_lists():
+    assert statement_shape("SELECT a\n  FROM t WHERE id IN (?, ?, ?) LIMIT 10") == (
+        "SELECT a FROM t WHERE id IN (?) LIMIT ?"
+    )
+    assert statement_shape("SELECT * FROM t1 WHERE name = 'o''k'") == (
+        "SELECT * FROM t1 WHERE name = ?"
+    )
+
+
+def test_repeated_shapes_are_flagged():
+    profile = QueryProfile()
+    for objective_id in (1, 2, 3):
+        profile.record(f"SELECT * FROM key_result WHERE objective_id = {objective_id}", 0.001)
+    profile.record("SELECT * FROM objective", 0.001)
+    assert profile.count == 4
+    assert profile.repeated(3) == {"SELECT * FROM key_result WHERE objective_id = ?": 3}
+
+
+def test_profile_queries_sees_threadpool_statements():
+    async def n_plus_one():
+        async with open_session(read_only=True) as session:
+            for objective_id in (1, 2, 3):
+                await session.exec(select(KeyResult).where(KeyResult.objective_id == objective_id))
+
+    with profile_queries() as profile:
+        asyncio.run(n_plus_one())
+    assert profile.count == 3
+    assert list(profile.repeated(3).values()) == [3]
+
+
+def test_server_timing_header_and_log_summary(auth_headers, monkeypatch, caplog):
+    monkeypatch.setattr(database, "SQL_PROFILE", True)
+    headers, _ = seed(auth_headers("profile_header"), objectives=1)
+    with caplog.at_level(logging.INFO, logger="sql_profile"):
+        response = client.get("/objectives", headers=headers)
+    assert response.headers["server-timing"].startswith("db;dur=")
+    (record,) = [r for r in caplog.records if r.name == "sql_profile"]
+    summary = json.loads(record.getMessage())
+    assert summary["route"] == "/objectives"
+    assert summary["status"] == 200
+    assert summary["queries"] >= 1
+    assert summary["repeated"] == {}
+
+
+def test_profiling_is_off_by_default(auth_headers):
+    headers, _ = seed(auth_headers("profile_off"), objectives=1)
+    assert "server-timing" not in client.get("/objectives", headers=headers).headers
+
+
+@pytest.mark.parametrize(
+    "path, limit",
+    [
+        ("/objectives", 3),
+        ("/stats", 3),
+        ("/reports/all", 3),
+    ],
+)
+def test_read_endpoints_do_not_scale_with_objectives(auth_headers, max_queries, path, limit):
+    headers, _ = seed(auth_headers(f"profile_budget_{path.replace('/', '_')}"), objectives=5)
+    with max_queries(limit) as profile:
+        assert client.get(path, headers=headers).status_code == 200
+    assert not profile.repeated()
+
+
+def test_objective_report_query_budget(auth_headers, max_queries):
+    headers, (objective_id,) = seed(auth_headers("profile_report"), objectives=1)
+    with max_queries(4):
+        client.get(f"/reports/objective/{objective_id}", headers=headers)
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.hashing import hash_pool
+from src.app.main import app
+from src.app.ratelimit import MemoryBackend, Rule, SharedBackend, login_limiter
+
+client = TestClient(app)
+
+RULE = Rule(max_failures=5, window=180, lockout=300)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """Local stand-in for a shared store with the redis-py get/set/incr/pexpire/delete subset."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    async def pexpire(self, key, ms):
+        pass
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fresh_limiter(monkeypatch):
+    monkeypatch.setattr(login_limiter, "backend", MemoryBackend())
+
+
+def login(username: str, password: str):
+    return client.post("/token", data={"username": username, "password": password})
+
+
+@pytest.mark.parametrize(
+    "backend_factory", [MemoryBackend, lambda clock: SharedBackend(FakeRedis(), clock=clock)]
+)
+def test_lockout_after_max_failures_in_window(backend_factory):
+    clock = FakeClock()
+    backend = backend_factory(clock=clock)
+
+    async def scenario():
+        for _ in range(RULE.max_failures - 1):
+            assert await backend.add_failure("user:alice", RULE) == 0
+            clock.now += 10
+        assert await backend.add_failure("user:alice", RULE) == RULE.lockout
+        assert await backend.locked_for("user:alice") == RULE.lockout
+        clock.now += RULE.lockout + 1
+        assert await backend.locked_for("user:alice") == 0
+
+    asyncio.run(scenario())
+
+
+def test_memory_window_slides():
+    clock = FakeClock()
+    backend = MemoryBackend(clock=clock)
+
+    async def scenario():
+        for _ in range(RULE.max_failures - 1):
+            await backend.add_failure("user:bob", RULE)
+        clock.now += RULE.window + 1
+        # The old failures left the window: one more is not enough to lock
+        assert await backend.add_failure("user:bob", RULE) == 0
+        assert await backend.locked_for("user:bob") == 0
+
+    asyncio.run(scenario())
+
+
+def test_lock_survives_a_flood_of_usernames():
+    clock = FakeClock()
+    backend = MemoryBackend(maxsize=10, clock=clock)
+
+    async def scenario():
+        for _ in range(RULE.max_failures):
+            await backend.add_failure("user:victim", RULE)
+        for n in range(100):
+            await backend.add_failure(f"user:flood_{n}", RULE)
+        assert len(backend.failures._data) <= 10
+        assert await backend.locked_for("user:victim") == RULE.lockout
+
+        # Expired locks are swept once the lock table outgrows maxsize
+        clock.now += RULE.lockout + 1
+        for n in range(11):
+            for _ in range(RULE.max_failures):
+                await backend.add_failure(f"user:locked_{n}", RULE)
+        assert "user:victim" not in backend.locks
+        assert len(backend.locks) == 11
+
+    asyncio.run(scenario())
+
+
+def test_locked_out_login_skips_db_and_argon2(fresh_limiter, max_queries):
+    assert client.post("/signup", json={"username": "locked_user", "password": "pass"}).is_success
+    for _ in range(5):
+        assert login("locked_user", "wrong").status_code == 400
+
+    completed = hash_pool.stats.snapshot()["completed"]
+    with max_queries(0):
+        response = login("locked_user", "pass")
+    assert response.status_code == 429
+    assert response.headers["content-type"] == "application/problem+json"
+    assert 0 < int(response.headers["retry-after"]) <= 300
+    assert hash_pool.stats.snapshot()["completed"] == completed
+
+    # Other users from the same client are unaffected
+    assert client.post("/signup", json={"username": "free_user", "password": "pass"}).is_success
+    assert login("free_user", "pass").status_code == 200
+
+
+def test_successful_login_clears_failures(fresh_limiter):
+    assert client.post("/signup", json={"username": "forgetful", "password": "pass"}).is_success
+    for _ in range(4):
+        login("forgetful", "wrong")
+    assert login("forgetful", "pass").status_code == 200
+    for _ in range(4):
+        assert login("forgetful", "wrong").status_code == 400
+    assert login("forgetful", "pass").status_code == 200
+
+
+def test_ip_limit_spans_usernames(monkeypatch, fresh_limiter):
+    monkeypatch.setattr(login_limiter, "ip_rule", Rule(3, 180, 300))
+    for n in range(3):
+        assert login(f"stuffed_{n}", "guess").status_code == 400
+    assert login("stuffed_new", "guess").status_code == 429
@@ -0,0 +1,93 @@
+import asyncio
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+from sqlmodel import select
+
+from src.app import reports
+from src.app.main import app
+from src.app.models import KeyResult
+
+client = TestClient(app)
+
+
+def seed(headers: dict):
+    objs = []
+    for i, period in enumerate(["Q1 2027", "Q2 2027", "Q3 2027"]):
+        obj = client.post(
+            "/objectives", json={"title": f"Objective {i}", "period_name": period}, headers=headers
+        ).json()
+        objs.append(obj)
+        for j in range(i):
+            client.post(
+                f"/objectives/{obj['id']}/key-results",
+                json={"title": f"Result {i}.{j}", "metric": "pts", "target": 10, "progress": j},
+                headers=headers,
+            )
+    return headers, objs
+
+
+def test_objective_report_csv_is_unchanged(auth_headers, monkeypatch):
+    monkeypatch.setattr(reports, "EXPORT_BATCH_SIZE", 1)
+    headers, objs = seed(auth_headers("report_csv"))
+    krs = client.get(f"/objectives/{objs[2]['id']}/key-results", headers=headers).json()
+
+    response = client.get(f"/reports/objective/{objs[2]['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    expected = "id,title,metric,target,progress\r\n" + "".join(
+        f"{kr['id']},{kr['title']},pts,10.0,{float(kr['progress'])}\r\n" for kr in krs
+    )
+    assert response.text == expected
+
+
+def test_objective_report_ndjson_and_json(auth_headers):
+    headers, objs = seed(auth_headers("report_ndjson"))
+    url = f"/reports/objective/{objs[1]['id']}"
+
+    lines = client.get(url, params={"format": "ndjson"}, headers=headers).text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Result 1.0"]
+
+    body = client.get(url, params={"format": "json"}, headers=headers).json()
+    assert body["objective"]["period_name"] == "Q2 2027"
+    assert [kr["title"] for kr in body["key_results"]] == ["Result 1.0"]
+
+
+def test_all_objectives_export_streams_in_batches(auth_headers, monkeypatch):
+    monkeypatch.setattr(reports, "EXPORT_BATCH_SIZE", 2)
+    headers, objs = seed(auth_headers("report_all"))
+    seed(auth_headers("report_all_other"))
+
+    response = client.get("/reports/all", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="okr-report.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == reports.ALL_OBJECTIVES_FIELDS
+    assert [(r["objective_id"], r["kr_title"]) for r in rows] == [
+        (str(objs[0]["id"]), ""),
+        (str(objs[1]["id"]), "Result 1.0"),
+        (str(objs[2]["id"]), "Result 2.0"),
+        (str(objs[2]["id"]), "Result 2.1"),
+    ]
+
+    ndjson = client.get("/reports/all", params={"format": "ndjson"}, headers=headers)
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert records[0]["kr_id"] is None
+    assert {r["period_name"] for r in records} == {"Q1 2027", "Q2 2027", "Q3 2027"}
+
+
+def test_csv_chunks_follow_batches(auth_headers, monkeypatch):
+    monkeypatch.setattr(reports, "EXPORT_BATCH_SIZE", 1)
+    _, objs = seed(auth_headers("report_chunks"))
+    statement = select(KeyResult.id, KeyResult.title).where(KeyResult.objective_id == objs[2]["id"])
+
+    async def collect():
+        return [chunk async for chunk in reports.csv_chunks(statement, ["id", "title"])]
+
+    chunks = asyncio.run(collect())
+    # header, then one chunk per batch of a single key result
+    assert len(chunks) == 3
+    assert chunks[0] == "id,title\r\n"
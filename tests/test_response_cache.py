@@ -0,0 +1,151 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, update
+
+from src.app import response_cache as cache_module
+from src.app import routes
+from src.app.database import engine
+from src.app.main import app
+from src.app.models import Objective, User
+from src.app.response_cache import SharedBackend, response_cache
+
+client = TestClient(app)
+
+
+class FakeRedis:
+    """Local stand-in for a shared store with the redis-py get/set subset."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiries = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+        self.expiries[key] = px
+
+
+def seed(headers: dict):
+    obj = client.post(
+        "/objectives", json={"title": "Cached goal", "period_name": "Q1 2042"}, headers=headers
+    ).json()
+    kr = client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Cached KR", "metric": "pts", "target": 4, "progress": 1},
+        headers=headers,
+    ).json()
+    return headers, obj, kr
+
+
+def update_progress(headers: dict, kr: dict, progress: float):
+    response = client.put(
+        f"/key-results/{kr['id']}",
+        json={
+            "title": kr["title"],
+            "metric": kr["metric"],
+            "target": kr["target"],
+            "progress": progress,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("format", ["csv", "json", "ndjson"])
+def test_reports_are_cached_and_follow_writes(auth_headers, format):
+    headers, obj, kr = seed(auth_headers(f"cache_report_{format}"))
+    url = f"/reports/objective/{obj['id']}"
+
+    first = client.get(url, params={"format": format}, headers=headers)
+    hits = response_cache.hits
+    second = client.get(url, params={"format": format}, headers=headers)
+    assert response_cache.hits == hits + 1
+    assert second.content == first.content
+    assert second.headers["content-type"] == first.headers["content-type"]
+
+    update_progress(headers, kr, 3)
+    fresh = client.get(url, params={"format": format}, headers=headers)
+    assert fresh.content != first.content
+    assert b"3.0" in fresh.content
+
+
+def test_stats_cache_is_per_user_and_follows_writes(auth_headers):
+    headers, obj, kr = seed(auth_headers("cache_stats"))
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 0.25
+    hits = response_cache.hits
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 0.25
+    assert response_cache.hits == hits + 1
+
+    other_headers, _, _ = seed(auth_headers("cache_stats_other"))
+    assert client.get("/stats", headers=other_headers).json()["objectives"][0]["id"] != obj["id"]
+
+    update_progress(headers, kr, 4)
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 1.0
+
+
+def test_cached_report_is_not_served_to_other_users(auth_headers):
+    headers, obj, _ = seed(auth_headers("cache_owner"))
+    client.get(f"/reports/objective/{obj['id']}", headers=headers)
+    intruder, _, _ = seed(auth_headers("cache_intruder"))
+    assert client.get(f"/reports/objective/{obj['id']}", headers=intruder).status_code == 404
+
+
+def test_large_bodies_are_not_kept(auth_headers, monkeypatch):
+    monkeypatch.setattr(cache_module, "RESPONSE_CACHE_MAX_BYTES", 10)
+    headers, obj, _ = seed(auth_headers("cache_large"))
+    url = f"/reports/objective/{obj['id']}"
+    client.get(url, headers=headers)
+    hits = response_cache.hits
+    assert client.get(url, headers=headers).status_code == 200
+    assert response_cache.hits == hits
+
+
+def test_shared_backend(auth_headers, monkeypatch):
+    store = FakeRedis()
+    monkeypatch.setattr(response_cache, "backend", SharedBackend(store))
+    headers, obj, kr = seed(auth_headers("cache_shared"))
+
+    body = client.get("/stats", headers=headers).content
+    (key,) = [k for k in store.data if k.startswith("okr:response:stats:")]
+    assert store.expiries[key] == int(response_cache.ttl * 1000)
+    assert client.get("/stats", headers=headers).content == body
+
+    update_progress(headers, kr, 2)
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 0.5
+    assert len([k for k in store.data if k.startswith("okr:response:stats:")]) == 2
+
+    snapshot = client.get("/health/cache").json()["response_cache"]
+    assert snapshot["backend"] == "SharedBackend"
+    assert {"hits", "misses", "evictions"} <= set(snapshot)
+
+
+def test_body_computed_before_a_write_is_not_served_after_it(auth_headers, monkeypatch):
+    headers, obj, _ = seed(auth_headers("cache_race"))
+    compute_stats = routes.compute_stats
+
+    async def racing_compute(session, owner_id, **kwargs):
+        stats = await compute_stats(session, owner_id, **kwargs)
+        # A write commits between the read and its cache put
+        with Session(engine) as other:
+            other.add(Objective(title="Raced in", period_name="Q2 2042", owner_id=owner_id))
+            other.exec(
+                update(User).where(User.id == owner_id).values(data_version=User.data_version + 1)
+            )
+            other.commit()
+        return stats
+
+    monkeypatch.setattr(routes, "compute_stats", racing_compute)
+    stale = client.get("/stats", headers=headers)
+    monkeypatch.setattr(routes, "compute_stats", compute_stats)
+
+    fresh = client.get("/stats", headers=headers)
+    assert fresh.headers["etag"] != stale.headers["etag"]
+    assert [o["title"] for o in fresh.json()["objectives"]] == ["Cached goal", "Raced in"]
+    assert (
+        client.get(
+            "/stats", headers={**headers, "If-None-Match": stale.headers["etag"]}
+        ).status_code
+        == 200
+    )
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import Session, SQLModel, update
+
+from src.app import rollups
+from src.app.database import engine
+from src.app.main import app
+from src.app.migrations import run_migrations
+from src.app.models import Objective
+
+client = TestClient(app)
+
+
+def kr_payload(title: str, target: float, progress: float) -> dict:
+    return {"title": title, "metric": "count", "target": target, "progress": progress}
+
+
+def test_rollups_follow_key_result_writes(auth_headers):
+    headers = auth_headers("rollup_writer")
+    obj = client.post(
+        "/objectives", json={"title": "Grow revenue", "period_name": "Q1 2025"}, headers=headers
+    ).json()
+    url = f"/objectives/{obj['id']}/key-results"
+    kr1 = client.post(url, json=kr_payload("Deals", 10, 5), headers=headers).json()
+    kr2 = client.post(url, json=kr_payload("Leads", 4, 4), headers=headers).json()
+    assert client.get("/stats", headers=headers).json()["objectives"][0]["progress"] == 0.75
+
+    client.put(f"/key-results/{kr1['id']}", json=kr_payload("Deals", 10, 10), headers=headers)
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 1.0
+
+    assert client.delete(f"/key-results/{kr2['id']}", headers=headers).status_code == 200
+    with Session(engine) as session:
+        stored = session.get(Objective, obj["id"])
+        assert (stored.kr_count, stored.progress_sum) == (1, 1.0)
+        assert rollups.find_drift(session, obj["owner_id"]) == []
+
+    client.delete(f"/key-results/{kr1['id']}", headers=headers)
+    stats = client.get("/stats", headers=headers).json()
+    assert stats["objectives"][0]["progress"] is None
+    assert stats["overall_progress"] is None
+
+    assert client.delete(f"/objectives/{obj['id']}", headers=headers).status_code == 200
+    assert client.get("/stats", headers=headers).json() == {
+        "objectives": [],
+        "overall_progress": None,
+        "periods": [],
+        "years": [],
+    }
+
+
+def test_concurrent_writes_to_one_key_result_keep_rollups_exact(auth_headers):
+    headers = auth_headers("rollup_racer")
+    obj = client.post(
+        "/objectives", json={"title": "Race me", "period_name": "Q4 2025"}, headers=headers
+    ).json()
+    url = f"/objectives/{obj['id']}/key-results"
+    kr = client.post(url, json=kr_payload("Contended", 10, 0), headers=headers).json()
+    doomed = client.post(url, json=kr_payload("Doomed", 10, 5), headers=headers).json()
+
+    def put(i):
+        return client.put(
+            f"/key-results/{kr['id']}",
+            json=kr_payload("Contended", 10, i % 10 + 1),
+            headers=headers,
+        ).status_code
+
+    def delete(_):
+        return client.delete(f"/key-results/{doomed['id']}", headers=headers).status_code
+
+    with ThreadPoolExecutor(8) as pool:
+        assert set(pool.map(put, range(48))) == {200}
+        assert sorted(pool.map(delete, range(8))) == [200] + [404] * 7
+
+    with Session(engine) as session:
+        assert rollups.find_drift(session, obj["owner_id"]) == []
+        assert session.get(Objective, obj["id"]).kr_count == 1
+
+
+def test_delete_key_result_of_another_user_is_denied(auth_headers):
+    owner = auth_headers("rollup_owner")
+    intruder = auth_headers("rollup_intruder")
+    obj = client.post(
+        "/objectives", json={"title": "Keep it safe", "period_name": "Q2 2025"}, headers=owner
+    ).json()
+    kr = client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Audits", "metric": "count", "target": 2, "progress": 1},
+        headers=owner,
+    ).json()
+
+    response = client.delete(f"/key-results/{kr['id']}", headers=intruder)
+    assert response.status_code == 404
+    assert client.get(f"/objectives/{obj['id']}/key-results", headers=owner).json() == [kr]
+
+
+def test_verify_and_rebuild_catch_drift(auth_headers, capsys):
+    headers = auth_headers("rollup_drift")
+    obj = client.post(
+        "/objectives", json={"title": "Drift target", "period_name": "Q3 2025"}, headers=headers
+    ).json()
+    client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Things", "metric": "count", "target": 8, "progress": 2},
+        headers=headers,
+    )
+    with Session(engine) as session:
+        session.exec(
+            update(Objective).where(Objective.id == obj["id"]).values(kr_count=3, progress_sum=9.0)
+        )
+        session.commit()
+
+    assert rollups.main(["verify", "--owner-id", str(obj["owner_id"])]) == 1
+    assert f"objective {obj['id']}" in capsys.readouterr().out
+    assert rollups.main(["rebuild", "--owner-id", str(obj["owner_id"])]) == 0
+    assert rollups.main(["verify", "--owner-id", str(obj["owner_id"])]) == 0
+    assert client.get("/stats", headers=headers).json()["overall_progress"] == 0.25
+
+
+def test_migration_adds_rollup_columns(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text('CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR)'))
+        conn.execute(
+            text(
+                "CREATE TABLE objective (id INTEGER PRIMARY KEY, title VARCHAR, "
+                "period_name VARCHAR, owner_id INTEGER)"
+            )
+        )
+        conn.execute(text("INSERT INTO objective VALUES (1, 'Legacy', 'Q1 2025', 1)"))
+    SQLModel.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO keyresult (id, title, metric, target, progress, objective_id) "
+                "VALUES (1, 'Old KR', 'count', 2, 1, 1)"
+            )
+        )
+
+    run_migrations(legacy)
+
+    columns = {c["name"] for c in inspect(legacy).get_columns("objective")}
+    assert {"kr_count", "progress_sum"} <= columns
+    with Session(legacy) as session:
+        stored = session.get(Objective, 1)
+        assert (stored.kr_count, stored.progress_sum) == (1, 0.5)
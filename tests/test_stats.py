@@ -0,0 +1,206 @@
+import asyncio
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.app import rollups
+from src.app.database import ThreadedSession, engine
+from src.app.main import app
+from src.app.models import KeyResult, Objective, User
+from src.app.stats import compute_stats as compute_stats_async
+
+client = TestClient(app)
+
+
+def compute_stats(session: Session, owner_id: int) -> dict:
+    return asyncio.run(compute_stats_async(ThreadedSession(session), owner_id))
+
+
+def legacy_stats(session: Session, owner_id: int) -> dict:
+    """The original per-objective loop of `get_stats`, kept as the reference."""
+    objs = session.exec(
+        select(Objective).where(Objective.owner_id == owner_id).order_by(Objective.id)
+    ).all()
+    resp = {"objectives": []}
+    total_weighted = 0.0
+    total_targets = 0.0
+    for o in objs:
+        krs = session.exec(select(KeyResult).where(KeyResult.objective_id == o.id)).all()
+        if not krs:
+            obj_progress = None
+        else:
+            ratios = []
+            for k in krs:
+                ratio = k.progress / k.target if k.target > 0 else 0.0
+                ratios.append(min(max(ratio, 0.0), 1.0))
+            obj_progress = sum(ratios) / len(ratios)
+            total_weighted += obj_progress * len(ratios)
+            total_targets += len(ratios)
+        resp["objectives"].append(
+            {"id": o.id, "title": o.title, "period_name": o.period_name, "progress": obj_progress}
+        )
+    resp["overall_progress"] = total_weighted / total_targets if total_targets > 0 else None
+    return resp
+
+
+def assert_equivalent(actual: dict, expected: dict):
+    # The per-period aggregates that follow have no legacy counterpart
+    assert list(actual)[: len(expected)] == list(expected)
+    assert len(actual["objectives"]) == len(expected["objectives"])
+    for got, want in zip(actual["objectives"], expected["objectives"]):
+        assert list(got) == list(want)
+        assert {k: got[k] for k in ("id", "title", "period_name")} == {
+            k: want[k] for k in ("id", "title", "period_name")
+        }
+        if want["progress"] is None:
+            assert got["progress"] is None
+        else:
+            assert got["progress"] == pytest.approx(want["progress"])
+    if expected["overall_progress"] is None:
+        assert actual["overall_progress"] is None
+    else:
+        assert actual["overall_progress"] == pytest.approx(expected["overall_progress"])
+
+
+def make_user(session: Session, username: str) -> User:
+    user = User(username=username, hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def add_objective(session: Session, owner: User, period: str, krs) -> Objective:
+    obj = Objective(title=f"Objective {period}", period_name=period, owner_id=owner.id)
+    session.add(obj)
+    session.commit()
+    session.refresh(obj)
+    for i, (target, progress) in enumerate(krs):
+        session.add(
+            KeyResult(
+                title=f"KR {i}",
+                metric="units",
+                target=target,
+                progress=progress,
+                objective_id=obj.id,
+            )
+        )
+    session.commit()
+    # Rows inserted behind the API's back: bring the rollups in line with them.
+    rollups.rebuild(session, owner.id)
+    return obj
+
+
+def test_stats_empty_user():
+    with Session(engine) as session:
+        user = make_user(session, "stats_empty")
+        assert compute_stats(session, user.id) == {
+            "objectives": [],
+            "overall_progress": None,
+            "periods": [],
+            "years": [],
+        }
+        assert_equivalent(compute_stats(session, user.id), legacy_stats(session, user.id))
+
+
+def test_stats_edge_cases_match_python_loop():
+    with Session(engine) as session:
+        user = make_user(session, "stats_edges")
+        add_objective(session, user, "Q1 2025", [])
+        add_objective(session, user, "Q2 2025", [(10, 5), (0, 3), (-1, 2)])
+        add_objective(session, user, "Q3 2025", [(4, 8), (5, -2), (3, 3)])
+        add_objective(session, user, "FY 2025", [(100, 0)])
+
+        result = compute_stats(session, user.id)
+        assert_equivalent(result, legacy_stats(session, user.id))
+        progress = [o["progress"] for o in result["objectives"]]
+        assert progress[0] is None
+        assert progress[1] == pytest.approx(0.5 / 3)
+        assert progress[2] == pytest.approx(2 / 3)
+        assert progress[3] == 0.0
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_stats_randomized_equivalence(seed):
+    rnd = random.Random(seed)
+    with Session(engine) as session:
+        user = make_user(session, f"stats_random_{seed}")
+        other = make_user(session, f"stats_random_other_{seed}")
+        for year in range(2020, 2020 + rnd.randint(1, 6)):
+            for q in range(1, 5):
+                krs = [
+                    (rnd.choice([0.0, -5.0, rnd.uniform(0.1, 200)]), rnd.uniform(-10, 250))
+                    for _ in range(rnd.randint(0, 6))
+                ]
+                add_objective(session, user, f"Q{q} {year}", krs)
+        add_objective(session, other, "Q1 2025", [(1, 1)])
+
+        assert_equivalent(compute_stats(session, user.id), legacy_stats(session, user.id))
+
+
+def test_stats_endpoint_response_shape(auth_headers):
+    headers = auth_headers("stats_api")
+    obj = client.post(
+        "/objectives", json={"title": "Ship it", "period_name": "Q1 2025"}, headers=headers
+    ).json()
+    client.post(
+        f"/objectives/{obj['id']}/key-results",
+        json={"title": "Deploys", "metric": "count", "target": 4, "progress": 1},
+        headers=headers,
+    )
+
+    response = client.get("/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "objectives": [
+            {"id": obj["id"], "title": "Ship it", "period_name": "Q1 2025", "progress": 0.25}
+        ],
+        "overall_progress": 0.25,
+        "periods": [
+            {"period": "Q1 2025", "year": 2025, "quarter": 1, "objectives": 1, "progress": 0.25}
+        ],
+        "years": [{"year": 2025, "objectives": 1, "progress": 0.25}],
+    }
+
+
+def test_stats_filters_by_period_and_year(auth_headers):
+    headers = auth_headers("stats_periods")
+    progress = {"Q1 2025": 1, "Q3 2025": 3, "FY 2025": 2, "Q1 2026": 4}
+    for period, value in progress.items():
+        obj = client.post(
+            "/objectives", json={"title": f"Goal {period}", "period_name": period}, headers=headers
+        ).json()
+        client.post(
+            f"/objectives/{obj['id']}/key-results",
+            json={"title": "Deploys", "metric": "count", "target": 4, "progress": value},
+            headers=headers,
+        )
+
+    everything = client.get("/stats", headers=headers).json()
+    assert [p["period"] for p in everything["periods"]] == [
+        "Q1 2025",
+        "Q3 2025",
+        "FY 2025",
+        "Q1 2026",
+    ]
+    assert everything["years"] == [
+        {"year": 2025, "objectives": 3, "progress": 0.5},
+        {"year": 2026, "objectives": 1, "progress": 1.0},
+    ]
+
+    year = client.get("/stats", params={"year": 2025}, headers=headers).json()
+    assert [o["period_name"] for o in year["objectives"]] == ["Q1 2025", "Q3 2025", "FY 2025"]
+    assert year["overall_progress"] == 0.5
+
+    quarter = client.get("/stats", params={"period": "Q3 2025"}, headers=headers).json()
+    assert [o["period_name"] for o in quarter["objectives"]] == ["Q3 2025"]
+    assert quarter["periods"] == [
+        {"period": "Q3 2025", "year": 2025, "quarter": 3, "objectives": 1, "progress": 0.75}
+    ]
+    fiscal = client.get("/stats", params={"period": "FY 2025"}, headers=headers).json()
+    assert [o["period_name"] for o in fiscal["objectives"]] == ["FY 2025"]
+
+    bad = client.get("/stats", params={"period": "Q7 2025"}, headers=headers)
+    assert bad.status_code == 422
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+# test_secrets reloads src.app.auth, so module state is always looked up through `auth.`
+from src.app import auth
+from src.app.lru import LRUCache
+from src.app.main import app
+
+client = TestClient(app)
+
+
+def count_user_lookups(monkeypatch) -> list:
+    calls = []
+    original = auth.get_user_by_username
+
+    async def counting(session, username):
+        calls.append(username)
+        return await original(session, username)
+
+    monkeypatch.setattr(auth, "get_user_by_username", counting)
+    return calls
+
+
+def test_repeated_requests_skip_user_lookup(signup, monkeypatch):
+    token = signup("cache_user")["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = count_user_lookups(monkeypatch)
+
+    for _ in range(3):
+        assert client.get("/objectives", headers=headers).status_code == 200
+
+    assert calls == ["cache_user"]
+    principal = auth.token_cache.get(token)
+    assert type(principal).__name__ == "Principal"
+    assert principal.username == "cache_user"
+    assert not hasattr(principal, "__dict__")
+
+
+def test_invalidation_forces_fresh_lookup(signup, monkeypatch):
+    token = signup("cache_reset")["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/objectives", headers=headers)
+    calls = count_user_lookups(monkeypatch)
+
+    assert auth.invalidate_user_tokens(auth.token_cache.get(token).id) == 1
+    assert client.get("/objectives", headers=headers).status_code == 200
+    assert calls == ["cache_reset"]
+
+
+def test_expired_token_is_not_cached(signup):
+    signup("cache_expired")
+    token = auth.create_access_token({"sub": "cache_expired"}, expires_delta=timedelta(seconds=-1))
+
+    response = client.get("/objectives", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    assert auth.token_cache.get(token) is None
+
+
+def test_lru_cache_evicts_and_expires():
+    now = [0.0]
+    cache = LRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+    cache.set("short", 4, ttl=1)
+    now[0] = 1.5
+    assert cache.get("short") is None
+    assert cache.get("a") == 1
+    now[0] = 11
+    assert cache.get("a") is None
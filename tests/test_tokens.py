@@ -0,0 +1,181 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from src.app import auth, revocation, routes
+from src.app.database import open_session
+from src.app.main import app
+from src.app.models import RevokedToken
+from src.app.revocation import Denylist
+
+client = TestClient(app)
+
+
+def bearer(tokens: dict) -> dict:
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def test_tokens_are_short_lived_and_typed(signup):
+    tokens = signup("tok_claims")
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert claims["type"] == "access"
+    assert claims["exp"] - claims["iat"] <= auth.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 1
+    assert jwt.get_unverified_claims(tokens["refresh_token"])["type"] == "refresh"
+
+    # A refresh token is not a bearer token
+    refresh_as_bearer = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    assert client.get("/objectives", headers=refresh_as_bearer).status_code == 401
+
+
+def test_refresh_rotates_and_reuse_revokes_the_family(signup):
+    first = signup("tok_rotate")
+    second = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).json()
+    assert second["refresh_token"] != first["refresh_token"]
+    assert client.get("/objectives", headers=bearer(second)).status_code == 200
+
+    reused = client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]})
+    assert reused.status_code == 401
+    # The leaked token's family is gone, including the legitimately rotated token
+    later = client.post("/auth/refresh", json={"refresh_token": second["refresh_token"]})
+    assert later.status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(signup):
+    tokens = signup("tok_logout")
+    headers = bearer(tokens)
+    assert client.get("/objectives", headers=headers).status_code == 200  # now cached
+
+    response = client.post(
+        "/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert client.get("/objectives", headers=headers).status_code == 401
+    refreshed = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 401
+
+
+def test_logout_without_body_ends_the_session(signup, monkeypatch):
+    tokens = signup("tok_logout_bare")
+    other = client.post("/token", data={"username": "tok_logout_bare", "password": "pass"}).json()
+    headers = bearer(tokens)
+    assert client.get("/objectives", headers=headers).status_code == 200
+
+    # The principal is cached; logout must not need to decode the token again
+    monkeypatch.setattr(routes, "decode_token", lambda *args: None)
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    monkeypatch.undo()
+
+    assert client.get("/objectives", headers=headers).status_code == 401
+    refreshed = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 401
+    # Other login sessions of the same user are unaffected
+    assert client.post("/auth/refresh", json={"refresh_token": other["refresh_token"]}).is_success
+
+
+def test_tokens_without_jti_are_rejected(signup):
+    signup("tok_legacy")
+    legacy = jwt.encode(
+        {"sub": "tok_legacy", "exp": time.time() + 600}, auth.SECRET_KEY, algorithm=auth.ALGORITHM
+    )
+    headers = {"Authorization": f"Bearer {legacy}"}
+    assert client.get("/objectives", headers=headers).status_code == 401
+    assert client.post("/auth/logout", headers=headers).status_code == 401
+
+
+def test_change_password_revokes_every_earlier_token(signup):
+    old = signup("tok_password")
+    other_session = client.post(
+        "/token", data={"username": "tok_password", "password": "pass"}
+    ).json()
+    response = client.post(
+        "/auth/change-password",
+        json={"current_password": "pass", "new_password": "new-pass"},
+        headers=bearer(old),
+    )
+    assert response.status_code == 200
+    new = response.json()
+
+    for tokens in (old, other_session):
+        assert client.get("/objectives", headers=bearer(tokens)).status_code == 401
+        refreshed = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert refreshed.status_code == 401
+    assert client.get("/objectives", headers=bearer(new)).status_code == 200
+    login = client.post("/token", data={"username": "tok_password", "password": "pass"})
+    assert login.status_code == 400
+    login = client.post("/token", data={"username": "tok_password", "password": "new-pass"})
+    assert login.status_code == 200
+
+
+def test_change_password_rejects_wrong_current_password(signup):
+    tokens = signup("tok_wrong_password")
+    response = client.post(
+        "/auth/change-password",
+        json={"current_password": "nope", "new_password": "new-pass"},
+        headers=bearer(tokens),
+    )
+    assert response.status_code == 400
+    assert client.get("/objectives", headers=bearer(tokens)).status_code == 200
+
+
+def test_revocations_from_other_workers_arrive_by_sync(signup):
+    tokens = signup("tok_remote")
+    jti = jwt.get_unverified_claims(tokens["access_token"])["jti"]
+    client.get("/objectives", headers=bearer(tokens))
+    user_id = auth.token_cache.get(tokens["access_token"]).id
+
+    async def revoke_elsewhere():
+        # Written straight to the table, as another worker would
+        async with open_session() as session:
+            session.add(RevokedToken(user_id=user_id, jti=jti, expires_at=time.time() + 60))
+            await session.commit()
+
+    asyncio.run(revoke_elsewhere())
+    assert not revocation.denylist.is_revoked(jti, user_id, 0)
+    dropped = []
+    asyncio.run(revocation.sync_once(lambda entry: dropped.append(entry.user_id)))
+    assert revocation.denylist.is_revoked(jti, user_id, 0)
+    assert dropped == [user_id]
+
+
+def test_sync_loads_rows_committed_after_a_higher_id(signup):
+    signup("tok_out_of_order")
+    denylist = Denylist()
+
+    async def scenario():
+        async with open_session() as session:
+            user = await auth.get_user_by_username(session, "tok_out_of_order")
+            # On Postgres the lower id can commit last; here both rows exist at once
+            late = RevokedToken(user_id=user.id, jti="late-commit", expires_at=time.time() + 60)
+            session.add(late)
+            await session.flush()
+            local = RevokedToken(user_id=user.id, jti="local", expires_at=time.time() + 60)
+            session.add(local)
+            await session.commit()
+            await session.refresh(local)
+            assert local.id > late.id
+            denylist.apply(local)  # this worker's own revocation, applied right away
+            first = await denylist.sync(session)
+            second = await denylist.sync(session)
+            return user.id, [e.jti for e in first if e.user_id == user.id], second
+
+    user_id, synced, again = asyncio.run(scenario())
+    assert synced == ["late-commit"]
+    assert again == []
+    assert denylist.is_revoked("late-commit", user_id, 0)
+
+
+def test_denylist_prunes_expired_entries():
+    now = [1000.0]
+    denylist = Denylist(clock=lambda: now[0])
+    denylist.apply(RevokedToken(user_id=1, jti="a", expires_at=1010))
+    denylist.apply(RevokedToken(user_id=2, issued_before=1000, expires_at=2000))
+    assert denylist.is_revoked("a", 1, 0)
+    assert denylist.is_revoked(None, 2, 999.5)
+    assert not denylist.is_revoked(None, 2, 1000.5)
+
+    now[0] = 1500
+    assert denylist.prune() == 1
+    assert not denylist.is_revoked("a", 1, 0)
+    assert len(denylist) == 1
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+
+from src.app.schemas import validation
+from src.app.schemas.validation import ValidatedKeyResultCreate, ValidatedObjectiveCreate
+
+PAYLOAD = {"title": "  Grow   revenue ", "period_name": " Q3 2025 "}
+
+
+class Exploding:
+    """Fails loudly if a log call formats it."""
+
+    def __repr__(self):
+        raise AssertionError("message was formatted")
+
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def debug_logging():
+    validation.configure_logging(level="DEBUG", use_queue=False)
+    yield
+    validation.configure_logging()
+
+
+def test_patterns_behave_like_before():
+    obj = ValidatedObjectiveCreate.model_validate(PAYLOAD)
+    assert (obj.title, obj.period_name) == ("Grow revenue", "Q3 2025")
+    for bad in ("Q5 2025", "Q1 25", "Q1 2025 extra", "fy 2025"):
+        with pytest.raises(ValueError):
+            ValidatedObjectiveCreate(title="Valid title", period_name=bad)
+
+
+def test_debug_messages_are_not_formatted_by_default():
+    assert not validation.logger.isEnabledFor(logging.DEBUG)
+    validation.log_debug("never rendered %r", Exploding())
+
+
+def test_debug_messages_are_emitted_and_sampled(debug_logging, caplog, monkeypatch):
+    with caplog.at_level(logging.DEBUG, logger="validation"):
+        ValidatedKeyResultCreate(title="Ship it", metric="releases", target=2, progress=1)
+    assert "KR title validated: 'Ship it'" in caplog.messages
+
+    caplog.clear()
+    monkeypatch.setattr(validation, "VALIDATION_LOG_SAMPLE_RATE", 0.0)
+    with caplog.at_level(logging.DEBUG, logger="validation"):
+        ValidatedKeyResultCreate(title="Ship it", metric="releases", target=2, progress=1)
+    assert caplog.messages == []
+
+
+def test_queue_handler_hands_records_to_listener():
+    validation.configure_logging(level="DEBUG", use_queue=True)
+    try:
+        (handler,) = validation.logger.handlers
+        assert isinstance(handler, logging.handlers.QueueHandler)
+        collector = Collector()
+        validation.log_listener.handlers = (collector,)
+        validation.log_debug("queued %s", 1)
+        validation.shutdown_logging()
+        assert [r.getMessage() for r in collector.records] == ["queued 1"]
+    finally:
+        validation.configure_logging()